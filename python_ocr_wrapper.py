@@ -9,40 +9,231 @@ import os
 import cv2
 import numpy as np
 import argparse
+import glob
+import json
+import time
+import multiprocessing
+from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
-def preprocess_image_for_ocr(image_path: str, output_path: str = None) -> str:
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'services'))
+from resultCache import ResultCache, cache_from_environment
+from stageProfiler import StageProfiler, profile_stage
+from outputCodec import CODEC_PROFILES, DEFAULT_CODEC_PROFILE, OutputCodec
+from tiledFilters import TileExecutor, run_tiled, tile_executor_from_environment
+from sharedBuffers import write_mapped_sections
+from imageDecoder import DECODE_FLAGS, ImageDecoder
+from qualityTriage import triage
+from pointwiseOps import threshold_lut, union_luts
+from processingProfiles import PROCESSING_PROFILES, apply_processing_profile
+
+VARIANTS = ('preprocessed', 'threshold', 'enhanced', 'multilevel')
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+# The multilevel variant's three global thresholds and their union, as one lookup table
+MULTILEVEL_LUT = union_luts(threshold_lut(50), threshold_lut(150), threshold_lut(200))
+
+def decode_grayscale(image_buffer: bytes, image_path: str, decoder: Optional[ImageDecoder] = None) -> np.ndarray:
+    """Decode an image once and return its grayscale plane"""
+    try:
+        return (decoder or ImageDecoder()).decode_gray(image_buffer)
+    except ValueError:
+        raise ValueError(f"Could not load image: {image_path}")
+
+def apply_clahe(gray: np.ndarray, clip_limit: float, tile_grid: int, shared: Optional[Dict] = None) -> np.ndarray:
+    """CLAHE with an optional shared dict so variants sharing settings compute it once"""
+    key = ('clahe', clip_limit, tile_grid)
+    if shared is not None and key in shared:
+        return shared[key]
+    
+    with profile_stage('clahe'):
+        clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_grid, tile_grid))
+        enhanced = clahe.apply(gray)
+    if shared is not None:
+        shared[key] = enhanced
+    return enhanced
+
+def build_preprocessed(gray: np.ndarray, shared: Optional[Dict] = None, tiler: Optional[TileExecutor] = None,
+                       morphology: bool = True) -> np.ndarray:
+    """CLAHE + Otsu + closing (unless morphology is off), inverted (main OCR variant)"""
+    # Apply CLAHE for contrast enhancement
+    enhanced = apply_clahe(gray, 2.0, 8, shared)
+    
+    # Apply Otsu thresholding
+    with profile_stage('threshold'):
+        _, otsu = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    
+    # Apply morphological closing to clean up text
+    cleaned = otsu
+    if morphology:
+        with profile_stage('morphology'):
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+            cleaned = cv2.morphologyEx(otsu, cv2.MORPH_CLOSE, kernel)
+    
+    # Light denoising
+    denoised = cv2.medianBlur(cleaned, 1)
+    
+    # Invert for OCR (white text on black background)
+    return cv2.bitwise_not(denoised)
+
+def build_threshold(gray: np.ndarray, shared: Optional[Dict] = None, tiler: Optional[TileExecutor] = None,
+                    morphology: bool = True) -> np.ndarray:
+    """Adaptive threshold used for turnover OCR (04_threshold variant)"""
+    # Apply adaptive threshold (robust to shading) - this is the key for turnovers
+    with profile_stage('threshold'):
+        return run_tiled(tiler, lambda band: cv2.adaptiveThreshold(
+            band, 255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY,
+            11, 2
+        ), gray, 5)
+
+def enhanced_filters(enhanced: np.ndarray, morphology: bool = True) -> np.ndarray:
+    """Blur, adaptive threshold and morphology of the enhanced variant (all local filters)"""
+    # Apply Gaussian blur to reduce noise
+    with profile_stage('blur'):
+        blurred = cv2.GaussianBlur(enhanced, (3, 3), 0)
+    
+    # Apply adaptive thresholding for better text separation
+    with profile_stage('threshold'):
+        adaptive = cv2.adaptiveThreshold(
+            blurred, 255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY,
+            21, 11
+        )
+    if not morphology:
+        return adaptive
+    
+    with profile_stage('morphology'):
+        # Apply morphological opening to remove small artifacts
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2, 2))
+        opened = cv2.morphologyEx(adaptive, cv2.MORPH_OPEN, kernel)
+        
+        # Apply morphological closing to connect text components
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, kernel)
+    
+    return closed
+
+def build_enhanced(gray: np.ndarray, shared: Optional[Dict] = None, tiler: Optional[TileExecutor] = None,
+                   morphology: bool = True) -> np.ndarray:
+    """Stronger CLAHE + adaptive threshold + morphology (unless off), inverted"""
+    # Apply stronger CLAHE for better contrast
+    enhanced = apply_clahe(gray, 3.0, 16, shared)
+    
+    # Blur 1 + threshold 10 + opening 2 + closing 2 rows of reach per band
+    closed = run_tiled(tiler, lambda band: enhanced_filters(band, morphology), enhanced, 15 if morphology else 11)
+    
+    # Invert for OCR (white text on black background)
+    return cv2.bitwise_not(closed)
+
+def build_multilevel(gray: np.ndarray, shared: Optional[Dict] = None, tiler: Optional[TileExecutor] = None,
+                     morphology: bool = True) -> np.ndarray:
+    """Union of three global thresholds, preserving more text for rebounds/assists"""
+    with profile_stage('threshold'):
+        # Multi-level thresholding (preserve more text): the thresholds at 50, 150 and 200
+        # and their OR are a single pass through one table
+        return cv2.LUT(gray, MULTILEVEL_LUT)
+
+VARIANT_BUILDERS = {
+    'preprocessed': build_preprocessed,
+    'threshold': build_threshold,
+    'enhanced': build_enhanced,
+    'multilevel': build_multilevel,
+}
+
+def render_variants(image_path: str, variants: List[str], cache: Optional[ResultCache] = None,
+                    codec: Optional[OutputCodec] = None, tiler: Optional[TileExecutor] = None,
+                    decoder: Optional[ImageDecoder] = None, morphology: bool = True) -> Dict[str, bytes]:
+    """
+    Return PNG bytes for each requested variant. Cached variants are served
+    from the result cache; the image is only decoded if something is missing.
+    """
+    return render_selected_variants(image_path, variants, cache, codec, tiler, decoder, False, morphology)[0]
+
+def render_selected_variants(image_path: str, variants: List[str], cache: Optional[ResultCache] = None,
+                             codec: Optional[OutputCodec] = None, tiler: Optional[TileExecutor] = None,
+                             decoder: Optional[ImageDecoder] = None, triaged: bool = False,
+                             morphology: bool = True) -> Tuple[Dict[str, bytes], Optional[Dict]]:
+    """
+    render_variants, optionally rendering only the requested variants that the
+    quality triage picks for this image: (outputs, triage report or None).
+    The report is cached like the variants, so a repeat run decodes nothing.
+    morphology=False skips the opening/closing cleanup (fast processing profile).
+    """
+    codec = codec or OutputCodec()
+    decoder = decoder or ImageDecoder()
+    key_params = {'codec': codec.profile} if codec.profile != DEFAULT_CODEC_PROFILE else {}
+    if not decoder.is_default:
+        key_params['decode'] = decoder.describe()
+    if not morphology:
+        key_params['morphology'] = False
+    with profile_stage('read'):
+        with open(image_path, 'rb') as f:
+            image_buffer = f.read()
+    
+    gray = None
+    report = None
+    if triaged:
+        # The triage scores only depend on the decoded pixels, not on the codec. Its thresholds
+        # are calibrated at full resolution, so a reduced-resolution decoder triages a full one.
+        triage_decoder = decoder.full_resolution()
+        decode_params = {} if triage_decoder.is_default else {'decode': triage_decoder.describe()}
+        key = cache.make_key(image_buffer, 'wrapper_triage', decode_params) if cache else None
+        with profile_stage('cache_lookup'):
+            cached = cache.get(key) if cache else None
+        if cached is not None:
+            report = json.loads(cached)
+        else:
+            triage_gray = decode_grayscale(image_buffer, image_path, triage_decoder)
+            if triage_decoder is decoder:
+                gray = triage_gray
+            with profile_stage('triage'):
+                report = triage(triage_gray)
+            if cache:
+                with profile_stage('cache_store'):
+                    cache.put(key, json.dumps(report).encode('utf-8'))
+        variants = [variant for variant in variants if variant in report['variants']]
+    
+    rendered = {}
+    shared = {}
+    for variant in variants:
+        key = cache.make_key(image_buffer, f"wrapper_{variant}", key_params) if cache else None
+        with profile_stage('cache_lookup'):
+            data = cache.get(key) if cache else None
+        if data is None:
+            if gray is None:
+                gray = decode_grayscale(image_buffer, image_path, decoder)
+            with profile_stage(variant):
+                image = VARIANT_BUILDERS[variant](gray, shared, tiler, morphology)
+            with profile_stage('encode_png'):
+                data = codec.encode(image, 'png', binary=True)
+            if cache:
+                with profile_stage('cache_store'):
+                    cache.put(key, data)
+        rendered[variant] = data
+    
+    return rendered, report
+
+def write_bytes(output_path: str, data: bytes) -> None:
+    with open(output_path, 'wb') as f:
+        f.write(data)
+
+def preprocess_image_for_ocr(image_path: str, output_path: str = None, cache: Optional[ResultCache] = None,
+                             codec: Optional[OutputCodec] = None, tiler: Optional[TileExecutor] = None,
+                             decoder: Optional[ImageDecoder] = None, morphology: bool = True) -> str:
     """
     Preprocess image for optimal OCR results using the same techniques
     from final_optimization_01_binary.py
     """
     try:
-        # Load image
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError(f"Could not load image: {image_path}")
-        
         print(f"Preprocessing image: {image_path}")
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Apply CLAHE for contrast enhancement
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        enhanced = clahe.apply(gray)
-        
-        # Apply Otsu thresholding
-        _, otsu = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        # Apply morphological closing to clean up text
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-        cleaned = cv2.morphologyEx(otsu, cv2.MORPH_CLOSE, kernel)
-        
-        # Light denoising
-        denoised = cv2.medianBlur(cleaned, 1)
-        
-        # Invert for OCR (white text on black background)
-        final = cv2.bitwise_not(denoised)
+        final = render_variants(image_path, ['preprocessed'], cache, codec, tiler, decoder, morphology)['preprocessed']
         
         # Save preprocessed image
         if output_path is None:
@@ -50,7 +241,7 @@ def preprocess_image_for_ocr(image_path: str, output_path: str = None) -> str:
             base_name = os.path.splitext(image_path)[0]
             output_path = f"{base_name}_preprocessed.png"
         
-        cv2.imwrite(output_path, final)
+        write_bytes(output_path, final)
         print(f"Preprocessed image saved to: {output_path}")
         
         return output_path
@@ -59,29 +250,17 @@ def preprocess_image_for_ocr(image_path: str, output_path: str = None) -> str:
         print(f"Error preprocessing image: {str(e)}")
         return None
 
-def create_threshold_image(image_path: str, output_path: str = None) -> str:
+def create_threshold_image(image_path: str, output_path: str = None, cache: Optional[ResultCache] = None,
+                           codec: Optional[OutputCodec] = None, tiler: Optional[TileExecutor] = None,
+                           decoder: Optional[ImageDecoder] = None, morphology: bool = True) -> str:
     """
     Create threshold image specifically for turnover OCR (04_threshold variant)
     This matches the adaptive threshold strategy from final_optimization_01_binary.py
     """
     try:
-        # Load image
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError(f"Could not load image: {image_path}")
-        
         print(f"Creating threshold image: {image_path}")
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Apply adaptive threshold (robust to shading) - this is the key for turnovers
-        adaptive = cv2.adaptiveThreshold(
-            gray, 255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY,
-            11, 2
-        )
+        adaptive = render_variants(image_path, ['threshold'], cache, codec, tiler, decoder, morphology)['threshold']
         
         # Save threshold image in uploads/thresholds/ folder
         if output_path is None:
@@ -99,7 +278,7 @@ def create_threshold_image(image_path: str, output_path: str = None) -> str:
             # Also print the exact output path for the Node.js system to find
             print(f"Output saved to: {output_path}")
         
-        cv2.imwrite(output_path, adaptive)
+        write_bytes(output_path, adaptive)
         print(f"Threshold image saved to: {output_path}")
         
         return output_path
@@ -108,53 +287,23 @@ def create_threshold_image(image_path: str, output_path: str = None) -> str:
         print(f"Error in threshold image creation: {str(e)}")
         return None
 
-def create_enhanced_preprocessing(image_path: str, output_path: str = None) -> str:
+def create_enhanced_preprocessing(image_path: str, output_path: str = None, cache: Optional[ResultCache] = None,
+                                  codec: Optional[OutputCodec] = None, tiler: Optional[TileExecutor] = None,
+                                  decoder: Optional[ImageDecoder] = None, morphology: bool = True) -> str:
     """
     Create enhanced preprocessing variant with different techniques
     for better OCR accuracy on challenging text
     """
     try:
-        # Load image
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError(f"Could not load image: {image_path}")
-        
         print(f"Creating enhanced preprocessing variant: {image_path}")
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Apply stronger CLAHE for better contrast
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(16,16))
-        enhanced = clahe.apply(gray)
-        
-        # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(enhanced, (3, 3), 0)
-        
-        # Apply adaptive thresholding for better text separation
-        adaptive = cv2.adaptiveThreshold(
-            blurred, 255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY,
-            21, 11
-        )
-        
-        # Apply morphological opening to remove small artifacts
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2, 2))
-        opened = cv2.morphologyEx(adaptive, cv2.MORPH_OPEN, kernel)
-        
-        # Apply morphological closing to connect text components
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-        closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, kernel)
-        
-        # Invert for OCR (white text on black background)
-        final = cv2.bitwise_not(closed)
+        final = render_variants(image_path, ['enhanced'], cache, codec, tiler, decoder, morphology)['enhanced']
         
         # Save enhanced preprocessed image
         if output_path is None:
             output_path = image_path.replace('.jpg', '_enhanced.png').replace('.jpeg', '_enhanced.png').replace('.png', '_enhanced.png')
         
-        cv2.imwrite(output_path, final)
+        write_bytes(output_path, final)
         print(f"Enhanced preprocessing saved to: {output_path}")
         
         return output_path
@@ -163,30 +312,17 @@ def create_enhanced_preprocessing(image_path: str, output_path: str = None) -> s
         print(f"Error in enhanced preprocessing: {str(e)}")
         return None
 
-def create_multi_level_preprocessing(image_path: str, output_path: str = None) -> str:
+def create_multi_level_preprocessing(image_path: str, output_path: str = None, cache: Optional[ResultCache] = None,
+                                     codec: Optional[OutputCodec] = None, tiler: Optional[TileExecutor] = None,
+                                     decoder: Optional[ImageDecoder] = None, morphology: bool = True) -> str:
     """
     Create multi-level thresholding preprocessing variant
     This preserves more text information and might be better for rebounds/assists
     """
     try:
-        # Load image
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError(f"Could not load image: {image_path}")
-        
         print(f"Creating multi-level preprocessing variant: {image_path}")
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Apply multi-level thresholding (preserve more text)
-        _, thresh1 = cv2.threshold(gray, 50, 255, cv2.THRESH_BINARY)
-        _, thresh2 = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
-        _, thresh3 = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
-        
-        # Combine thresholds to preserve more text information
-        multi_level = cv2.bitwise_or(thresh1, thresh2)
-        multi_level = cv2.bitwise_or(multi_level, thresh3)
+        multi_level = render_variants(image_path, ['multilevel'], cache, codec, tiler, decoder, morphology)['multilevel']
         
         # Save multi-level preprocessed image
         if output_path is None:
@@ -194,7 +330,7 @@ def create_multi_level_preprocessing(image_path: str, output_path: str = None) -
             base_name = os.path.splitext(image_path)[0]
             output_path = f"{base_name}_multilevel.png"
         
-        cv2.imwrite(output_path, multi_level)
+        write_bytes(output_path, multi_level)
         print(f"Multi-level preprocessing saved to: {output_path}")
         
         return output_path
@@ -203,63 +339,340 @@ def create_multi_level_preprocessing(image_path: str, output_path: str = None) -
         print(f"Error in multi-level preprocessing: {str(e)}")
         return None
 
+def write_variants(image_path: str, variants: List[str], output_dir: str = None,
+                   cache: Optional[ResultCache] = None, codec: Optional[OutputCodec] = None,
+                   tiler: Optional[TileExecutor] = None, decoder: Optional[ImageDecoder] = None,
+                   triaged: bool = False, morphology: bool = True,
+                   base_name: str = None) -> Tuple[Dict[str, str], Optional[Dict]]:
+    """
+    Write each requested (or triage-picked) variant as <name>_<variant>.png:
+    (paths, triage report). base_name defaults to the input's file name and
+    may carry subdirectories of output_dir.
+    """
+    if output_dir is None:
+        output_dir = os.path.dirname(image_path)
+    if base_name is None:
+        base_name = os.path.splitext(os.path.basename(image_path))[0]
+    
+    outputs = {}
+    rendered, report = render_selected_variants(image_path, variants, cache, codec, tiler, decoder, triaged, morphology)
+    for variant, data in rendered.items():
+        output_path = os.path.join(output_dir, f"{base_name}_{variant}.png")
+        if os.path.dirname(output_path):
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        write_bytes(output_path, data)
+        outputs[variant] = output_path
+    return outputs, report
+
+def create_variants(image_path: str, variants: List[str], output_dir: str = None,
+                    cache: Optional[ResultCache] = None, codec: Optional[OutputCodec] = None,
+                    tiler: Optional[TileExecutor] = None, decoder: Optional[ImageDecoder] = None,
+                    triaged: bool = False, morphology: bool = True) -> Dict[str, str]:
+    """
+    Decode the input once and write every requested variant, sharing the
+    grayscale plane and CLAHE intermediates between them
+    """
+    try:
+        print(f"Creating variants {', '.join(variants)}: {image_path}")
+        
+        outputs, report = write_variants(image_path, variants, output_dir, cache, codec, tiler, decoder, triaged,
+                                         morphology)
+        if report:
+            print(f"Triage: {json.dumps(report)}")
+        for variant, output_path in outputs.items():
+            print(f"Variant {variant} saved to: {output_path}")
+        
+        return outputs
+        
+    except Exception as e:
+        print(f"Error creating variants: {str(e)}")
+        return None
+
+def map_variants(image_path: str, variants: List[str], output_path: str, cache: Optional[ResultCache] = None,
+                 codec: Optional[OutputCodec] = None, tiler: Optional[TileExecutor] = None,
+                 decoder: Optional[ImageDecoder] = None, triaged: bool = False, morphology: bool = True) -> Dict:
+    """
+    Write every requested variant back to back into one shared-memory file
+    (e.g. under /dev/shm) and print each variant's offset and length
+    """
+    try:
+        print(f"Creating variants {', '.join(variants)}: {image_path}")
+        
+        rendered, report = render_selected_variants(image_path, variants, cache, codec, tiler, decoder, triaged,
+                                                    morphology)
+        if report:
+            print(f"Triage: {json.dumps(report)}")
+        layout = {'output': output_path, 'sections': write_mapped_sections(list(rendered.items()), output_path)}
+        print(f"Mapped output: {json.dumps(layout)}")
+        
+        return layout
+        
+    except Exception as e:
+        print(f"Error creating variants: {str(e)}")
+        return None
+
+def collect_batch_inputs(source: str) -> List[str]:
+    """
+    Resolve a batch source to image paths: a directory (non-recursive), a
+    manifest file (JSON list / {"images": [...]} or one path per line), or a glob
+    """
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+    
+    if os.path.isfile(source) and not source.lower().endswith(IMAGE_EXTENSIONS):
+        base_dir = os.path.dirname(source)
+        with open(source, 'r', encoding='utf-8') as f:
+            if source.lower().endswith('.json'):
+                entries = json.load(f)
+                if isinstance(entries, dict):
+                    entries = entries.get('images', [])
+            else:
+                entries = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        return [entry if os.path.isabs(entry) else os.path.join(base_dir, entry) for entry in entries]
+    
+    return sorted(glob.glob(source, recursive=True))
+
+def batch_output_names(inputs: List[str], output_dir: str = None) -> Dict[str, str]:
+    """
+    Output base name for each batch input. With an output directory it is the
+    input's path below the inputs' common directory, so same-named images from
+    different subdirectories land in matching subdirectories; otherwise the file
+    name. Names still shared (scan.jpg next to scan.png) get the extension appended.
+    """
+    paths = [os.path.abspath(path) for path in inputs]
+    root = os.path.commonpath([os.path.dirname(path) for path in paths]) if output_dir is not None and paths else None
+    taken = Counter(os.path.splitext(path)[0] for path in set(paths))
+    
+    names = {}
+    for original, path in zip(inputs, paths):
+        stem, extension = os.path.splitext(path)
+        name = os.path.relpath(stem, root) if root else os.path.basename(stem)
+        names[original] = name if taken[stem] == 1 else f"{name}_{extension.lstrip('.')}"
+    return names
+
+@contextmanager
+def profiled_run(enabled: bool):
+    """Print a 'Profile: {...}' JSON line with per-stage timings for the enclosed work"""
+    if not enabled:
+        yield
+        return
+    
+    profiler = StageProfiler()
+    try:
+        with profiler.activate():
+            yield
+    finally:
+        # Also reached through sys.exit()
+        print(f"Profile: {json.dumps(profiler.report())}")
+
+def _init_batch_worker() -> None:
+    # One OpenCV thread per process; the pool already spreads work across cores
+    cv2.setNumThreads(1)
+
+def _process_batch_item(task) -> Dict:
+    (image_path, base_name, variants, output_dir, cache_dir, no_cache, profile, codec_profile, luminance, scale, triaged,
+     morphology) = task
+    started = time.perf_counter()
+    entry = {'input': image_path}
+    profiler = StageProfiler() if profile else None
+    try:
+        cache = cache_from_environment(cache_dir, no_cache)
+        codec = OutputCodec(codec_profile)
+        decoder = ImageDecoder(luminance, scale)
+        if profiler:
+            with profiler.activate():
+                entry['outputs'], report = write_variants(image_path, variants, output_dir, cache, codec, None, decoder, triaged,
+                                                          morphology, base_name)
+        else:
+            entry['outputs'], report = write_variants(image_path, variants, output_dir, cache, codec, None, decoder, triaged,
+                                                      morphology, base_name)
+        if report:
+            entry['triage'] = report
+        entry['status'] = 'ok'
+    except Exception as e:
+        entry['status'] = 'error'
+        entry['error'] = str(e)
+    entry['seconds'] = round(time.perf_counter() - started, 4)
+    if profiler:
+        entry['profile'] = profiler.report()
+    return entry
+
+def run_batch(source: str, variants: List[str], output_dir: str = None, workers: int = None,
+              manifest_path: str = None, cache_dir: str = None, no_cache: bool = False,
+              profile: bool = False, codec_profile: str = DEFAULT_CODEC_PROFILE,
+              luminance_decode: bool = False, decode_scale: int = 1, triaged: bool = False,
+              morphology: bool = True) -> Dict:
+    """
+    Run the variants over every image in a directory, glob or manifest on a
+    process pool and write a per-image result manifest (with per-stage
+    profiles when profile is set)
+    """
+    inputs = collect_batch_inputs(source)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(inputs) or 1))
+    print(f"Batch processing {len(inputs)} image(s) with {workers} worker(s): {', '.join(variants)}")
+    
+    started = time.perf_counter()
+    names = batch_output_names(inputs, output_dir)
+    tasks = [(path, names[path], variants, output_dir, cache_dir, no_cache, profile, codec_profile, luminance_decode,
+              decode_scale, triaged, morphology) for path in inputs]
+    results = []
+    with multiprocessing.Pool(workers, initializer=_init_batch_worker) as pool:
+        for entry in pool.imap_unordered(_process_batch_item, tasks):
+            results.append(entry)
+            status = '✅' if entry['status'] == 'ok' else f"❌ {entry.get('error')}"
+            print(f"[{len(results)}/{len(inputs)}] {entry['input']} {status} ({entry['seconds']}s)")
+    
+    results.sort(key=lambda entry: entry['input'])
+    manifest = {
+        'source': source,
+        'variants': variants,
+        'workers': workers,
+        'total': len(results),
+        'succeeded': sum(1 for entry in results if entry['status'] == 'ok'),
+        'failed': sum(1 for entry in results if entry['status'] != 'ok'),
+        'elapsed_seconds': round(time.perf_counter() - started, 4),
+        'results': results,
+    }
+    
+    if manifest_path is None:
+        manifest_path = os.path.join(output_dir or '.', 'batch_manifest.json')
+    os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Batch manifest saved to: {manifest_path}")
+    
+    return manifest
+
+def parse_variants(value: str) -> List[str]:
+    """argparse type for --variants a,b,c"""
+    variants = [v.strip() for v in value.split(',') if v.strip()]
+    unknown = [v for v in variants if v not in VARIANT_BUILDERS]
+    if unknown or not variants:
+        raise argparse.ArgumentTypeError(
+            f"Unknown variant(s): {', '.join(unknown) or value}. Choose from: {', '.join(VARIANTS)}"
+        )
+    return variants
+
 def main():
     parser = argparse.ArgumentParser(description='Python OCR Preprocessing Wrapper')
-    parser.add_argument('--input', '-i', required=True, help='Input image path')
+    parser.add_argument('--input', '-i', help='Input image path')
     parser.add_argument('--output', '-o', help='Output image path (optional)')
     parser.add_argument('--preprocess-only', action='store_true', help='Only preprocess, no OCR')
     parser.add_argument('--enhanced', action='store_true', help='Use enhanced preprocessing variant')
     parser.add_argument('--threshold', action='store_true', help='Create threshold image for turnover OCR')
     parser.add_argument('--multilevel', action='store_true', help='Create multi-level thresholding variant for rebounds/assists')
+    parser.add_argument('--all-variants', action='store_true', help='Decode once and write every preprocessing variant')
+    parser.add_argument('--variants', type=parse_variants, help=f"Comma-separated variants to write in one run ({','.join(VARIANTS)})")
+    parser.add_argument('--output-dir', help='Directory for --all-variants/--variants outputs (default: next to the input)')
+    parser.add_argument('--output-mmap', help='Write --all-variants/--variants outputs into this one file (e.g. under /dev/shm) and print their offsets')
+    parser.add_argument('--cache-dir', help='Result cache directory (default: SCORECHECK_CACHE_DIR or the system temp dir)')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the content-addressed result cache')
+    parser.add_argument('--batch', help='Process a directory, glob or manifest file of images on a process pool')
+    parser.add_argument('--workers', type=int, help='Batch worker processes (default: available cores)')
+    parser.add_argument('--manifest', help='Batch result manifest path (default: <output-dir>/batch_manifest.json)')
+    parser.add_argument('--codec', choices=list(CODEC_PROFILES),
+                        help='Output encoding profile (default: the processing profile\'s, else SCORECHECK_CODEC_PROFILE or standard)')
+    parser.add_argument('--tile-workers', type=int,
+                        help='Filter large frames in overlapping bands on this many threads (default: SCORECHECK_TILE_WORKERS, 0 = off)')
+    parser.add_argument('--profile', action='store_true', help='Report per-stage wall time, CPU time and peak memory as JSON')
+    parser.add_argument('--luminance-decode', action='store_true',
+                        help='Decode straight to grayscale instead of BGR + cvtColor (may differ by a level or two)')
+    parser.add_argument('--decode-scale', type=int, choices=list(DECODE_FLAGS),
+                        help='Decode at 1/N resolution; outputs are 1/N size (default: 1)')
+    parser.add_argument('--triage', action='store_true',
+                        help='Score image quality first and write only the variants it calls for (--all-variants/--variants/--batch)')
+    parser.add_argument('--processing-profile', choices=list(PROCESSING_PROFILES),
+                        help='Speed/accuracy trade-off: resolution, triage, morphology and codec (default: balanced); '
+                             'explicit flags still win')
     
     args = parser.parse_args()
     
+    # Explicit flags over the processing profile's settings over the built-in defaults
+    explicit = {'codec': args.codec, 'decode_scale': args.decode_scale,
+                'luminance_decode': args.luminance_decode or None, 'triage': args.triage or None}
+    settings = apply_processing_profile({'processing_profile': args.processing_profile or 'balanced',
+                                         **{name: value for name, value in explicit.items() if value is not None}})
+    codec_profile = settings.get('codec', os.environ.get('SCORECHECK_CODEC_PROFILE', DEFAULT_CODEC_PROFILE))
+    luminance_decode = settings.get('luminance_decode', False)
+    decode_scale = settings.get('decode_scale', 1)
+    triaged = settings.get('triage', False)
+    morphology = settings.get('morphology', True)
+    
+    if args.batch:
+        manifest = run_batch(args.batch, args.variants or list(VARIANTS), args.output_dir, args.workers,
+                             args.manifest, args.cache_dir, args.no_cache, args.profile, codec_profile,
+                             luminance_decode, decode_scale, triaged, morphology)
+        sys.exit(0 if manifest['failed'] == 0 else 1)
+    
+    if not args.input:
+        parser.error('--input is required unless --batch is given')
+    
     if not os.path.exists(args.input):
         print(f"❌ Input file does not exist: {args.input}")
         sys.exit(1)
     
-    if args.threshold:
-        # Create threshold image specifically for turnovers
-        output_path = create_threshold_image(args.input, args.output)
-        if output_path:
-            print(f"Output saved to: {output_path}")
-            sys.exit(0)
-        else:
-            sys.exit(1)
-    elif args.multilevel:
-        # Create multi-level preprocessing variant for rebounds/assists
-        output_path = create_multi_level_preprocessing(args.input, args.output)
-        if output_path:
-            print(f"Output saved to: {output_path}")
-            sys.exit(0)
-        else:
-            sys.exit(1)
-    elif args.enhanced:
-        # Use enhanced preprocessing
-        output_path = create_enhanced_preprocessing(args.input, args.output)
-        if output_path:
-            print(f"Output saved to: {output_path}")
-            sys.exit(0)
-        else:
-            sys.exit(1)
-    elif args.preprocess_only:
-        # Just preprocess the image
-        output_path = preprocess_image_for_ocr(args.input, args.output)
-        if output_path:
-            print(f"Output saved to: {output_path}")
-            sys.exit(0)
-        else:
-            sys.exit(1)
-    else:
-        # Preprocess and perform basic OCR test
-        output_path = preprocess_image_for_ocr(args.input, args.output)
-        if output_path:
-            print(f"✅ Preprocessing completed successfully")
-            print(f"Output saved to: {output_path}")
-            sys.exit(0)
+    with profiled_run(args.profile):
+        cache = cache_from_environment(args.cache_dir, args.no_cache)
+        codec = OutputCodec(codec_profile)
+        tiler = tile_executor_from_environment(args.tile_workers)
+        decoder = ImageDecoder(luminance_decode, decode_scale)
+        
+        if args.all_variants or args.variants:
+            # Write several variants from a single decode
+            if args.output_mmap:
+                layout = map_variants(args.input, args.variants or list(VARIANTS), args.output_mmap, cache, codec, tiler,
+                                      decoder, triaged, morphology)
+                sys.exit(0 if layout else 1)
+            outputs = create_variants(args.input, args.variants or list(VARIANTS), args.output_dir, cache, codec, tiler,
+                                      decoder, triaged, morphology)
+            if cache:
+                print(f"Cache stats: {cache.stats()}")
+            sys.exit(0 if outputs else 1)
+        elif args.threshold:
+            # Create threshold image specifically for turnovers
+            output_path = create_threshold_image(args.input, args.output, cache, codec, tiler, decoder, morphology)
+            if output_path:
+                print(f"Output saved to: {output_path}")
+                sys.exit(0)
+            else:
+                sys.exit(1)
+        elif args.multilevel:
+            # Create multi-level preprocessing variant for rebounds/assists
+            output_path = create_multi_level_preprocessing(args.input, args.output, cache, codec, tiler, decoder, morphology)
+            if output_path:
+                print(f"Output saved to: {output_path}")
+                sys.exit(0)
+            else:
+                sys.exit(1)
+        elif args.enhanced:
+            # Use enhanced preprocessing
+            output_path = create_enhanced_preprocessing(args.input, args.output, cache, codec, tiler, decoder, morphology)
+            if output_path:
+                print(f"Output saved to: {output_path}")
+                sys.exit(0)
+            else:
+                sys.exit(1)
+        elif args.preprocess_only:
+            # Just preprocess the image
+            output_path = preprocess_image_for_ocr(args.input, args.output, cache, codec, tiler, decoder, morphology)
+            if output_path:
+                print(f"Output saved to: {output_path}")
+                sys.exit(0)
+            else:
+                sys.exit(1)
         else:
-            print("❌ Preprocessing failed")
-            sys.exit(1)
+            # Preprocess and perform basic OCR test
+            output_path = preprocess_image_for_ocr(args.input, args.output, cache, codec, tiler, decoder, morphology)
+            if output_path:
+                print(f"✅ Preprocessing completed successfully")
+                print(f"Output saved to: {output_path}")
+                sys.exit(0)
+            else:
+                print("❌ Preprocessing failed")
+                sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark the PIL and NumPy/OpenCV backends of the preprocess_ocr chains
+Reports per-operation latency for each backend, the speedup, and whether
+the decoded output pixels match the PIL reference
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'services'))
+from pythonImageProcessor import PythonImageProcessor
+
+OPERATIONS = ('preprocess_ocr', 'preprocess_ocr_alternative', 'multiple_versions')
+
+def decode_pixels(data: bytes) -> np.ndarray:
+    return np.asarray(Image.open(io.BytesIO(data)).convert('L'))
+
+def time_operation(processor: PythonImageProcessor, operation: str, image_buffer: bytes,
+                   backend: str, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = processor.process_image_raw(operation, image_buffer, backend=backend)
+        timings.append(time.perf_counter() - started)
+    if not result['success']:
+        raise RuntimeError(result['error'])
+    return statistics.median(timings), result['data']
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare PIL and NumPy preprocessing backends')
+    parser.add_argument('images', nargs='+', help='Input screenshots')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per operation and backend (median is reported)')
+    args = parser.parse_args()
+
+    processor = PythonImageProcessor()
+    for image_path in args.images:
+        with open(image_path, 'rb') as f:
+            image_buffer = f.read()
+        print(f"{image_path}")
+
+        for operation in OPERATIONS:
+            pil_time, pil_data = time_operation(processor, operation, image_buffer, 'pil', args.repeat)
+            np_time, np_data = time_operation(processor, operation, image_buffer, 'numpy', args.repeat)
+
+            if isinstance(pil_data, bytes):
+                pil_data, np_data = {'data': pil_data}, {'data': np_data}
+            identical = all(np.array_equal(decode_pixels(pil_data[k]), decode_pixels(np_data[k])) for k in pil_data)
+
+            print(f"  {operation:<28} pil {pil_time * 1000:8.1f} ms   numpy {np_time * 1000:8.1f} ms   "
+                  f"speedup {pil_time / np_time:5.2f}x   pixels {'identical' if identical else 'DIFFER'}")
+
+if __name__ == "__main__":
+    main()
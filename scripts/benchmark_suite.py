@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the ScoreCheck image processing paths
+Generates synthetic NBA 2K-style box score frames at several resolutions with
+controlled skew and noise, then reports images/sec, latency percentiles and
+peak RSS for every PythonImageProcessor operation and wrapper variant
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+sys.path.insert(0, ROOT)
+from layoutDetector import REFERENCE_RESOLUTION, scale_reference_coordinates
+from stageProfiler import max_rss_kb
+
+RESOLUTIONS = {
+    '1080p': (1920, 1080),
+    '1440p': (2560, 1440),
+    '4k': (3840, 2160),
+}
+
+OPERATIONS = ('crop', 'crop_box_score', 'detect_layout', 'dimensions', 'preprocess_ocr',
+              'preprocess_ocr_alternative', 'multiple_versions', 'preprocess_binary_ocr', 'crop_preprocess')
+
+VARIANTS = ('preprocessed', 'threshold', 'enhanced', 'multilevel')
+
+# Box score region at REFERENCE_RESOLUTION, as in PythonImageProcessor.nba_2k25_coordinates
+BOX_SCORE_REGION = {'left': 1214, 'top': 430, 'width': 2267, 'height': 1209}
+
+STAT_COLUMNS = ('PTS', 'REB', 'AST', 'STL', 'BLK', 'TO', 'FGM/FGA', '3PM/3PA', 'FTM/FTA')
+
+def make_box_score_frame(width: int, height: int, skew: float = 0.0, noise: float = 0.0,
+                         seed: int = 0) -> np.ndarray:
+    """
+    Synthetic box score screenshot: dark gradient background, a ruled table
+    with a header row and ten player rows of stats, rotated by skew degrees
+    and with Gaussian noise of the given sigma
+    """
+    rng = np.random.default_rng(seed)
+    ramp = np.linspace(18, 52, height, dtype=np.float32)[:, None, None]
+    frame = np.broadcast_to(ramp * np.array([1.0, 0.8, 0.6], np.float32), (height, width, 3)).astype(np.uint8, order='C')
+
+    region = scale_reference_coordinates(BOX_SCORE_REGION, width, height)
+    left, top = region['left'], region['top']
+    right, bottom = left + region['width'], top + region['height']
+    scale = width / float(REFERENCE_RESOLUTION[0])
+    row_height = region['height'] // 12
+    name_width = region['width'] // 4
+    column_width = (region['width'] - name_width) // len(STAT_COLUMNS)
+    font_scale = 1.3 * scale
+    thickness = max(1, int(round(3 * scale)))
+    rule = max(1, int(round(2 * scale)))
+
+    cv2.rectangle(frame, (left, top), (right, bottom), (36, 28, 22), -1)
+    for row in range(12):
+        y = top + row * row_height
+        if row % 2 == 1:
+            cv2.rectangle(frame, (left, y), (right, y + row_height), (48, 38, 30), -1)
+        cv2.line(frame, (left, y), (right, y), (170, 170, 170), rule)
+        baseline = y + int(row_height * 0.7)
+
+        if row == 0:
+            cv2.putText(frame, 'PLAYER', (left + 20, baseline), cv2.FONT_HERSHEY_SIMPLEX,
+                        font_scale, (200, 200, 200), thickness, cv2.LINE_AA)
+            cells = STAT_COLUMNS
+        else:
+            cv2.putText(frame, f"PLAYER {row:02d}", (left + 20, baseline), cv2.FONT_HERSHEY_SIMPLEX,
+                        font_scale, (255, 255, 255), thickness, cv2.LINE_AA)
+            cells = []
+            for column in STAT_COLUMNS:
+                made = int(rng.integers(0, 15))
+                cells.append(f"{made}/{made + int(rng.integers(0, 10))}" if '/' in column
+                             else str(int(rng.integers(0, 40))))
+
+        for index, text in enumerate(cells):
+            x = left + name_width + index * column_width + 10
+            cv2.putText(frame, text, (x, baseline), cv2.FONT_HERSHEY_SIMPLEX,
+                        font_scale, (255, 255, 255), thickness, cv2.LINE_AA)
+    cv2.line(frame, (left, bottom), (right, bottom), (170, 170, 170), rule)
+
+    if skew:
+        M = cv2.getRotationMatrix2D((width / 2, height / 2), skew, 1.0)
+        frame = cv2.warpAffine(frame, M, (width, height), flags=cv2.INTER_LINEAR,
+                               borderMode=cv2.BORDER_REPLICATE)
+    if noise:
+        noisy = frame.astype(np.float32) + rng.normal(0, noise, frame.shape).astype(np.float32)
+        frame = np.clip(noisy, 0, 255).astype(np.uint8)
+    return frame
+
+def generate_workload(output_dir: str, resolutions: List[str], skews: List[float],
+                      noises: List[float], seed: int) -> Dict[str, List[str]]:
+    """Write one JPEG per resolution/skew/noise combination and return the paths per resolution"""
+    workload = {}
+    for resolution in resolutions:
+        width, height = RESOLUTIONS[resolution]
+        paths = []
+        for skew in skews:
+            for noise in noises:
+                frame = make_box_score_frame(width, height, skew, noise, seed)
+                path = os.path.join(output_dir, f"boxscore_{resolution}_skew{skew:g}_noise{noise:g}.jpg")
+                cv2.imwrite(path, frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+                paths.append(path)
+        workload[resolution] = paths
+    return workload
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    ms = np.array(latencies) * 1000
+    return {
+        'runs': len(latencies),
+        'images_per_sec': round(len(latencies) / elapsed, 2) if elapsed > 0 else None,
+        'p50_ms': round(float(np.percentile(ms, 50)), 2),
+        'p90_ms': round(float(np.percentile(ms, 90)), 2),
+        'p99_ms': round(float(np.percentile(ms, 99)), 2),
+        'max_ms': round(float(ms.max()), 2),
+    }
+
+def run_case(task) -> Dict:
+    """
+    Time one operation or variant over a set of images. Runs in its own
+    process so the reported peak RSS belongs to this case alone.
+    """
+    kind, name, paths, iterations, warmup = task
+    images = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            images.append(f.read())
+    baseline_rss = max_rss_kb()
+
+    if kind == 'operation':
+        from pythonImageProcessor import PythonImageProcessor
+        processor = PythonImageProcessor()
+
+        def call(index):
+            result = processor.process_image_raw(name, images[index])
+            if not result['success']:
+                raise RuntimeError(result['error'])
+    else:
+        from python_ocr_wrapper import render_variants
+
+        def call(index):
+            render_variants(paths[index], [name])
+
+    latencies = []
+    try:
+        for index in range(min(warmup, len(paths))):
+            call(index)
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for index in range(len(paths)):
+                call_started = time.perf_counter()
+                call(index)
+                latencies.append(time.perf_counter() - call_started)
+    except Exception as e:
+        return {'kind': kind, 'name': name, 'error': str(e)}
+    elapsed = time.perf_counter() - started
+
+    return {
+        'kind': kind,
+        'name': name,
+        **summarize(latencies, elapsed),
+        'baseline_rss_kb': baseline_rss,
+        'peak_rss_kb': max_rss_kb(),
+    }
+
+def parse_list(value: str) -> List[str]:
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ScoreCheck operations on synthetic box score frames')
+    parser.add_argument('--resolutions', type=parse_list, default=list(RESOLUTIONS), help=f"Comma-separated ({','.join(RESOLUTIONS)})")
+    parser.add_argument('--skew', type=parse_list, default=['0', '2'], help='Comma-separated skew angles in degrees')
+    parser.add_argument('--noise', type=parse_list, default=['0', '8'], help='Comma-separated Gaussian noise sigmas')
+    parser.add_argument('--operations', type=parse_list, default=list(OPERATIONS), help='Processor operations to time')
+    parser.add_argument('--variants', type=parse_list, default=list(VARIANTS), help='Wrapper variants to time')
+    parser.add_argument('--iterations', type=int, default=3, help='Passes over the images of each resolution')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed calls before measuring')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic stats and noise')
+    parser.add_argument('--keep-images', help='Write the synthetic frames to this directory and keep them')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    unknown = [r for r in args.resolutions if r not in RESOLUTIONS]
+    unknown += [o for o in args.operations if o not in OPERATIONS]
+    unknown += [v for v in args.variants if v not in VARIANTS]
+    if unknown:
+        parser.error(f"Unknown resolution/operation/variant: {', '.join(unknown)}")
+
+    temp_dir = None
+    if args.keep_images:
+        image_dir = args.keep_images
+        os.makedirs(image_dir, exist_ok=True)
+    else:
+        temp_dir = tempfile.TemporaryDirectory(prefix='scorecheck-bench-')
+        image_dir = temp_dir.name
+
+    try:
+        workload = generate_workload(image_dir, args.resolutions, [float(s) for s in args.skew],
+                                     [float(n) for n in args.noise], args.seed)
+        cases = [('operation', name) for name in args.operations] + [('variant', name) for name in args.variants]
+        report = {
+            'skew': args.skew,
+            'noise': args.noise,
+            'iterations': args.iterations,
+            'cpu_count': os.cpu_count(),
+            'opencv': cv2.__version__,
+            'results': {},
+        }
+
+        for resolution, paths in workload.items():
+            print(f"{resolution} ({len(paths)} image(s) x {args.iterations} iteration(s))")
+            print(f"  {'case':<36} {'img/s':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'peak RSS MB':>12}")
+            rows = []
+            for kind, name in cases:
+                # A fresh process per case keeps peak RSS attributable
+                with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+                    row = pool.apply(run_case, ((kind, name, paths, args.iterations, args.warmup),))
+                rows.append(row)
+                label = f"{kind}:{name}"
+                if 'error' in row:
+                    print(f"  {label:<36} error: {row['error']}")
+                    continue
+                peak_mb = f"{row['peak_rss_kb'] / 1024:.1f}" if row['peak_rss_kb'] is not None else 'n/a'
+                print(f"  {label:<36} {row['images_per_sec']:>8} {row['p50_ms']:>9} {row['p90_ms']:>9} "
+                      f"{row['p99_ms']:>9} {peak_mb:>12}")
+            report['results'][resolution] = rows
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"Results saved to: {args.json}")
+    finally:
+        if temp_dir:
+            temp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
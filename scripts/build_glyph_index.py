@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Build the glyph index used by the offline digit recognizer
+Renders the digit, '/' and '-' glyphs of OpenCV's Hershey fonts at several
+sizes and stroke weights, optionally adds glyphs cut from labeled captures,
+and writes the deduplicated templates to src/services/glyphIndex.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+from digitRecognizer import DEFAULT_INDEX_PATH, GLYPH_SIZE, LABELS, GlyphIndex, extract_glyphs, normalize_glyph
+
+FONTS = (cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX, cv2.FONT_HERSHEY_COMPLEX, cv2.FONT_HERSHEY_TRIPLEX)
+SCALES = (1.0, 1.5, 2.0)
+# Stroke weights relative to the scale, from hairline to heavy
+WEIGHTS = (1, 2, 3, 4)
+
+def rendered_glyphs() -> Dict[str, List[np.ndarray]]:
+    """Each label drawn alone in every font, scale and weight, antialiased and binarized as a capture would be"""
+    glyphs = {label: [] for label in LABELS}
+    for font in FONTS:
+        for scale in SCALES:
+            for weight in WEIGHTS:
+                thickness = max(1, int(round(weight * scale)))
+                for label in LABELS:
+                    canvas = np.zeros((int(80 * scale), int(80 * scale)), np.uint8)
+                    cv2.putText(canvas, label, (int(15 * scale), int(55 * scale)), font, scale, 255,
+                                thickness, cv2.LINE_AA)
+                    ink = canvas > 127
+                    rows, columns = np.flatnonzero(ink.any(axis=1)), np.flatnonzero(ink.any(axis=0))
+                    glyphs[label].append(ink[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1])
+    return glyphs
+
+def sample_glyphs(manifest_path: str) -> Dict[str, List[np.ndarray]]:
+    """
+    Glyphs from labeled captures. The manifest is a JSON list of
+    {"image": path, "cells": {row: {column: text}}} using table_grid's row
+    indices and column names; cells whose glyph count differs from the text are skipped.
+    """
+    from pythonImageProcessor import PythonImageProcessor
+    processor = PythonImageProcessor(cache=None)
+    glyphs = {label: [] for label in LABELS}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        samples = json.load(f)
+    for sample in samples:
+        with open(sample['image'], 'rb') as f:
+            image_buffer = f.read()
+        crops, _ = processor.segment_table_grid(image_buffer, crops=True)
+        for row, columns in sample['cells'].items():
+            for column, text in columns.items():
+                data = crops.get(f"{row}_{column}")
+                if data is None:
+                    continue
+                cell = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+                masks = extract_glyphs(cell)
+                if len(masks) != len(text):
+                    continue
+                for label, mask in zip(text, masks):
+                    if label in glyphs:
+                        glyphs[label].append(mask)
+    return glyphs
+
+def to_template(mask: np.ndarray) -> np.ndarray:
+    """A normalized glyph as the binary GLYPH_SIZE x GLYPH_SIZE image the index stores"""
+    return (normalize_glyph(mask) > 0).reshape(GLYPH_SIZE, GLYPH_SIZE)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the offline digit recognizer glyph index')
+    parser.add_argument('--samples', action='append', default=[],
+                        help='JSON manifest of labeled captures to add glyphs from (repeatable)')
+    parser.add_argument('--no-fonts', action='store_true', help='Leave out the rendered Hershey font glyphs')
+    parser.add_argument('--output', default=DEFAULT_INDEX_PATH, help='Index path (default: the bundled index)')
+    args = parser.parse_args()
+
+    sources = [] if args.no_fonts else [rendered_glyphs()]
+    sources += [sample_glyphs(path) for path in args.samples]
+
+    templates = {label: [] for label in LABELS}
+    for source in sources:
+        for label, masks in source.items():
+            seen = {template.tobytes() for template in templates[label]}
+            for mask in masks:
+                template = to_template(mask)
+                if template.tobytes() not in seen:
+                    seen.add(template.tobytes())
+                    templates[label].append(template)
+
+    GlyphIndex(templates).save(args.output)
+    counts = ', '.join(f"{label}: {len(masks)}" for label, masks in templates.items())
+    print(f"Glyph index saved to: {args.output} ({counts}; {os.path.getsize(args.output)} bytes)")
+
+if __name__ == '__main__':
+    main()
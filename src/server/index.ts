@@ -14,6 +14,7 @@ import screenshotRoutes from '@/routes/screenshots';
 import analyticsRoutes from '@/routes/analytics';
 import adminRoutes from '@/routes/admin';
 import healthRoutes from '@/routes/health';
+import pythonImageProcessor from '@/services/pythonImageProcessorWrapper';
 
 // Load environment variables
 dotenv.config();
@@ -184,11 +185,13 @@ app.listen(PORT, () => {
 // Graceful shutdown
 process.on('SIGTERM', () => {
   console.log('SIGTERM received, shutting down gracefully');
+  pythonImageProcessor.close();
   process.exit(0);
 });
 
 process.on('SIGINT', () => {
   console.log('SIGINT received, shutting down gracefully');
+  pythonImageProcessor.close();
   process.exit(0);
 });
 
@@ -0,0 +1,58 @@
+import { demultiplexTextBlocks, MontageLayout } from '../pythonImageProcessorWrapper';
+import { TextBlock } from '../../types';
+
+// Two crops packed side by side with a 10 px gutter, as ocrMontage.compose_montage lays them out;
+// the second was decoded at half resolution, so its source box is twice its montage box
+const layout: MontageLayout = {
+  width: 150,
+  height: 60,
+  offsets: {
+    '0_points': { left: 10, top: 10, width: 50, height: 40, source: { left: 1865, top: 500, width: 50, height: 40 } },
+    '0_rebounds': { left: 70, top: 10, width: 60, height: 40, source: { left: 2030, top: 500, width: 120, height: 80 } },
+  },
+};
+
+function block(description: string, left: number, top: number, width: number, height: number): TextBlock {
+  return {
+    description,
+    boundingPoly: {
+      vertices: [
+        { x: left, y: top },
+        { x: left + width, y: top },
+        { x: left + width, y: top + height },
+        { x: left, y: top + height },
+      ],
+    },
+  };
+}
+
+describe('demultiplexTextBlocks', () => {
+  it('moves each block back to source pixels of the crop holding its centre', () => {
+    const { crops, unassigned } = demultiplexTextBlocks(
+      [block('25', 20, 15, 20, 30), block('10', 80, 20, 30, 20)],
+      layout
+    );
+
+    expect(unassigned).toEqual([]);
+    expect(crops['0_points']).toEqual([block('25', 1875, 505, 20, 30)]);
+    expect(crops['0_rebounds']).toEqual([block('10', 2050, 520, 60, 40)]);
+  });
+
+  it('clips blocks spilling out of their crop and leaves gutter blocks unassigned', () => {
+    const { crops, unassigned } = demultiplexTextBlocks(
+      [block('7', 5, 20, 20, 20), block('-', 61, 20, 8, 20)],
+      layout
+    );
+
+    expect(crops['0_points']).toEqual([block('7', 1865, 510, 15, 20)]);
+    expect(crops['0_rebounds']).toEqual([]);
+    expect(unassigned).toEqual([block('-', 61, 20, 8, 20)]);
+  });
+
+  it('returns every block unassigned for an empty layout', () => {
+    const { crops, unassigned } = demultiplexTextBlocks([block('3', 0, 0, 5, 5)], { width: 0, height: 0, offsets: {} });
+
+    expect(crops).toEqual({});
+    expect(unassigned).toHaveLength(1);
+  });
+});
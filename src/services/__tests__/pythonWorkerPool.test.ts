@@ -0,0 +1,117 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { encodeFrames, PythonWorkerPool, takeFrame } from '../pythonWorkerPool';
+
+// Stand-in for `pythonImageProcessor.py --serve` speaking the same framing: echoes the image back as a
+// single-section binary result, never answers 'hang' and answers 'garbage' with a header that is not JSON
+const FAKE_WORKER = `
+let buffer = Buffer.alloc(0);
+const frames = [];
+const frame = (payload) => {
+  const length = Buffer.alloc(4);
+  length.writeUInt32BE(payload.length, 0);
+  return Buffer.concat([length, payload]);
+};
+process.stdin.on('data', (data) => {
+  buffer = Buffer.concat([buffer, data]);
+  while (buffer.length >= 4 && buffer.length >= 4 + buffer.readUInt32BE(0)) {
+    const end = 4 + buffer.readUInt32BE(0);
+    frames.push(buffer.subarray(4, end));
+    buffer = buffer.subarray(end);
+  }
+  while (frames.length >= 2) {
+    const request = JSON.parse(frames.shift().toString('utf-8'));
+    const image = frames.shift();
+    if (request.operation === 'hang') {
+      continue;
+    }
+    if (request.operation === 'garbage') {
+      process.stdout.write(frame(Buffer.from('not json')));
+      continue;
+    }
+    const header = { id: request.id, success: true, operation: request.operation, layout: 'single',
+                     sections: [{ name: 'data', length: image.length }] };
+    // Split the response mid-frame so the pool has to reassemble it
+    const response = Buffer.concat([frame(Buffer.from(JSON.stringify(header))), frame(image)]);
+    process.stdout.write(response.subarray(0, 3));
+    setTimeout(() => process.stdout.write(response.subarray(3)), 5);
+  }
+});
+`;
+
+describe('frame encoding', () => {
+  it('round-trips payloads however the bytes are split', () => {
+    const payloads = [Buffer.from('{"id":1}'), Buffer.alloc(0), Buffer.alloc(70000, 7)];
+    const encoded = encodeFrames(...payloads);
+
+    for (const chunk of [1, 5, 4096, encoded.length]) {
+      const decoded: Buffer[] = [];
+      let pending = Buffer.alloc(0);
+      for (let offset = 0; offset < encoded.length; offset += chunk) {
+        pending = Buffer.concat([pending, encoded.subarray(offset, offset + chunk)]);
+        for (let next = takeFrame(pending); next !== null; next = takeFrame(pending)) {
+          decoded.push(next.frame);
+          pending = next.rest;
+        }
+      }
+      expect(decoded.map((frame) => frame.toString('hex'))).toEqual(payloads.map((payload) => payload.toString('hex')));
+      expect(pending.length).toBe(0);
+    }
+  });
+
+  it('waits for the rest of a partial frame', () => {
+    expect(takeFrame(encodeFrames(Buffer.from('abc')).subarray(0, 5))).toBe(null);
+    expect(takeFrame(Buffer.from([0, 0]))).toBe(null);
+  });
+});
+
+describe('PythonWorkerPool', () => {
+  let scriptPath: string;
+  let pool: PythonWorkerPool;
+
+  beforeAll(() => {
+    scriptPath = path.join(fs.mkdtempSync(path.join(os.tmpdir(), 'scorecheck-pool-')), 'worker.js');
+    fs.writeFileSync(scriptPath, FAKE_WORKER);
+    pool = new PythonWorkerPool(process.execPath, scriptPath, 1, 500);
+  });
+
+  afterAll(() => {
+    pool.close();
+    fs.rmSync(path.dirname(scriptPath), { recursive: true, force: true });
+  });
+
+  it('sends a request and reassembles the framed response', async () => {
+    const image = Buffer.alloc(200000, 3);
+    const result = await pool.run({ operation: 'echo', params: {}, imageBuffer: image });
+
+    expect(result.success).toBe(true);
+    expect(result.operation).toBe('echo');
+    expect(Buffer.compare(result.data, image)).toBe(0);
+  });
+
+  it('replaces a worker that does not answer in time', async () => {
+    await expect(pool.run({ operation: 'hang', params: {}, imageBuffer: Buffer.from('x') })).rejects.toThrow('timed out');
+
+    const result = await pool.run({ operation: 'echo', params: {}, imageBuffer: Buffer.from('after') });
+    expect(result.data.toString()).toBe('after');
+  });
+
+  it('replaces a worker whose response header cannot be parsed', async () => {
+    await expect(pool.run({ operation: 'garbage', params: {}, imageBuffer: Buffer.from('x') }))
+      .rejects.toThrow('Invalid response header');
+
+    const result = await pool.run({ operation: 'echo', params: {}, imageBuffer: Buffer.from('again') });
+    expect(result.data.toString()).toBe('again');
+  });
+
+  it('rejects queued requests on close', async () => {
+    const closing = new PythonWorkerPool(process.execPath, scriptPath, 1, 500);
+    const running = closing.run({ operation: 'hang', params: {}, imageBuffer: Buffer.from('x') });
+    const queued = closing.run({ operation: 'echo', params: {}, imageBuffer: Buffer.from('y') });
+    closing.close();
+
+    await expect(running).rejects.toThrow('closed');
+    await expect(queued).rejects.toThrow('closed');
+  });
+});
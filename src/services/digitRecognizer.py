@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Offline digit recognition for ScoreCheck
+Reads integers and made/attempted pairs from binarized stat cells by
+nearest-neighbour matching of normalized glyphs against a compact glyph
+index, with a confidence per cell so only doubtful cells go to cloud OCR
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Glyphs are compared as GLYPH_SIZE x GLYPH_SIZE images, aspect ratio kept
+GLYPH_SIZE = 16
+LABELS = '0123456789/-'
+
+# Built by scripts/build_glyph_index.py
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'glyphIndex.json')
+
+# Cells below this confidence should go to cloud OCR
+DEFAULT_MIN_CONFIDENCE = 0.8
+# A glyph is fully confident once its best label beats every other label by this much cosine similarity
+CONFIDENCE_MARGIN = 0.1
+
+def extract_glyphs(cell: np.ndarray) -> List[np.ndarray]:
+    """
+    Glyph masks of a binary cell (white ink on black), left to right.
+    Components that overlap horizontally are one glyph (broken strokes);
+    specks much smaller than the tallest glyph are dropped.
+    """
+    count, labels, stats, _ = cv2.connectedComponentsWithStats((cell > 127).astype(np.uint8), connectivity=8)
+    if count <= 1:
+        return []
+    tallest = int(stats[1:, cv2.CC_STAT_HEIGHT].max())
+    boxes = []
+    for i in range(1, count):
+        left, top, width, height, area = (int(v) for v in stats[i][:5])
+        # Keep short wide marks like '-', drop dots and noise
+        if area < max(4, tallest * tallest // 100) or max(width, height) < tallest // 4:
+            continue
+        boxes.append([left, left + width, [i]])
+    boxes.sort(key=lambda box: box[0])
+
+    merged: List[list] = []
+    for box in boxes:
+        if merged and box[0] < merged[-1][1] - 1:
+            merged[-1][1] = max(merged[-1][1], box[1])
+            merged[-1][2] += box[2]
+        else:
+            merged.append(box)
+
+    glyphs = []
+    for left, right, components in merged:
+        mask = np.isin(labels[:, left:right], components)
+        rows = np.flatnonzero(mask.any(axis=1))
+        glyphs.append(mask[rows[0]:rows[-1] + 1])
+    return glyphs
+
+def normalize_glyph(mask: np.ndarray) -> np.ndarray:
+    """Fit the glyph's longer side to GLYPH_SIZE, centre it, and return a zero-mean unit vector"""
+    h, w = mask.shape
+    scale = GLYPH_SIZE / float(max(h, w))
+    sw, sh = max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+    small = cv2.resize(mask.astype(np.float32), (sw, sh), interpolation=cv2.INTER_AREA)
+    canvas = np.zeros((GLYPH_SIZE, GLYPH_SIZE), np.float32)
+    top, left = (GLYPH_SIZE - sh) // 2, (GLYPH_SIZE - sw) // 2
+    canvas[top:top + sh, left:left + sw] = small
+    return _unit(canvas.ravel())
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    vector = vector - vector.mean()
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm > 0 else vector
+
+def parse_value(text: str) -> Any:
+    """An integer, [made, attempted] for 'a/b' or 'a-b', or None if the text is neither"""
+    for separator in '/-':
+        if separator in text:
+            parts = text.split(separator)
+            if len(parts) == 2 and all(part.isdigit() for part in parts):
+                return [int(parts[0]), int(parts[1])]
+            return None
+    return int(text) if text.isdigit() else None
+
+class GlyphIndex:
+    """
+    Binary glyph templates per label. Stored as JSON with each label's
+    templates bit-packed and base64-encoded (32 bytes per template), so a few
+    hundred templates take a few kilobytes.
+    """
+
+    def __init__(self, templates: Dict[str, List[np.ndarray]]):
+        self.templates = templates
+        labels, vectors = [], []
+        for label, masks in templates.items():
+            for mask in masks:
+                labels.append(LABELS.index(label))
+                vectors.append(_unit(mask.astype(np.float32).ravel()))
+        self.labels = np.array(labels, dtype=np.int32)
+        self.vectors = np.array(vectors, dtype=np.float32).reshape(-1, GLYPH_SIZE * GLYPH_SIZE)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> 'GlyphIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        if entries.get('glyph_size') != GLYPH_SIZE:
+            raise ValueError(f"Glyph index {path} was built for {entries.get('glyph_size')}px glyphs, not {GLYPH_SIZE}")
+        templates = {}
+        for label, packed in entries['templates'].items():
+            bits = np.unpackbits(np.frombuffer(base64.b64decode(packed), np.uint8))
+            templates[label] = list(bits.reshape(-1, GLYPH_SIZE, GLYPH_SIZE).astype(bool))
+        return cls(templates)
+
+    def save(self, path: str) -> None:
+        entries = {
+            'glyph_size': GLYPH_SIZE,
+            'templates': {label: base64.b64encode(np.packbits(np.array(masks, dtype=bool))).decode('ascii')
+                          for label, masks in self.templates.items() if masks},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=1)
+
+    def classify(self, vector: np.ndarray) -> Tuple[str, float]:
+        """Best label and its confidence: cosine similarity, scaled down when the runner-up label is close"""
+        similarities = self.vectors @ vector
+        best = np.full(len(LABELS), -1.0, dtype=np.float32)
+        np.maximum.at(best, self.labels, similarities)
+        first, second = np.argsort(best)[::-1][:2]
+        margin = float(best[first] - best[second])
+        return LABELS[first], max(0.0, float(best[first])) * min(1.0, margin / CONFIDENCE_MARGIN)
+
+    def recognize(self, cell: np.ndarray) -> Dict[str, Any]:
+        """
+        Text, parsed value and confidence of a binary cell. The cell confidence is
+        its least confident glyph's; empty or unparseable cells score 0, and so do
+        cells with ink on their left or right edge, whose outer glyph may be cut off.
+        """
+        text, confidence = '', 1.0
+        for mask in extract_glyphs(cell):
+            label, score = self.classify(normalize_glyph(mask))
+            text += label
+            confidence = min(confidence, score)
+        value = parse_value(text)
+        if value is None or cell[:, 0].any() or cell[:, -1].any():
+            confidence = 0.0
+        return {'text': text, 'value': value, 'confidence': round(confidence, 3)}
+
+_default_index: Optional[GlyphIndex] = None
+
+def default_glyph_index() -> GlyphIndex:
+    """The bundled index, loaded once per process"""
+    global _default_index
+    if _default_index is None:
+        _default_index = GlyphIndex.load()
+    return _default_index
@@ -3,6 +3,10 @@ import { BoxScoreParser } from './boxScoreParser';
 import * as fs from 'fs';
 import * as path from 'path';
 import { spawn } from 'child_process';
+import { readMappedSections, removeSharedFiles, sharedTempPath } from './sharedMemory';
+
+// python_ocr_wrapper.py variants read by OCR passes 2-4; pass 1 reads the uploaded image itself
+const PASS_VARIANTS = ['threshold', 'enhanced', 'multilevel'];
 
 // Optimized coordinates from final_optimization_01_binary.py
 const OPTIMIZED_COORDINATES = {
@@ -239,18 +243,27 @@ export class EnhancedOCRService {
       this.clearCache();
       
       // 🚫 FORCE FRESH PROCESSING - Always process the uploaded image
-      console.log('🔄 Processing uploaded image directly with Python preprocessing...');
-      const processedBuffer = await this.preprocessImageWithPython(imageBuffer);
+      // Decode once and build the variants for passes 2-4 in a single Python run
+      let variants: Record<string, Buffer> = {};
+      // Variants the quality triage found unnecessary for this image; their OCR passes are skipped
+      let skipped = new Set<string>();
+      try {
+        ({ variants, skipped } = await this.generatePreprocessingVariants(imageBuffer));
+      } catch (e) {
+        console.warn('⚠️ Single-run variant generation failed, falling back to per-variant processing');
+      }
 
       // Also generate binary-ocr variants to use 04_threshold specifically for turnovers
       // Use our working python_ocr_wrapper.py directly
-      let thresholdBuffer: Buffer | null = null;
-      try {
-        console.log('🔄 Generating threshold image using python_ocr_wrapper.py...');
-        thresholdBuffer = await this.generateThresholdImage(imageBuffer);
-        console.log('🖼️ Acquired threshold buffer for turnover OCR (04_threshold)');
-      } catch (e) {
-        console.warn('⚠️ Could not acquire threshold buffer, will use main buffer for turnovers');
+      let thresholdBuffer: Buffer | null = variants.threshold ?? null;
+      if (!thresholdBuffer && !skipped.has('threshold')) {
+        try {
+          console.log('🔄 Generating threshold image using python_ocr_wrapper.py...');
+          thresholdBuffer = await this.generateThresholdImage(imageBuffer);
+          console.log('🖼️ Acquired threshold buffer for turnover OCR (04_threshold)');
+        } catch (e) {
+          console.warn('⚠️ Could not acquire threshold buffer, will use main buffer for turnovers');
+        }
       }
       
       // Extract image number from filename for player IDs
@@ -260,8 +273,8 @@ export class EnhancedOCRService {
       // ENHANCED: Multi-pass OCR with confidence scoring for higher accuracy
       console.log('🔍 Running enhanced multi-pass OCR...');
       
-      // Pass 1: Main preprocessed image
-      const [result] = await this.vision.textDetection(processedBuffer);
+      // Pass 1: Original uploaded image
+      const [result] = await this.vision.textDetection(imageBuffer);
       const textBlocks = result.textAnnotations || [];
       console.log(`📊 OCR(main) extracted ${textBlocks.length} text blocks`);
 
@@ -280,26 +293,34 @@ export class EnhancedOCRService {
 
       // Pass 3: Enhanced preprocessing for better text clarity
       let enhancedBlocks: TextBlock[] = [] as any;
-      try {
-        const enhancedBuffer = await this.createEnhancedPreprocessing(imageBuffer);
-        const [resultEnhanced] = await this.vision.textDetection(enhancedBuffer);
-        const textBlocksEnhanced = resultEnhanced.textAnnotations || [];
-        enhancedBlocks = (textBlocksEnhanced.slice(1) as any) || [];
-        console.log(`📊 OCR(enhanced) extracted ${enhancedBlocks.length} text blocks`);
-      } catch (err) {
-        console.warn('⚠️ Enhanced OCR failed, proceeding without it');
+      if (skipped.has('enhanced')) {
+        console.log('⏭️ Skipping enhanced OCR: quality triage found no contrast or noise problem');
+      } else {
+        try {
+          const enhancedBuffer = variants.enhanced ?? await this.createEnhancedPreprocessing(imageBuffer);
+          const [resultEnhanced] = await this.vision.textDetection(enhancedBuffer);
+          const textBlocksEnhanced = resultEnhanced.textAnnotations || [];
+          enhancedBlocks = (textBlocksEnhanced.slice(1) as any) || [];
+          console.log(`📊 OCR(enhanced) extracted ${enhancedBlocks.length} text blocks`);
+        } catch (err) {
+          console.warn('⚠️ Enhanced OCR failed, proceeding without it');
+        }
       }
       
       // Pass 4: Multi-level preprocessing for rebounds and assists
       let multiLevelBlocks: TextBlock[] = [] as any;
-      try {
-        const multiLevelBuffer = await this.createMultiLevelPreprocessing(imageBuffer);
-        const [resultMultiLevel] = await this.vision.textDetection(multiLevelBuffer);
-        const textBlocksMultiLevel = resultMultiLevel.textAnnotations || [];
-        multiLevelBlocks = (textBlocksMultiLevel.slice(1) as any) || [];
-        console.log(`📊 OCR(multi-level) extracted ${multiLevelBlocks.length} text blocks`);
-      } catch (err) {
-        console.warn('⚠️ Multi-level OCR failed, proceeding without it');
+      if (skipped.has('multilevel')) {
+        console.log('⏭️ Skipping multi-level OCR: quality triage found the image sharp');
+      } else {
+        try {
+          const multiLevelBuffer = variants.multilevel ?? await this.createMultiLevelPreprocessing(imageBuffer);
+          const [resultMultiLevel] = await this.vision.textDetection(multiLevelBuffer);
+          const textBlocksMultiLevel = resultMultiLevel.textAnnotations || [];
+          multiLevelBlocks = (textBlocksMultiLevel.slice(1) as any) || [];
+          console.log(`📊 OCR(multi-level) extracted ${multiLevelBlocks.length} text blocks`);
+        } catch (err) {
+          console.warn('⚠️ Multi-level OCR failed, proceeding without it');
+        }
       }
       
       if (textBlocks.length === 0) {
@@ -324,70 +345,72 @@ export class EnhancedOCRService {
     }
   }
 
-  private async preprocessImageWithPython(imageBuffer: Buffer): Promise<Buffer> {
-    return new Promise((resolve, reject) => {
-      try {
-        // Save image buffer to temporary file
-        const tempInputPath = path.join(__dirname, '..', '..', 'temp_input.jpg');
-        fs.writeFileSync(tempInputPath, imageBuffer);
-        
-        // Run Python preprocessing wrapper script with cache-busting
-        const uniqueId = Math.random().toString(36).substr(2, 9);
+  private async generatePreprocessingVariants(
+    imageBuffer: Buffer
+  ): Promise<{ variants: Record<string, Buffer>; skipped: Set<string> }> {
+    // Input and all variant outputs live in shared memory (/dev/shm), never on disk
+    const inputPath = sharedTempPath('scorecheck-input', '.jpg');
+    const outputPath = sharedTempPath('scorecheck-variants', '.bin');
+    fs.writeFileSync(inputPath, imageBuffer);
+
+    // Opt-in: score image quality first and only build the variants it calls for
+    const triage = ['1', 'true'].includes((process.env.SCORECHECK_TRIAGE || '').toLowerCase());
+
+    try {
+      const output = await new Promise<string>((resolve, reject) => {
         const pythonProcess = spawn('python', [
           path.join(__dirname, '..', '..', 'python_ocr_wrapper.py'),
-          '--preprocess-only',
-          '--input', tempInputPath,
-          '--unique-id', uniqueId
+          '--variants', PASS_VARIANTS.join(','),
+          '--input', inputPath,
+          '--output-mmap', outputPath,
+          ...(triage ? ['--triage'] : [])
         ]);
-        
-        let output = '';
-        let errorOutput = '';
-        
+
+        let stdout = '';
+        let stderr = '';
+
         pythonProcess.stdout.on('data', (data) => {
-          output += data.toString();
+          stdout += data.toString();
         });
-        
+
         pythonProcess.stderr.on('data', (data) => {
-          errorOutput += data.toString();
+          stderr += data.toString();
         });
-        
+
         pythonProcess.on('close', (code) => {
-          try {
-            // Clean up temp file
-            if (fs.existsSync(tempInputPath)) {
-              fs.unlinkSync(tempInputPath);
-            }
-            
-                         if (code === 0) {
-               // Look for output image path in Python output
-               const outputMatch = output.match(/Output saved to: (.+)/);
-               if (outputMatch && outputMatch[1] && fs.existsSync(outputMatch[1])) {
-                 const processedBuffer = fs.readFileSync(outputMatch[1]);
-                 resolve(processedBuffer);
-               } else {
-                 console.warn('⚠️ Python preprocessing completed but output file not found, using original');
-                 resolve(imageBuffer);
-               }
-             } else {
-               console.warn('⚠️ Python preprocessing failed, using original image');
-               resolve(imageBuffer);
-             }
-          } catch (cleanupError) {
-            console.warn('⚠️ Error during cleanup, using original image');
-            resolve(imageBuffer);
+          if (code === 0) {
+            resolve(stdout);
+          } else {
+            reject(new Error(`Variant preprocessing failed with code ${code}: ${stderr}`));
           }
         });
-        
+
         pythonProcess.on('error', (error) => {
-          console.warn('⚠️ Python preprocessing error, using original image:', error);
-          resolve(imageBuffer);
+          reject(new Error(`Failed to start variant preprocessing: ${error.message}`));
         });
-      
-    } catch (error) {
-        console.warn('⚠️ Python preprocessing setup failed, using original image');
-        resolve(imageBuffer);
+      });
+
+      const mapped = output.match(/Mapped output: (.+)/);
+      const variants: Record<string, Buffer> = mapped && mapped[1]
+        ? readMappedSections(outputPath, JSON.parse(mapped[1]).sections)
+        : {};
+      console.log(`✅ Generated preprocessing variants: ${Object.keys(variants).join(', ')}`);
+
+      const skipped = new Set<string>();
+      const triaged = output.match(/Triage: (.+)/);
+      if (triaged && triaged[1]) {
+        const report = JSON.parse(triaged[1]);
+        for (const name of PASS_VARIANTS) {
+          if (!report.variants.includes(name)) {
+            skipped.add(name);
+          }
+        }
+        console.log(`🩺 Quality triage: ${report.issues.join(', ') || 'clean'}; skipping ${[...skipped].join(', ') || 'nothing'}`);
       }
-    });
+      return { variants, skipped };
+    } finally {
+      removeSharedFiles(inputPath, outputPath);
+    }
   }
 
   private extractDataByOptimizedCoordinates(blocks: TextBlock[], thresholdBlocks: TextBlock[], enhancedBlocks: TextBlock[], multiLevelBlocks: TextBlock[], imageNumber: string): {
@@ -1518,8 +1541,9 @@ export class EnhancedOCRService {
       const path = await import('path');
       
       return new Promise((resolve, reject) => {
-        // Save image buffer to temporary file
-        const tempInputPath = path.join(__dirname, '..', '..', 'temp_input.jpg');
+        // Save image buffer to a unique shared-memory file
+        const tempInputPath = sharedTempPath('scorecheck-input', '.jpg');
+        const tempOutputPath = sharedTempPath('scorecheck-output', '.png');
         console.log(`📁 Temp input path: ${tempInputPath}`);
         fs.writeFileSync(tempInputPath, imageBuffer);
         console.log(`💾 Saved temp image: ${imageBuffer.length} bytes`);
@@ -1531,7 +1555,8 @@ export class EnhancedOCRService {
         const pythonProcess = spawn('python', [
           pythonScriptPath,
           '--threshold',
-          '--input', tempInputPath
+          '--input', tempInputPath,
+          '--output', tempOutputPath
         ]);
         
         console.log(`🚀 Spawned Python process with PID: ${pythonProcess.pid}`);
@@ -1583,10 +1608,13 @@ export class EnhancedOCRService {
           } catch (cleanupError) {
             console.warn('⚠️ Error during cleanup, using original image');
             reject(new Error('Threshold preprocessing cleanup failed'));
+          } finally {
+            removeSharedFiles(tempOutputPath);
           }
         });
         
         pythonProcess.on('error', (error) => {
+          removeSharedFiles(tempInputPath, tempOutputPath);
           console.warn('⚠️ Python preprocessing error:', error);
           reject(new Error(`Failed to start threshold preprocessing: ${error.message}`));
         });
@@ -1607,14 +1635,16 @@ export class EnhancedOCRService {
       const path = await import('path');
       
       return new Promise((resolve, reject) => {
-        // Save image buffer to temporary file
-        const tempInputPath = path.join(__dirname, '..', '..', 'temp_input.jpg');
+        // Save image buffer to a unique shared-memory file
+        const tempInputPath = sharedTempPath('scorecheck-input', '.jpg');
+        const tempOutputPath = sharedTempPath('scorecheck-output', '.png');
         fs.writeFileSync(tempInputPath, imageBuffer);
         
         const pythonProcess = spawn('python', [
           path.join(__dirname, '..', '..', 'python_ocr_wrapper.py'),
           '--enhanced',
-          '--input', tempInputPath
+          '--input', tempInputPath,
+          '--output', tempOutputPath
         ]);
         
         let output = '';
@@ -1652,10 +1682,13 @@ export class EnhancedOCRService {
           } catch (cleanupError) {
             console.warn('⚠️ Error during cleanup, using original image');
             reject(new Error('Enhanced preprocessing cleanup failed'));
+          } finally {
+            removeSharedFiles(tempOutputPath);
           }
         });
         
         pythonProcess.on('error', (error) => {
+          removeSharedFiles(tempInputPath, tempOutputPath);
           reject(new Error(`Failed to start enhanced preprocessing: ${error.message}`));
         });
       });
@@ -1675,14 +1708,16 @@ export class EnhancedOCRService {
       const path = await import('path');
       
       return new Promise((resolve, reject) => {
-        // Save image buffer to temporary file
-        const tempInputPath = path.join(__dirname, '..', '..', 'temp_input.jpg');
+        // Save image buffer to a unique shared-memory file
+        const tempInputPath = sharedTempPath('scorecheck-input', '.jpg');
+        const tempOutputPath = sharedTempPath('scorecheck-output', '.png');
         fs.writeFileSync(tempInputPath, imageBuffer);
         
         const pythonProcess = spawn('python', [
           path.join(__dirname, '..', '..', 'python_ocr_wrapper.py'),
           '--multilevel',
-          '--input', tempInputPath
+          '--input', tempInputPath,
+          '--output', tempOutputPath
         ]);
         
         let output = '';
@@ -1720,10 +1755,13 @@ export class EnhancedOCRService {
           } catch (cleanupError) {
             console.warn('⚠️ Error during cleanup, using original image');
             reject(new Error('Multi-level preprocessing cleanup failed'));
+          } finally {
+            removeSharedFiles(tempOutputPath);
           }
         });
         
         pythonProcess.on('error', (error) => {
+          removeSharedFiles(tempInputPath, tempOutputPath);
           reject(new Error(`Failed to start multi-level preprocessing: ${error.message}`));
         });
       });
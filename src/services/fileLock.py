@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Cross-process locking for ScoreCheck's small shared JSON files
+Serializes read-merge-write updates between workers so one worker's save
+does not drop entries another worker wrote in between
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Exclusive lock on path + '.lock', held for the with block. The data file
+    itself is replaced by rename, so it cannot carry the lock.
+    """
+    fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl is None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+def update_json(path: str, update: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Under the lock, read the JSON object at path (empty if missing or
+    unreadable), write update(current) back by write-then-rename so readers
+    never see a partial file, and return what was written
+    """
+    with file_lock(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                current = json.load(f)
+        except (OSError, ValueError):
+            current = {}
+        merged = update(current if isinstance(current, dict) else {})
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(merged, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return merged
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Image decoding for ScoreCheck image processing
+Decodes straight to luminance and/or at reduced resolution when an operation allows it
+"""
+
+from __future__ import annotations
+
+import io
+from typing import Any, Dict
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from stageProfiler import profile_stage
+
+# imdecode flag names per reduced-resolution factor: (colour, luminance); looked up
+# on cv2 when decoding, so importing this module does not load OpenCV
+DECODE_FLAGS = {
+    1: ('IMREAD_COLOR', 'IMREAD_GRAYSCALE'),
+    2: ('IMREAD_REDUCED_COLOR_2', 'IMREAD_REDUCED_GRAYSCALE_2'),
+    4: ('IMREAD_REDUCED_COLOR_4', 'IMREAD_REDUCED_GRAYSCALE_4'),
+    8: ('IMREAD_REDUCED_COLOR_8', 'IMREAD_REDUCED_GRAYSCALE_8'),
+}
+
+class ImageDecoder:
+    """
+    Decodes encoded image bytes. With luminance=True grayscale consumers get
+    the decoder's own single-channel output (for JPEG the Y plane) instead of
+    a BGR decode plus cvtColor; it can differ from BGR2GRAY by a level or two,
+    so it is opt-in. scale 2/4/8 decodes at 1/scale size, which libjpeg does
+    in the DCT domain without ever building the full frame.
+    """
+
+    def __init__(self, luminance: bool = False, scale: int = 1):
+        if scale not in DECODE_FLAGS:
+            raise ValueError(f"Unsupported decode scale: {scale} (choose from {', '.join(map(str, DECODE_FLAGS))})")
+        self.luminance = luminance
+        self.scale = scale
+
+    @property
+    def is_default(self) -> bool:
+        return not self.luminance and self.scale == 1
+
+    def describe(self) -> Dict[str, Any]:
+        return {'luminance': self.luminance, 'scale': self.scale}
+
+    def full_resolution(self) -> ImageDecoder:
+        """This decoder, or a full-resolution luminance one in place of a reduced-resolution decode"""
+        return self if self.scale == 1 else ImageDecoder(luminance=True)
+
+    def decode(self, image_buffer: Any) -> np.ndarray:
+        """Decode to a BGR array at the configured scale"""
+        return self._imdecode(image_buffer, getattr(cv2, DECODE_FLAGS[self.scale][0]))
+
+    def decode_gray(self, image_buffer: Any) -> np.ndarray:
+        """Decode to a grayscale plane, directly when luminance decoding is enabled"""
+        if self.luminance:
+            return self._imdecode(image_buffer, getattr(cv2, DECODE_FLAGS[self.scale][1]))
+
+        img = self.decode(image_buffer)
+        with profile_stage('grayscale'):
+            return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+    def decode_gray_pil(self, image_buffer: Any) -> Image.Image:
+        """decode_gray for the PIL backend; JPEG draft mode gives the same luminance/reduced decode"""
+        with profile_stage('decode'):
+            image = Image.open(io.BytesIO(image_buffer))
+            if self.is_default:
+                return image.convert('L')
+
+            # draft() picks the largest DCT scale that keeps at least this size; asking for the
+            # rounded-down size makes that the full factor for odd dimensions too
+            source_size = image.size
+            image.draft('L' if self.luminance else None,
+                        (max(1, image.width // self.scale), max(1, image.height // self.scale)))
+            gray = image.convert('L')
+            if gray.size != source_size:
+                return gray
+            # draft() only applies to (single-scan) JPEG; other images are reduced after decoding,
+            # dropping partial edge blocks as OpenCV's reduced decode does
+            width, height = gray.width - gray.width % self.scale, gray.height - gray.height % self.scale
+            return gray.reduce(self.scale, (0, 0, width or gray.width, height or gray.height))
+
+    def to_decoded(self, coordinates: Dict[str, int]) -> Dict[str, int]:
+        """Map source-resolution coordinates onto the decoded frame"""
+        return {name: value // self.scale for name, value in coordinates.items()}
+
+    def to_source(self, coordinates: Dict[str, int]) -> Dict[str, int]:
+        """Map decoded-frame coordinates back to source resolution"""
+        return {name: value * self.scale for name, value in coordinates.items()}
+
+    def _imdecode(self, image_buffer: Any, flags: int) -> np.ndarray:
+        with profile_stage('decode'):
+            img = cv2.imdecode(np.frombuffer(image_buffer, np.uint8), flags)
+        if img is None:
+            raise ValueError("Failed to decode image")
+        return img
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Header-only image metadata for ScoreCheck
+Reads width, height, format and EXIF orientation from JPEG and PNG headers
+without decoding pixels or loading the imaging libraries
+"""
+
+import struct
+from typing import Any, Dict, Optional
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Start-of-frame markers, which carry the frame size (0xC4 DHT, 0xC8 JPG and 0xCC DAC share the range)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field: TEM, RST0-7, SOI
+JPEG_STANDALONE_MARKERS = frozenset([0x01, 0xD8] + list(range(0xD0, 0xD8)))
+
+EXIF_ORIENTATION_TAG = 0x0112
+
+def read_image_header(data: Any) -> Dict[str, Any]:
+    """
+    {'format', 'width', 'height', 'orientation'} of JPEG or PNG bytes (or a
+    memory map), reading only the header segments. Width and height are as
+    stored; orientations 5-8 display them transposed. orientation is 1 when
+    there is no EXIF tag. Raises ValueError for other formats and truncated headers.
+    """
+    head = bytes(data[:8])
+    try:
+        if head[:2] == b'\xff\xd8':
+            return _jpeg_header(data)
+        if head == PNG_SIGNATURE:
+            return _png_header(data)
+    except (struct.error, IndexError):
+        raise ValueError("Truncated image header")
+    raise ValueError("Not a JPEG or PNG image")
+
+def _jpeg_header(data: Any) -> Dict[str, Any]:
+    orientation = 1
+    offset = 2
+    while True:
+        # Markers may be preceded by any number of 0xFF fill bytes
+        if data[offset] != 0xFF:
+            raise ValueError("Corrupt JPEG marker")
+        while data[offset] == 0xFF:
+            offset += 1
+        marker = data[offset]
+        offset += 1
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker in (0xD9, 0xDA):
+            raise ValueError("JPEG has no frame header before its image data")
+        length, = struct.unpack('>H', data[offset:offset + 2])
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', data[offset + 3:offset + 7])
+            return {'format': 'jpeg', 'width': width, 'height': height, 'orientation': orientation}
+        if marker == 0xE1 and bytes(data[offset + 2:offset + 8]) == b'Exif\x00\x00':
+            orientation = _exif_orientation(bytes(data[offset + 8:offset + length])) or orientation
+        offset += length
+
+def _png_header(data: Any) -> Dict[str, Any]:
+    length, kind, width, height = struct.unpack('>I4sII', data[8:24])
+    if kind != b'IHDR':
+        raise ValueError("PNG does not start with IHDR")
+
+    # An eXIf chunk, if any, comes before the first IDAT; skip chunks by their lengths
+    orientation = 1
+    offset = 8 + 12 + length
+    while offset + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', data[offset:offset + 8])
+        if kind in (b'IDAT', b'IEND'):
+            break
+        if kind == b'eXIf':
+            orientation = _exif_orientation(bytes(data[offset + 8:offset + 8 + length])) or orientation
+            break
+        offset += 12 + length
+    return {'format': 'png', 'width': width, 'height': height, 'orientation': orientation}
+
+def _exif_orientation(tiff: bytes) -> Optional[int]:
+    """Orientation tag (1-8) from the first IFD of a TIFF-structured EXIF block, or None"""
+    if len(tiff) < 8 or tiff[:2] not in (b'II', b'MM'):
+        return None
+    order = '<' if tiff[:2] == b'II' else '>'
+    ifd, = struct.unpack(order + 'I', tiff[4:8])
+    if ifd + 2 > len(tiff):
+        return None
+    count, = struct.unpack(order + 'H', tiff[ifd:ifd + 2])
+    for entry in range(ifd + 2, min(ifd + 2 + count * 12, len(tiff) - 11), 12):
+        tag, kind, _, value = struct.unpack(order + 'HHIH', tiff[entry:entry + 10])
+        if tag == EXIF_ORIENTATION_TAG:
+            # SHORT values sit left-justified in the 4-byte value field
+            return value if kind == 3 and 1 <= value <= 8 else None
+    return None
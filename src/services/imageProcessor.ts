@@ -1,4 +1,4 @@
-import pythonImageProcessor from './pythonImageProcessorWrapper';
+import pythonImageProcessor, { ProcessingOptions } from './pythonImageProcessorWrapper';
 // Keep sharp as fallback option
 import sharp from 'sharp';
 
@@ -43,11 +43,12 @@ export class ImageProcessor {
   /**
    * Crop image to the specific NBA 2K25 box score coordinates
    * @param imageBuffer - The input image buffer
+   * @param options - auto_detect to locate the table instead, source to key its layout cache
    * @returns Promise<Buffer> - The cropped image buffer
    */
-  async cropBoxScore(imageBuffer: Buffer): Promise<Buffer> {
+  async cropBoxScore(imageBuffer: Buffer, options: Pick<ProcessingOptions, 'auto_detect' | 'source'> = {}): Promise<Buffer> {
     try {
-      return await pythonImageProcessor.cropBoxScore(imageBuffer);
+      return await pythonImageProcessor.cropBoxScore(imageBuffer, options);
     } catch (error) {
       console.error('Error cropping box score:', error);
       throw new Error('Failed to crop box score');
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Box score layout detection for ScoreCheck
+Finds the box score table from its ruled lines and caches the rectangle per source and resolution
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+from fileLock import update_json
+
+# nba_2k25_coordinates were measured on 4K captures
+REFERENCE_RESOLUTION = (3840, 2160)
+
+class LayoutCache:
+    """Detected crop rectangles keyed by source fingerprint and resolution, optionally persisted as JSON"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.layouts: Dict[str, Dict[str, int]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.layouts = json.load(f)
+            except (OSError, ValueError):
+                self.layouts = {}
+
+    @staticmethod
+    def make_key(width: int, height: int, source: Optional[str] = None) -> str:
+        return f"{source or 'default'}:{width}x{height}"
+
+    def get(self, key: str) -> Optional[Dict[str, int]]:
+        return self.layouts.get(key)
+
+    def put(self, key: str, coordinates: Dict[str, int]) -> None:
+        self.layouts[key] = coordinates
+        if not self.path:
+            return
+
+        # Merged into what is on disk under the lock, so entries other workers saved meanwhile survive
+        try:
+            self.layouts = update_json(self.path, lambda saved: {**saved, key: coordinates})
+        except OSError:
+            pass
+
+def scale_reference_coordinates(coordinates: Dict[str, int], width: int, height: int) -> Dict[str, int]:
+    """Scale reference-resolution coordinates to another frame size"""
+    sx = width / float(REFERENCE_RESOLUTION[0])
+    sy = height / float(REFERENCE_RESOLUTION[1])
+    return {
+        'left': int(round(coordinates['left'] * sx)),
+        'top': int(round(coordinates['top'] * sy)),
+        'width': int(round(coordinates['width'] * sx)),
+        'height': int(round(coordinates['height'] * sy)),
+    }
+
+def detect_box_score_region(gray: np.ndarray, working_width: int = 960,
+                            min_lines: int = 3) -> Optional[Dict[str, int]]:
+    """
+    Locate the box score table from its long horizontal ruled lines.
+    Works on a downscaled copy; returns full-resolution crop coordinates or
+    None when not enough table lines are found.
+    """
+    h, w = gray.shape[:2]
+    scale = min(1.0, working_width / float(w))
+    small = cv2.resize(gray, (max(1, int(w * scale)), max(1, int(h * scale))),
+                       interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+    sh, sw = small.shape[:2]
+
+    # Thin bright/dark rules show up in a local threshold; keep only long horizontal runs
+    edges = cv2.adaptiveThreshold(small, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                  cv2.THRESH_BINARY_INV, 15, 10)
+    edges |= cv2.adaptiveThreshold(small, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                   cv2.THRESH_BINARY, 15, -10)
+    # A short vertical dilation bridges the stair-steps of slightly skewed rules
+    edges = cv2.dilate(edges, cv2.getStructuringElement(cv2.MORPH_RECT, (1, 5)))
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(10, sw // 8), 1))
+    horizontal = cv2.morphologyEx(edges, cv2.MORPH_OPEN, kernel)
+
+    # Long, thin components within ~15 degrees of horizontal
+    count, _, stats, _ = cv2.connectedComponentsWithStats(horizontal, connectivity=8)
+    lines = [
+        stats[i] for i in range(1, count)
+        if stats[i][cv2.CC_STAT_WIDTH] >= sw * 0.3
+        and stats[i][cv2.CC_STAT_HEIGHT] <= max(8, stats[i][cv2.CC_STAT_WIDTH] * 0.27)
+    ]
+    if len(lines) < min_lines:
+        return None
+
+    lefts = [int(s[cv2.CC_STAT_LEFT]) for s in lines]
+    rights = [int(s[cv2.CC_STAT_LEFT] + s[cv2.CC_STAT_WIDTH]) for s in lines]
+    ys = sorted(int(s[cv2.CC_STAT_TOP]) for s in lines)
+
+    # Rows sit between rules, so pad one row spacing above the first and below the last
+    spacing = int(np.median(np.diff(ys))) if len(ys) > 1 else 0
+    left = max(0, int(np.median(lefts)) - spacing // 2)
+    right = min(sw, int(np.median(rights)) + spacing // 2)
+    top = max(0, ys[0] - spacing)
+    bottom = min(sh, ys[-1] + spacing)
+
+    return {
+        'left': int(left / scale),
+        'top': int(top / scale),
+        'width': int((right - left) / scale),
+        'height': int((bottom - top) / scale),
+    }
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Deferred imports for ScoreCheck image processing
+Binds heavy libraries (OpenCV, NumPy, Pillow) as placeholder modules that
+import on first attribute access, so operations that never touch pixels
+never pay for loading them
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Any
+
+class DeferredModule(ModuleType):
+    """
+    Stands in for a module in sys.modules until an attribute is needed, then
+    imports it and takes on its namespace. Plain `import name` statements
+    elsewhere return the placeholder without loading it (importlib.util.LazyLoader
+    would load on the import system's __spec__ lookup).
+    """
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(_load(self), attr)
+
+def _load(placeholder: DeferredModule) -> ModuleType:
+    """The real module behind a placeholder, importing it and copying its namespace over on first use"""
+    module = placeholder.__dict__.get('_deferred_module')
+    if module is None:
+        name = placeholder.__name__
+        if sys.modules.get(name) is placeholder:
+            del sys.modules[name]
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            sys.modules[name] = placeholder
+            raise
+        placeholder.__dict__.update(module.__dict__)
+        placeholder.__dict__['_deferred_module'] = module
+    return module
+
+def load_now(*modules: ModuleType) -> None:
+    """Import deferred modules immediately, e.g. before a long-lived worker takes requests"""
+    for module in modules:
+        if isinstance(module, DeferredModule):
+            _load(module)
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    The module if it is already imported, else a DeferredModule registered in
+    sys.modules. Raises ImportError up front if the module is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    module = DeferredModule(name)
+    module.__spec__ = spec
+    sys.modules[name] = module
+    return module
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+OCR montages for ScoreCheck
+Packs many small crops (cells, columns, regions of several screenshots) into
+one composite image so a single OCR call reads them all, and maps the word
+boxes recognized on the composite back to the crop each one came from
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Blank space between crops; OCR engines split words at gaps much narrower than this
+MIN_GUTTER = 16
+# Default montage width is this multiple of the side of a square holding all the crops
+WIDTH_FACTOR = 1.25
+
+Box = Dict[str, int]
+
+def pack_shelves(sizes: Sequence[Tuple[int, int]], max_width: int, gutter: int) -> Tuple[List[Tuple[int, int]], Tuple[int, int]]:
+    """
+    Next-fit decreasing-height shelf packing: crops sorted tallest first fill
+    shelves left to right, a new shelf starting when the next crop would pass
+    max_width. Returns each (width, height)'s (left, top) in input order and
+    the montage (width, height), all crops gutter apart and from the edges.
+    """
+    positions: List[Tuple[int, int]] = [(0, 0)] * len(sizes)
+    x = y = gutter
+    shelf_height = 0
+    used_width = gutter
+    for index in sorted(range(len(sizes)), key=lambda i: -sizes[i][1]):
+        width, height = sizes[index]
+        if x > gutter and x + width + gutter > max_width:
+            y += shelf_height + gutter
+            x, shelf_height = gutter, 0
+        positions[index] = (x, y)
+        x += width + gutter
+        used_width = max(used_width, x)
+        shelf_height = max(shelf_height, height)
+    return positions, (used_width, y + shelf_height + gutter)
+
+def compose_montage(crops: Sequence[Tuple[str, np.ndarray]], max_width: Optional[int] = None,
+                    gutter: Optional[int] = None, background: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Box]]:
+    """
+    One grayscale image holding every named crop, and each crop's box in it.
+    gutter defaults to half the median short side of the crops (at least MIN_GUTTER);
+    max_width to a roughly square layout, never narrower than the widest crop;
+    background to the median border level of the crops, so gutters read as blank.
+    """
+    if not crops:
+        raise ValueError("No crops to compose")
+    sizes = [(int(image.shape[1]), int(image.shape[0])) for _, image in crops]
+    if gutter is None:
+        gutter = max(MIN_GUTTER, int(np.median([min(width, height) for width, height in sizes])) // 2)
+    widest = max(width for width, _ in sizes)
+    if max_width is None:
+        area = sum((width + gutter) * (height + gutter) for width, height in sizes)
+        max_width = int(np.sqrt(area) * WIDTH_FACTOR)
+    max_width = max(max_width, widest + 2 * gutter)
+    if background is None:
+        borders = np.concatenate([np.concatenate((image[0], image[-1], image[:, 0], image[:, -1]))
+                                  for _, image in crops])
+        background = int(np.median(borders))
+
+    positions, (width, height) = pack_shelves(sizes, max_width, gutter)
+    montage = np.full((height, width), background, dtype=np.uint8)
+    offsets = {}
+    for (name, image), (left, top), (w, h) in zip(crops, positions, sizes):
+        montage[top:top + h, left:left + w] = image
+        offsets[name] = {'left': left, 'top': top, 'width': w, 'height': h}
+    return montage, offsets
+
+def demultiplex_words(words: Sequence[Dict[str, Any]],
+                      offsets: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    Word boxes ({'left', 'top', 'width', 'height', ...}) recognized on a montage,
+    grouped by the crop holding each word's centre and moved into that crop's
+    coordinates (clipped to it). Offsets that carry a 'source' box also give
+    each word its 'source' box, scaled to the source image. Words whose centre
+    falls in a gutter are returned separately.
+    """
+    grouped: Dict[str, List[Dict[str, Any]]] = {name: [] for name in offsets}
+    unassigned = []
+    for word in words:
+        cx = word['left'] + word['width'] / 2.0
+        cy = word['top'] + word['height'] / 2.0
+        name = next((name for name, box in offsets.items()
+                     if box['left'] <= cx < box['left'] + box['width'] and box['top'] <= cy < box['top'] + box['height']),
+                    None)
+        if name is None:
+            unassigned.append(word)
+            continue
+
+        box = offsets[name]
+        left = min(max(word['left'] - box['left'], 0), box['width'])
+        top = min(max(word['top'] - box['top'], 0), box['height'])
+        local = {'left': left, 'top': top,
+                 'width': min(word['left'] + word['width'] - box['left'], box['width']) - left,
+                 'height': min(word['top'] + word['height'] - box['top'], box['height']) - top}
+        placed = {**word, **local}
+        if 'source' in box:
+            source = box['source']
+            sx, sy = source['width'] / float(box['width']), source['height'] / float(box['height'])
+            placed['source'] = {'left': source['left'] + int(round(local['left'] * sx)),
+                                'top': source['top'] + int(round(local['top'] * sy)),
+                                'width': int(round(local['width'] * sx)), 'height': int(round(local['height'] * sy))}
+        grouped[name].append(placed)
+    return grouped, unassigned
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Output codec for ScoreCheck image processing
+Central place for how result images are encoded, with named speed/size profiles
+"""
+
+from __future__ import annotations
+
+import io
+from typing import Any, Dict
+
+import cv2
+from PIL import Image
+
+# Settings a profile overrides; anything a profile leaves out keeps the calling
+# operation's own setting. A png_compression of None means the encoder default,
+# which for OpenCV is its fastest PNG path.
+CODEC_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Each operation's established encoding
+    'standard': {},
+    # Cheapest encode: baseline JPEG, default zlib effort, 1-bit binaries
+    'fast': {
+        'jpeg_quality': 90,
+        'jpeg_optimize': False,
+        'jpeg_progressive': False,
+        'png_compression': None,
+        'pack_binary': True,
+    },
+    # Smallest payloads for upload/storage
+    'small': {
+        'jpeg_quality': 85,
+        'jpeg_optimize': True,
+        'jpeg_progressive': True,
+        'png_compression': 9,
+        'pack_binary': True,
+    },
+    # No lossy outputs: JPEG results become PNG
+    'lossless': {
+        'format': 'png',
+        'png_compression': 3,
+        'pack_binary': True,
+    },
+}
+
+DEFAULT_CODEC_PROFILE = 'standard'
+
+class OutputCodec:
+    def __init__(self, profile: str = DEFAULT_CODEC_PROFILE):
+        if profile not in CODEC_PROFILES:
+            raise ValueError(f"Unknown codec profile: {profile}")
+        self.profile = profile
+        self.settings = CODEC_PROFILES[profile]
+
+    def encode(self, image: Any, format: str = 'png', jpeg_quality: int = 95, jpeg_optimize: bool = False,
+               jpeg_progressive: bool = False, png_compression: int = None, binary: bool = False,
+               pack_binary: bool = False) -> bytes:
+        """
+        Encode an ndarray or PIL image. Arguments are the calling operation's
+        settings; the profile overrides them. binary marks 0/255 images, which
+        pack_binary writes as 1-bit PNG.
+        """
+        settings = self.settings
+        format = settings.get('format', format)
+        jpeg_quality = settings.get('jpeg_quality', jpeg_quality)
+        jpeg_optimize = settings.get('jpeg_optimize', jpeg_optimize)
+        jpeg_progressive = settings.get('jpeg_progressive', jpeg_progressive)
+        png_compression = settings.get('png_compression', png_compression)
+        pack = binary and settings.get('pack_binary', pack_binary)
+
+        if isinstance(image, Image.Image):
+            return self._encode_pil(image, format, jpeg_quality, jpeg_optimize, jpeg_progressive,
+                                    png_compression, binary, pack)
+
+        if format == 'jpeg':
+            params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+            if jpeg_progressive:
+                params += [cv2.IMWRITE_JPEG_PROGRESSIVE, 1]
+            if jpeg_optimize:
+                params += [cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+            ok, buffer = cv2.imencode('.jpg', image, params)
+        else:
+            params = [cv2.IMWRITE_PNG_BILEVEL, 1] if pack else []
+            if png_compression is not None:
+                params += [cv2.IMWRITE_PNG_COMPRESSION, png_compression]
+            ok, buffer = cv2.imencode('.png', image, params)
+
+        if not ok:
+            raise ValueError(f"Could not encode image as {format}")
+        return buffer.tobytes()
+
+    def _encode_pil(self, image: Image.Image, format: str, jpeg_quality: int, jpeg_optimize: bool,
+                    jpeg_progressive: bool, png_compression: int, binary: bool, pack: bool) -> bytes:
+        if binary:
+            # Threshold without dithering so 0/255 pixels survive either way
+            image = image.convert('1', dither=Image.NONE) if pack else image.convert('L')
+
+        output = io.BytesIO()
+        if format == 'jpeg':
+            image.save(output, format='JPEG', quality=jpeg_quality, progressive=jpeg_progressive,
+                       optimize=jpeg_optimize)
+        elif png_compression is None:
+            image.save(output, format='PNG', compress_level=1)
+        elif png_compression == 9:
+            # Level 9 plus PIL's extra optimize pass, as the PIL backend always wrote
+            image.save(output, format='PNG', optimize=True)
+        else:
+            image.save(output, format='PNG', compress_level=png_compression)
+        return output.getvalue()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Perceptual fingerprints for ScoreCheck image processing
+Hashes the box score region so recompressed, rescaled or slightly edited
+screenshots of the same box score can be recognised as near-duplicates
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from fileLock import update_json
+
+# 16x16 low-frequency DCT coefficients: a 256-bit pHash. 8x8 (64 bits) cannot
+# tell two box scores with the same layout apart; at 256 bits recompressed,
+# 1080p-rescaled, cursor-overlaid and slightly shifted copies of a synthetic
+# frame stay within 30 bits while frames with different stats are 84+ apart.
+HASH_SIZE = 16
+DEFAULT_MAX_DISTANCE = 40
+
+def perceptual_hash(gray: np.ndarray, hash_size: int = HASH_SIZE) -> int:
+    """pHash: low-frequency DCT coefficients of a 4x-oversized thumbnail against their median"""
+    side = hash_size * 4
+    small = cv2.resize(gray, (side, side), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:hash_size, :hash_size].flatten()
+    # The DC term only tracks overall brightness; keep it out of the median
+    bits = low > np.median(low[1:])
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+class FingerprintIndex:
+    """
+    Recent fingerprints keyed by image digest, with a nearest-neighbour
+    Hamming lookup. Optionally persisted as JSON (merged under a file lock,
+    reloaded when another worker updates it); the oldest entries are dropped beyond
+    max_entries. A linear scan over a few thousand ints takes about a millisecond.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2048):
+        self.path = path
+        self.max_entries = max_entries
+        self.fingerprints: 'OrderedDict[str, int]' = OrderedDict()
+        self._mtime = None
+        self._reload()
+
+    def _reload(self) -> None:
+        if not self.path:
+            return
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            self.fingerprints = OrderedDict((digest, int(value, 16)) for digest, value in entries.items())
+            self._mtime = mtime
+        except (OSError, ValueError):
+            pass
+
+    def nearest(self, fingerprint: int, exclude: Optional[str] = None) -> Optional[Tuple[str, int]]:
+        """(digest, distance) of the closest stored fingerprint, or None if the index is empty"""
+        self._reload()
+        best = None
+        for digest, stored in self.fingerprints.items():
+            if digest == exclude:
+                continue
+            distance = hamming_distance(fingerprint, stored)
+            if best is None or distance < best[1]:
+                best = (digest, distance)
+        return best
+
+    def find_duplicate(self, fingerprint: int, max_distance: int = DEFAULT_MAX_DISTANCE,
+                       exclude: Optional[str] = None) -> Optional[Tuple[str, int]]:
+        """The nearest stored fingerprint if it is within max_distance bits"""
+        match = self.nearest(fingerprint, exclude)
+        return match if match is not None and match[1] <= max_distance else None
+
+    def add(self, digest: str, fingerprint: int) -> None:
+        self._reload()
+        self._insert(self.fingerprints, digest, fingerprint)
+        if not self.path:
+            return
+
+        # Merged into what is on disk under the lock, so fingerprints other workers added meanwhile survive
+        def merge(saved: Dict[str, str]) -> Dict[str, str]:
+            entries = OrderedDict(saved)
+            self._insert(entries, digest, format(fingerprint, 'x'))
+            return entries
+
+        try:
+            entries = update_json(self.path, merge)
+            self.fingerprints = OrderedDict((digest, int(value, 16)) for digest, value in entries.items())
+            # Another worker may have saved since the lock was released; the next lookup checks
+            self._mtime = None
+        except (OSError, ValueError):
+            pass
+
+    def _insert(self, entries: 'OrderedDict[str, object]', digest: str, value: object) -> None:
+        """Add or refresh digest as the newest entry, dropping the oldest beyond max_entries"""
+        entries.pop(digest, None)
+        entries[digest] = value
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self.fingerprints), 'max_entries': self.max_entries}
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Pointwise stage fusion for ScoreCheck image processing
+Expresses per-pixel steps (thresholds, ImageEnhance contrast and
+brightness, kernel-sum rounding) as lookup tables and composes consecutive
+ones, so a chain of them costs a single pass over the frame
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+def levels() -> np.ndarray:
+    """The 256 levels of an 8-bit image, as the identity table"""
+    return np.arange(256, dtype=np.uint8)
+
+def threshold_lut(thresh: int, maxval: int = 255, inverse: bool = False) -> np.ndarray:
+    """cv2.threshold THRESH_BINARY (or THRESH_BINARY_INV) as a lookup table"""
+    above = np.arange(256) > thresh
+    return np.where(above != inverse, maxval, 0).astype(np.uint8)
+
+def contrast_lut(mean: int, factor: float) -> np.ndarray:
+    """ImageEnhance.Contrast around an already rounded mean level"""
+    values = mean + factor * (np.arange(256, dtype=np.float32) - mean)
+    return np.clip(np.trunc(values), 0, 255).astype(np.uint8)
+
+def brightness_lut(factor: float) -> np.ndarray:
+    """ImageEnhance.Brightness"""
+    values = factor * np.arange(256, dtype=np.float32)
+    return np.clip(np.trunc(values), 0, 255).astype(np.uint8)
+
+def compose_luts(*luts: np.ndarray) -> np.ndarray:
+    """One table doing the given tables in order (the first is applied first)"""
+    fused = levels()
+    for lut in luts:
+        fused = lut[fused]
+    return fused
+
+def union_luts(*luts: np.ndarray) -> np.ndarray:
+    """One table for the bitwise OR of several tables applied to the same image"""
+    return np.bitwise_or.reduce(np.stack(luts), axis=0)
+
+def kernel_sum_range(kernel: Tuple[Tuple[int, ...], ...]) -> Tuple[int, int]:
+    """Smallest and largest sum an integer kernel produces over 8-bit pixels"""
+    weights = [weight for row in kernel for weight in row]
+    return (255 * sum(w for w in weights if w < 0), 255 * sum(w for w in weights if w > 0))
+
+def rounding_table(low: int, high: int, divisor: int, lut: np.ndarray = None) -> np.ndarray:
+    """
+    Table taking a kernel sum in [low, high] straight to its output level:
+    divide rounding half up, clip to 0-255, then lut. Laid out so the signed
+    sum itself is the index, negative sums wrapping from the end, which saves
+    the offset pass.
+    """
+    sums = np.concatenate((np.arange(0, high + 1), np.arange(low, 0)))
+    levels_out = np.clip((sums + divisor // 2) // divisor, 0, 255).astype(np.uint8)
+    return levels_out if lut is None else lut[levels_out]
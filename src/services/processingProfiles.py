@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Speed/accuracy processing profiles for ScoreCheck image processing
+Named bundles of working resolution, variant selection, deskew/denoise/
+morphology switches and codec, so a request picks a trade-off by name
+"""
+
+from typing import Any, Dict
+
+# Settings a profile fills in underneath a request's own options; anything the
+# request sets explicitly wins. Keys are the processor's kwargs:
+#   decode_scale, luminance_decode  working resolution / luminance-only decode (ImageDecoder)
+#   triage                          build only the versions/variants the quality triage calls for
+#   deskew                          estimate and correct skew at all (preprocess_binary_ocr chains)
+#   deskew_tolerance                smallest angle, in degrees, that gets rotated
+#   deskew_max_dimension            long side of the copy the skew is measured on
+#   denoise                         median blur before CLAHE (preprocess_binary_ocr chains)
+#   morphology                      opening/closing cleanup of the wrapper's variants
+#   codec                           output codec profile (outputCodec.CODEC_PROFILES)
+PROCESSING_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Each operation's established behaviour
+    'balanced': {},
+    # Interactive uploads: half-resolution luminance decode, only what the triage (measured on a
+    # full-resolution luminance decode) asks for, no deskew, denoise or morphology, cheapest encode
+    'fast': {
+        'decode_scale': 2,
+        'luminance_decode': True,
+        'triage': True,
+        'deskew': False,
+        'denoise': False,
+        'morphology': False,
+        'codec': 'fast',
+    },
+    # Nightly reprocessing: full resolution, every version, skew measured on a finer copy and
+    # corrected down to a fraction of the usual tolerance, denoise, no lossy outputs
+    'max_accuracy': {
+        'triage': False,
+        'deskew': True,
+        'deskew_tolerance': 0.02,
+        'deskew_max_dimension': 2560,
+        'denoise': True,
+        'morphology': True,
+        'codec': 'lossless',
+    },
+}
+
+DEFAULT_PROCESSING_PROFILE = 'balanced'
+
+def apply_processing_profile(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    kwargs with its 'processing_profile' (default balanced) replaced by that
+    profile's settings, explicit kwargs taking precedence. Applying it twice
+    changes nothing.
+    """
+    profile = kwargs.get('processing_profile', DEFAULT_PROCESSING_PROFILE)
+    if profile not in PROCESSING_PROFILES:
+        raise ValueError(f"Unknown processing profile: {profile}")
+    explicit = {name: value for name, value in kwargs.items() if name != 'processing_profile'}
+    return {**PROCESSING_PROFILES[profile], **explicit}
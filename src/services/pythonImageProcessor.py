@@ -4,19 +4,119 @@ Python Image Processor for ScoreCheck
 Handles image cropping, preprocessing, and optimization for OCR
 """
 
-import cv2
-import numpy as np
-from PIL import Image, ImageEnhance, ImageFilter
+from __future__ import annotations
+
 import sys
 import json
 import base64
+import hashlib
 import io
 import argparse
 import os
-from typing import Dict, Tuple, Any
+import struct
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Any, BinaryIO, Generator, Iterator, Optional, TextIO
+from lazyImports import lazy_import, load_now
+
+# OpenCV, NumPy and Pillow load on first use, so header-only operations never import
+# them; the helper modules below pick up the same placeholders
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+Image = lazy_import('PIL.Image')
+ImageEnhance = lazy_import('PIL.ImageEnhance')
+ImageFilter = lazy_import('PIL.ImageFilter')
+
+from resultCache import ResultCache, cache_from_environment
+from layoutDetector import LayoutCache, detect_box_score_region, scale_reference_coordinates
+from stageProfiler import StageProfiler, profile_stage
+from outputCodec import CODEC_PROFILES, DEFAULT_CODEC_PROFILE, OutputCodec
+from tiledFilters import TileExecutor, run_tiled, tile_executor_from_environment
+from sharedBuffers import map_input, shared_path, write_mapped_sections
+from imageDecoder import DECODE_FLAGS, ImageDecoder
+from perceptualHash import DEFAULT_MAX_DISTANCE, FingerprintIndex, perceptual_hash
+from qualityTriage import estimate_skew_angle, triage
+from tableGrid import TEXT_COLUMNS, level_to_crop, segment_table
+from digitRecognizer import DEFAULT_MIN_CONFIDENCE, default_glyph_index
+from ocrMontage import compose_montage
+from imageHeader import read_image_header
+from processingProfiles import PROCESSING_PROFILES, apply_processing_profile
+from pointwiseOps import brightness_lut, contrast_lut, kernel_sum_range, levels, rounding_table, threshold_lut
+from videoFrames import DEFAULT_SAMPLE_FPS, sample_frames, select_still_frames
+
+# Operations whose results are never served from the result cache
+UNCACHED_OPERATIONS = {'test_hardcoded', 'dimensions', 'metadata', 'detect_layout', 'fingerprint', 'triage'}
+
+# Operations that process_image_stream emits output by output as each is encoded
+STREAMED_OPERATIONS = {'test_hardcoded', 'multiple_versions', 'preprocess_binary_ocr', 'video_frames'}
+
+# Output formats that emit one record per output (serve: 'stream' frames or 'ndjson' JSON frames)
+STREAM_FORMATS = ('stream', 'ndjson')
+
+# Generator of (name, output) pairs whose return value holds the remaining result fields
+SectionStream = Generator[Tuple[str, Any], None, Dict[str, Any]]
+
+# Preprocessing chains that crop_preprocess can run on the crop region
+FUSED_CHAINS = ('preprocess_ocr', 'preprocess_ocr_alternative', 'multiple_versions', 'preprocess_binary_ocr')
+
+# Images table_grid can crop cells from: the segmentation binary (white text on black) or grayscale
+CELL_IMAGES = ('binary', 'gray')
+
+# What ocr_montage packs from the table grid: single cells or whole stat columns
+MONTAGE_UNITS = ('cell', 'column')
+
+# Backends for the preprocess_ocr / alternative / multiple_versions chains
+PREPROCESS_BACKENDS = ('numpy', 'pil')
+
+# ImageFilter.SHARPEN and ImageFilter.EDGE_ENHANCE kernels (before their divisors);
+# plain tuples so that importing this module does not load NumPy
+SHARPEN_KERNEL = ((-2, -2, -2), (-2, 32, -2), (-2, -2, -2))
+EDGE_ENHANCE_KERNEL = ((-1, -1, -1), (-1, 10, -1), (-1, -1, -1))
+
+def binary_128_lut() -> np.ndarray:
+    """point(lambda x: 0 if x < 128 else 255) as a lookup table"""
+    return threshold_lut(127)
+
+def enhance_contrast(gray: np.ndarray, factor: float) -> np.ndarray:
+    """ImageEnhance.Contrast as a 256-entry lookup table around the rounded mean"""
+    return cv2.LUT(gray, contrast_lut(int(float(gray.mean()) + 0.5), factor))
+
+def filter_3x3(gray: np.ndarray, kernel: Any, divisor: int, lut: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    ImageFilter 3x3 kernel equivalent: integer sum, round half up, and the
+    one-pixel border copied from the input as PIL does. A pointwise step
+    that follows (lut) is folded into the rounding table, so division,
+    clipping and the step are one gather over the kernel sums.
+    """
+    total = cv2.filter2D(gray, cv2.CV_16S, np.array(kernel, dtype=np.float32),
+                         borderType=cv2.BORDER_REPLICATE)
+    out = rounding_table(*kernel_sum_range(kernel), divisor, lut)[total]
+    post = levels() if lut is None else lut
+    out[0, :] = post[gray[0, :]]
+    out[-1, :] = post[gray[-1, :]]
+    out[:, 0] = post[gray[:, 0]]
+    out[:, -1] = post[gray[:, -1]]
+    return out
+
+# Frames on the --serve pipe are a 4-byte big-endian length followed by the payload
+FRAME_HEADER = struct.Struct('>I')
 
 class PythonImageProcessor:
-    def __init__(self):
+    def __init__(self, cache: Optional[ResultCache] = None, layout_cache: Optional[LayoutCache] = None,
+                 codec: Optional[OutputCodec] = None, tiler: Optional[TileExecutor] = None,
+                 decoder: Optional[ImageDecoder] = None, fingerprints: Optional[FingerprintIndex] = None):
+        self.cache = cache
+        self.layout_cache = layout_cache or LayoutCache()
+        
+        # Recent perceptual hashes of the box score region, for near-duplicate lookups
+        self.fingerprints = fingerprints or FingerprintIndex()
+        self.codec = codec or OutputCodec()
+        
+        # Optional luminance-only / reduced-resolution decoding (off by default)
+        self.decoder = decoder or ImageDecoder()
+        
+        # Optional banded thread-pool execution of the neighbourhood filters (identical output)
+        self.tiler = tiler
+        
         self.nba_2k25_coordinates = {
             'left': 1214,
             'top': 430,
@@ -24,6 +124,15 @@ class PythonImageProcessor:
             'height': 1209   # 1639 - 430
         }
         
+        # Backend for the PIL-era chains; 'numpy' reproduces them on one ndarray with OpenCV/LUT passes
+        self.preprocess_backend = 'numpy'
+        
+        # Deskew: angle estimated on a downscaled copy, rotation skipped below the tolerance (degrees)
+        self.deskew_max_dimension = 1280
+        self.deskew_tolerance = 0.1
+        # Off skips both the estimate and the rotation (fast processing profile)
+        self.deskew = True
+        
         # Hardcoded test image path
         self.test_image_path = os.path.join(os.getcwd(), 'uploads', 'boxscore-1754761505428-225884003.JPEG')
     
@@ -36,78 +145,11 @@ class PythonImageProcessor:
                     'error': f'Test image not found at: {self.test_image_path}'
                 }
             
-            # Read the hardcoded image
-            with open(self.test_image_path, 'rb') as f:
-                image_buffer = f.read()
-            
-            results = {}
-            
-            # Test cropping
-            try:
-                cropped = self.crop_box_score(image_buffer)
-                results['crop_box_score'] = {
-                    'success': True,
-                    'size_bytes': len(cropped),
-                    'data': base64.b64encode(cropped).decode('utf-8')
-                }
-            except Exception as e:
-                results['crop_box_score'] = {
-                    'success': False,
-                    'error': str(e)
-                }
-            
-            # Test preprocessing
-            try:
-                preprocessed = self.preprocess_for_ocr(image_buffer)
-                results['preprocess_ocr'] = {
-                    'success': True,
-                    'size_bytes': len(preprocessed),
-                    'data': base64.b64encode(preprocessed).decode('utf-8')
-                }
-            except Exception as e:
-                results['preprocess_ocr'] = {
-                    'success': False,
-                    'error': str(e)
-                }
-            
-            # Test dimensions
-            try:
-                dimensions = self.get_image_dimensions(image_buffer)
-                results['dimensions'] = {
-                    'success': True,
-                    'data': dimensions
-                }
-            except Exception as e:
-                results['dimensions'] = {
-                    'success': False,
-                    'error': str(e)
-                }
-            
-            # Test multiple versions
-            try:
-                multiple_versions = self.create_multiple_versions(image_buffer)
-                results['multiple_versions'] = {
-                    'success': True,
-                    'standard_size': len(multiple_versions['standard']),
-                    'enhanced_size': len(multiple_versions['enhanced']),
-                    'binary_size': len(multiple_versions['binary']),
-                    'data': {
-                        'standard': base64.b64encode(multiple_versions['standard']).decode('utf-8'),
-                        'enhanced': base64.b64encode(multiple_versions['enhanced']).decode('utf-8'),
-                        'binary': base64.b64encode(multiple_versions['binary']).decode('utf-8')
-                    }
-                }
-            except Exception as e:
-                results['multiple_versions'] = {
-                    'success': False,
-                    'error': str(e)
-                }
-            
+            results, summary = collect_sections(self._stream_hardcoded_tests())
             return {
                 'success': True,
-                'test_image_path': self.test_image_path,
-                'original_image_size': len(image_buffer),
-                'results': results
+                **summary,
+                'results': {name: encode_base64_result(result) for name, result in results.items()}
             }
             
         except Exception as e:
@@ -116,253 +158,1117 @@ class PythonImageProcessor:
                 'error': f'Error testing with hardcoded image: {str(e)}'
             }
     
+    def _stream_hardcoded_tests(self) -> SectionStream:
+        """Yield each hardcoded-image test result (images as raw bytes) as soon as it finishes"""
+        if not os.path.exists(self.test_image_path):
+            raise FileNotFoundError(f'Test image not found at: {self.test_image_path}')
+        
+        # Read the hardcoded image
+        with open(self.test_image_path, 'rb') as f:
+            image_buffer = f.read()
+        
+        # Test cropping
+        try:
+            cropped = self.crop_box_score(image_buffer)
+            result = {
+                'success': True,
+                'size_bytes': len(cropped),
+                'data': cropped
+            }
+        except Exception as e:
+            result = {
+                'success': False,
+                'error': str(e)
+            }
+        yield 'crop_box_score', result
+        
+        # Test preprocessing
+        try:
+            preprocessed = self.preprocess_for_ocr(image_buffer)
+            result = {
+                'success': True,
+                'size_bytes': len(preprocessed),
+                'data': preprocessed
+            }
+        except Exception as e:
+            result = {
+                'success': False,
+                'error': str(e)
+            }
+        yield 'preprocess_ocr', result
+        
+        # Test dimensions
+        try:
+            dimensions = self.get_image_dimensions(image_buffer)
+            result = {
+                'success': True,
+                'data': dimensions
+            }
+        except Exception as e:
+            result = {
+                'success': False,
+                'error': str(e)
+            }
+        yield 'dimensions', result
+        
+        # Test multiple versions
+        try:
+            multiple_versions = self.create_multiple_versions(image_buffer)
+            result = {
+                'success': True,
+                'standard_size': len(multiple_versions['standard']),
+                'enhanced_size': len(multiple_versions['enhanced']),
+                'binary_size': len(multiple_versions['binary']),
+                'data': multiple_versions
+            }
+        except Exception as e:
+            result = {
+                'success': False,
+                'error': str(e)
+            }
+        yield 'multiple_versions', result
+        
+        return {
+            'test_image_path': self.test_image_path,
+            'original_image_size': len(image_buffer)
+        }
+    
+    def decode_image(self, image_buffer: bytes) -> np.ndarray:
+        """Decode encoded image bytes to a BGR array (at the decoder's scale)"""
+        return self.decoder.decode(image_buffer)
+    
+    def decode_luminance(self, image_buffer: bytes) -> np.ndarray:
+        """Decode for luminance-only work: a grayscale plane if luminance decoding is on, else BGR"""
+        if self.decoder.luminance:
+            return self.decoder.decode_gray(image_buffer)
+        return self.decode_image(image_buffer)
+    
+    def crop_array(self, img: np.ndarray, coordinates: Dict[str, int]) -> np.ndarray:
+        """Slice the crop region as a view (no copy) of the decoded frame"""
+        left = coordinates['left']
+        top = coordinates['top']
+        width = coordinates['width']
+        height = coordinates['height']
+        return img[top:top+height, left:left+width]
+    
     def crop_image(self, image_buffer: bytes, coordinates: Dict[str, int]) -> bytes:
         """Crop image to specified coordinates"""
         try:
-            # Convert bytes to numpy array
-            nparr = np.frombuffer(image_buffer, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if img is None:
-                raise ValueError("Failed to decode image")
-            
-            # Extract coordinates
-            left = coordinates['left']
-            top = coordinates['top']
-            width = coordinates['width']
-            height = coordinates['height']
-            
-            # Crop the image
-            cropped = img[top:top+height, left:left+width]
+            # Crop the image (coordinates are in source pixels)
+            cropped = self.crop_array(self.decode_image(image_buffer), self.decoder.to_decoded(coordinates))
             
             # Convert back to bytes
-            _, buffer = cv2.imencode('.jpg', cropped, [cv2.IMWRITE_JPEG_QUALITY, 90])
-            return buffer.tobytes()
+            with profile_stage('encode_jpeg'):
+                return self.codec.encode(cropped, 'jpeg', jpeg_quality=90)
             
         except Exception as e:
             raise Exception(f"Error cropping image: {str(e)}")
     
-    def crop_box_score(self, image_buffer: bytes) -> bytes:
-        """Crop image to NBA 2K25 box score specific coordinates"""
-        return self.crop_image(image_buffer, self.nba_2k25_coordinates)
+    def crop_box_score(self, image_buffer: bytes, auto_detect: bool = False, source: str = None) -> bytes:
+        """Crop image to NBA 2K25 box score specific coordinates, or to the detected table"""
+        if not auto_detect:
+            return self.crop_image(image_buffer, self.nba_2k25_coordinates)
+        
+        try:
+            img = self.decode_image(image_buffer)
+            coordinates, _ = self.resolve_box_score_region(img, source)
+            with profile_stage('encode_jpeg'):
+                return self.codec.encode(self.crop_array(img, coordinates), 'jpeg', jpeg_quality=90)
+        except Exception as e:
+            raise Exception(f"Error cropping image: {str(e)}")
+    
+    def resolve_box_score_region(self, img: np.ndarray, source: str = None) -> Tuple[Dict[str, int], str]:
+        """
+        Box score rectangle for a decoded frame. Layouts are cached per source
+        fingerprint and resolution, so detection runs once per source/size;
+        if no table is found the reference coordinates are scaled to the frame.
+        """
+        h, w = img.shape[:2]
+        key = self.layout_cache.make_key(w, h, source)
+        cached = self.layout_cache.get(key)
+        if cached is not None:
+            return cached, 'cache'
+        
+        with profile_stage('detect_layout'):
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+            detected = detect_box_score_region(gray)
+        if detected is None:
+            return scale_reference_coordinates(self.nba_2k25_coordinates, w, h), 'scaled_default'
+        
+        self.layout_cache.put(key, detected)
+        return detected, 'detected'
+    
+    def _decode_gray(self, image_buffer: bytes, backend: str = None) -> Any:
+        """Decode to grayscale as a PIL image or an ndarray, depending on the backend"""
+        backend = backend or self.preprocess_backend
+        if backend not in PREPROCESS_BACKENDS:
+            raise ValueError(f"Unknown preprocessing backend: {backend}")
+        gray = self.decoder.decode_gray_pil(image_buffer)
+        if backend == 'pil':
+            return gray
+        
+        # Pillow's decode and convert('L') rounding are the reference, and decoding with it costs
+        # about what cv2.imdecode + cvtColor does (whose 14-bit weights are a level off on some colours)
+        return np.asarray(gray)
+    
+    def _ocr_standard(self, gray: Any) -> Any:
+        """Contrast, sharpen, median, edge-enhance and brightness chain on a grayscale image"""
+        with profile_stage('ocr_standard'):
+            return self._ocr_standard_chain(gray)
+    
+    def _ocr_standard_chain(self, gray: Any) -> Any:
+        if isinstance(gray, np.ndarray):
+            enhanced = enhance_contrast(gray, 1.5)
+            sharpened = filter_3x3(enhanced, SHARPEN_KERNEL, 16)
+            denoised = cv2.medianBlur(sharpened, 3)
+            # Brightness rides on the edge-enhance rounding table instead of a pass of its own
+            return filter_3x3(denoised, EDGE_ENHANCE_KERNEL, 2, brightness_lut(1.1))
+        
+        # Enhance contrast
+        enhancer = ImageEnhance.Contrast(gray)
+        enhanced = enhancer.enhance(1.5)
+        
+        # Apply sharpening filter
+        sharpened = enhanced.filter(ImageFilter.SHARPEN)
+        
+        # Apply median filter to reduce noise
+        denoised = sharpened.filter(ImageFilter.MedianFilter(size=3))
+        
+        # Enhance edges
+        edge_enhanced = denoised.filter(ImageFilter.EDGE_ENHANCE)
+        
+        # Normalize brightness
+        enhancer = ImageEnhance.Brightness(edge_enhanced)
+        return enhancer.enhance(1.1)
+    
+    def _ocr_alternative(self, gray: Any) -> Any:
+        """Lower contrast, sharpen and fixed threshold on a grayscale image"""
+        with profile_stage('ocr_alternative'):
+            return self._ocr_alternative_chain(gray)
+    
+    def _ocr_alternative_chain(self, gray: Any) -> Any:
+        if isinstance(gray, np.ndarray):
+            # Sharpen rounding and the 128 threshold in one table
+            return filter_3x3(enhance_contrast(gray, 0.8), SHARPEN_KERNEL, 16, binary_128_lut())
+        
+        # Apply gamma correction
+        enhancer = ImageEnhance.Contrast(gray)
+        gamma_corrected = enhancer.enhance(0.8)
+        
+        # Apply sharpening
+        sharpened = gamma_corrected.filter(ImageFilter.SHARPEN)
+        
+        # Apply threshold to create binary image
+        threshold = 128
+        return sharpened.point(lambda x: 0 if x < threshold else 255, '1')
     
-    def preprocess_for_ocr(self, image_buffer: bytes) -> bytes:
+    def _ocr_binary(self, gray: Any) -> Any:
+        with profile_stage('ocr_binary'):
+            if isinstance(gray, np.ndarray):
+                return cv2.LUT(gray, binary_128_lut())
+            return gray.point(lambda x: 0 if x < 128 else 255, '1')
+    
+    def _encode_jpeg(self, image: Any) -> bytes:
+        with profile_stage('encode_jpeg'):
+            return self.codec.encode(image, 'jpeg', jpeg_quality=95, jpeg_optimize=True, jpeg_progressive=True)
+    
+    def _encode_png(self, image: Any) -> bytes:
+        # Binary images are written 1-bit, matching PIL mode '1'
+        with profile_stage('encode_png'):
+            return self.codec.encode(image, 'png', png_compression=9, binary=True, pack_binary=True)
+    
+    def _multiple_versions(self, gray: Any) -> Dict[str, bytes]:
+        return collect_sections(self._stream_multiple_versions(gray))[0]
+    
+    def _stream_multiple_versions(self, gray: Any, triaged: bool = False, image_buffer: bytes = None) -> SectionStream:
+        """
+        Yield each version as soon as it is encoded; only the shared grayscale plane is kept.
+        With triaged=True only the versions the quality triage of image_buffer asks for are built.
+        """
+        summary = {}
+        versions = ('standard', 'enhanced', 'binary')
+        if triaged:
+            triage_gray = self._triage_plane(image_buffer, gray)
+            with profile_stage('triage'):
+                summary['triage'] = triage(triage_gray, self.deskew_max_dimension)
+            versions = summary['triage']['versions']
+        
+        if 'standard' in versions:
+            yield 'standard', self._encode_jpeg(self._ocr_standard(gray))
+        if 'enhanced' in versions:
+            yield 'enhanced', self._encode_png(self._ocr_alternative(gray))
+        if 'binary' in versions:
+            yield 'binary', self._encode_png(self._ocr_binary(gray))
+        return summary
+    
+    def preprocess_for_ocr(self, image_buffer: bytes, backend: str = None) -> bytes:
         """Enhanced preprocessing for OCR optimization"""
         try:
-            # Convert bytes to PIL Image
-            image = Image.open(io.BytesIO(image_buffer))
-            
-            # Convert to grayscale
-            gray = image.convert('L')
-            
-            # Enhance contrast
-            enhancer = ImageEnhance.Contrast(gray)
-            enhanced = enhancer.enhance(1.5)
-            
-            # Apply sharpening filter
-            sharpened = enhanced.filter(ImageFilter.SHARPEN)
-            
-            # Apply median filter to reduce noise
-            denoised = sharpened.filter(ImageFilter.MedianFilter(size=3))
-            
-            # Enhance edges
-            edge_enhanced = denoised.filter(ImageFilter.EDGE_ENHANCE)
-            
-            # Normalize brightness
-            enhancer = ImageEnhance.Brightness(edge_enhanced)
-            normalized = enhancer.enhance(1.1)
-            
-            # Convert back to bytes
-            output = io.BytesIO()
-            normalized.save(output, format='JPEG', quality=95, progressive=True, optimize=True)
-            return output.getvalue()
+            return self._encode_jpeg(self._ocr_standard(self._decode_gray(image_buffer, backend)))
             
         except Exception as e:
             raise Exception(f"Error preprocessing image for OCR: {str(e)}")
     
-    def preprocess_for_ocr_alternative(self, image_buffer: bytes) -> bytes:
+    def preprocess_for_ocr_alternative(self, image_buffer: bytes, backend: str = None) -> bytes:
         """Alternative preprocessing method using different approach"""
         try:
-            # Convert bytes to PIL Image
-            image = Image.open(io.BytesIO(image_buffer))
-            
-            # Convert to grayscale
-            gray = image.convert('L')
-            
-            # Apply gamma correction
-            enhancer = ImageEnhance.Contrast(gray)
-            gamma_corrected = enhancer.enhance(0.8)
-            
-            # Apply sharpening
-            sharpened = gamma_corrected.filter(ImageFilter.SHARPEN)
-            
-            # Apply threshold to create binary image
-            threshold = 128
-            binary = sharpened.point(lambda x: 0 if x < threshold else 255, '1')
-            
-            # Convert back to bytes
-            output = io.BytesIO()
-            binary.save(output, format='PNG', optimize=True)
-            return output.getvalue()
+            return self._encode_png(self._ocr_alternative(self._decode_gray(image_buffer, backend)))
             
         except Exception as e:
             raise Exception(f"Error with alternative preprocessing: {str(e)}")
     
-    def create_multiple_versions(self, image_buffer: bytes) -> Dict[str, bytes]:
+    def create_multiple_versions(self, image_buffer: bytes, backend: str = None) -> Dict[str, bytes]:
         """Create multiple preprocessed versions for ensemble OCR"""
+        results, _ = self.create_multiple_versions_with_info(image_buffer, backend)
+        return results
+    
+    def create_multiple_versions_with_info(self, image_buffer: bytes, backend: str = None,
+                                           triaged: bool = False) -> Tuple[Dict[str, bytes], Dict[str, Any]]:
+        """create_multiple_versions plus the triage report when triaged=True"""
         try:
-            standard = self.preprocess_for_ocr(image_buffer)
-            enhanced = self.preprocess_for_ocr_alternative(image_buffer)
-            
-            # Create binary version
-            image = Image.open(io.BytesIO(image_buffer))
-            gray = image.convert('L')
-            binary = gray.point(lambda x: 0 if x < 128 else 255, '1')
-            
-            output = io.BytesIO()
-            binary.save(output, format='PNG', optimize=True)
-            binary_bytes = output.getvalue()
-            
-            return {
-                'standard': standard,
-                'enhanced': enhanced,
-                'binary': binary_bytes
-            }
+            # Decode once and share the grayscale image between versions
+            return collect_sections(self._stream_multiple_versions(self._decode_gray(image_buffer, backend), triaged,
+                                                                   image_buffer))
             
         except Exception as e:
             raise Exception(f"Error creating multiple versions: {str(e)}")
     
+    def triage_image(self, image_buffer: bytes) -> Dict[str, Any]:
+        """Quality scores and the minimal set of preprocessing variants for an image"""
+        try:
+            return triage(self.decoder.full_resolution().decode_gray(image_buffer), self.deskew_max_dimension)
+        except Exception as e:
+            raise Exception(f"Error triaging image: {str(e)}")
+    
+    def _triage_plane(self, image_buffer: bytes, gray: Any) -> np.ndarray:
+        """
+        The grayscale plane to triage: the decoded one, or a full-resolution
+        luminance decode when the decoder reduces resolution, since downscaling
+        hides the blur and noise the triage thresholds were calibrated on
+        """
+        if self.decoder.scale == 1:
+            return np.asarray(gray)
+        return self.decoder.full_resolution().decode_gray(image_buffer)
+    
     def get_image_dimensions(self, image_buffer: bytes) -> Dict[str, int]:
         """Get image dimensions"""
         try:
-            image = Image.open(io.BytesIO(image_buffer))
+            metadata = self.read_image_metadata(image_buffer)
             return {
-                'width': image.width,
-                'height': image.height
+                'width': metadata['width'],
+                'height': metadata['height']
             }
         except Exception as e:
             raise Exception(f"Error getting image dimensions: {str(e)}")
     
-    def preprocess_binary_ocr(self, image_buffer: bytes, denoise: bool = False) -> Dict[str, bytes]:
+    def read_image_metadata(self, image_buffer: bytes) -> Dict[str, Any]:
+        """
+        Width, height, format and EXIF orientation. JPEG and PNG are read from
+        their headers alone; other formats fall back to Pillow, which also only
+        parses the header until pixels are requested.
+        """
+        try:
+            return read_image_header(image_buffer)
+        except ValueError:
+            pass
+        try:
+            with Image.open(io.BytesIO(image_buffer)) as image:
+                orientation = image.getexif().get(0x0112, 1)
+                return {'format': (image.format or '').lower(), 'width': image.width, 'height': image.height,
+                        'orientation': orientation if orientation in range(1, 9) else 1}
+        except Exception as e:
+            raise Exception(f"Error reading image metadata: {str(e)}")
+    
+    def estimate_skew_angle(self, gray: np.ndarray) -> float:
+        """
+        Median angle of near-horizontal Hough lines, estimated on a copy
+        downscaled to at most deskew_max_dimension pixels on its long side
+        """
+        return estimate_skew_angle(gray, self.deskew_max_dimension)
+    
+    def preprocess_binary_ocr(self, image_buffer: bytes, denoise: bool = False,
+                              deskew_tolerance: float = None) -> Dict[str, bytes]:
         """Clean binary OCR preparation using the preferred method"""
+        results, _ = self.preprocess_binary_ocr_with_info(image_buffer, denoise, deskew_tolerance)
+        return results
+    
+    def preprocess_binary_ocr_with_info(self, image_buffer: bytes, denoise: bool = False,
+                                        deskew_tolerance: float = None,
+                                        triaged: bool = False) -> Tuple[Dict[str, bytes], Dict[str, Any]]:
+        """
+        preprocess_binary_ocr plus {'deskew': detected angle and whether rotation was applied},
+        and the triage report when triaged=True
+        """
         try:
-            # Convert bytes to numpy array
-            nparr = np.frombuffer(image_buffer, np.uint8)
-            img_bgr = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if img_bgr is None:
-                raise ValueError("Failed to decode image")
-            
-            h, w = img_bgr.shape[:2]
-            
-            # 1) Deskew using near-horizontal lines
-            gray_for_skew = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-            edges = cv2.Canny(gray_for_skew, 50, 150, apertureSize=3)
-            lines = cv2.HoughLinesP(edges, 1, np.pi / 180, threshold=200,
-                                    minLineLength=max(300, w // 5), maxLineGap=15)
-            
+            return self._binary_ocr(self.decode_luminance(image_buffer), denoise, deskew_tolerance, triaged, image_buffer)
+        except Exception as e:
+            raise Exception(f"Error in binary OCR preprocessing: {str(e)}")
+    
+    def _binary_ocr(self, img_bgr: np.ndarray, denoise: bool = False, deskew_tolerance: float = None,
+                    triaged: bool = False, image_buffer: bytes = None) -> Tuple[Dict[str, bytes], Dict[str, Any]]:
+        """
+        Deskew, CLAHE and adaptive threshold on a decoded BGR array, encoding only the outputs.
+        A grayscale array (luminance decoding) is processed as-is; 'deskewed' is then grayscale too.
+        """
+        return collect_sections(self._stream_binary_ocr(img_bgr, denoise, deskew_tolerance, triaged, image_buffer))
+    
+    def _stream_binary_ocr(self, img_bgr: np.ndarray, denoise: bool = False, deskew_tolerance: float = None,
+                           triaged: bool = False, image_buffer: bytes = None) -> SectionStream:
+        """
+        _binary_ocr yielding each output once encoded and dropping its array; returns the deskew
+        info. With triaged=True the triage report of image_buffer (the frame img_bgr was decoded
+        from) reuses the skew estimate and can turn on denoise.
+        """
+        if deskew_tolerance is None:
+            deskew_tolerance = self.deskew_tolerance
+        
+        h, w = img_bgr.shape[:2]
+        
+        # 1) Deskew using near-horizontal lines
+        if img_bgr.ndim == 2:
+            gray_for_skew = img_bgr
+        else:
+            with profile_stage('grayscale'):
+                gray_for_skew = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+        if self.deskew:
+            with profile_stage('deskew_estimate'):
+                angle = self.estimate_skew_angle(gray_for_skew)
+        else:
             angle = 0.0
-            if lines is not None and len(lines) > 0:
-                angles = []
-                for l in lines[:800]:
-                    x1, y1, x2, y2 = l[0]
-                    theta = np.degrees(np.arctan2((y2 - y1), (x2 - x1)))
-                    if abs(theta) <= 15.0:  # keep near-horizontal
-                        angles.append(theta)
-                if angles:
-                    angle = float(np.median(angles))
-            
+        rotated = self.deskew and abs(angle) >= deskew_tolerance
+        summary = {}
+        if triaged:
+            with profile_stage('triage'):
+                summary['triage'] = triage(self._triage_plane(image_buffer, gray_for_skew), self.deskew_max_dimension,
+                                           angle)
+            denoise = denoise or summary['triage']['denoise']
+        
+        if rotated:
             # Rotate around center with border replication
-            M = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
-            img_deskewed = cv2.warpAffine(img_bgr, M, (w, h), flags=cv2.INTER_LINEAR,
-                                          borderMode=cv2.BORDER_REPLICATE)
+            with profile_stage('deskew_rotate'):
+                M = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+                img_deskewed = cv2.warpAffine(img_bgr, M, (w, h), flags=cv2.INTER_LINEAR,
+                                              borderMode=cv2.BORDER_REPLICATE)
             
             # 2) Grayscale
-            gray = cv2.cvtColor(img_deskewed, cv2.COLOR_BGR2GRAY)
-            
-            # 3) Optional light denoise (median preserves edges)
-            if denoise:
-                gray = cv2.medianBlur(gray, 3)
-            
-            # 4) Contrast enhance (CLAHE)
+            if img_deskewed.ndim == 2:
+                gray = img_deskewed
+            else:
+                with profile_stage('grayscale'):
+                    gray = cv2.cvtColor(img_deskewed, cv2.COLOR_BGR2GRAY)
+        else:
+            # Within tolerance: skip the full-frame rotation and reuse the grayscale plane
+            img_deskewed = img_bgr
+            gray = gray_for_skew
+        
+        # 3) Optional light denoise (median preserves edges)
+        if denoise:
+            with profile_stage('denoise'):
+                gray = run_tiled(self.tiler, lambda band: cv2.medianBlur(band, 3), gray, 1)
+        
+        # 4) Contrast enhance (CLAHE)
+        # Not tiled: its histograms cover whole-frame grid cells, and OpenCV already threads it
+        with profile_stage('clahe'):
             clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
             norm = clahe.apply(gray)
-            
-            # 5) Adaptive threshold (robust to shading)
-            bin_bw = cv2.adaptiveThreshold(
-                norm, 255,
+        
+        # 5) Adaptive threshold (robust to shading)
+        with profile_stage('threshold'):
+            # 31x31 neighbourhood: 15 rows of halo per band
+            bin_bw = run_tiled(self.tiler, lambda band: cv2.adaptiveThreshold(
+                band, 255,
                 cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
                 cv2.THRESH_BINARY,
                 31, 10
-            )
+            ), norm, 15)
             
             # 6) Invert -> white text on black background (OCR-friendly)
             binary_inv = 255 - bin_bw
+        
+        # Convert results to bytes, releasing each array once it is encoded
+        del gray, gray_for_skew, img_bgr
+        
+        # Binary for OCR (main output)
+        with profile_stage('encode_png'):
+            data = self.codec.encode(binary_inv, 'png', binary=True)
+        del binary_inv
+        yield 'binary_ocr', data
+        
+        # Deskewed original
+        with profile_stage('encode_jpeg'):
+            data = self.codec.encode(img_deskewed, 'jpeg', jpeg_quality=95)
+        del img_deskewed
+        yield 'deskewed', data
+        
+        # Contrast enhanced grayscale
+        with profile_stage('encode_png'):
+            data = self.codec.encode(norm, 'png')
+        del norm
+        yield 'enhanced_grayscale', data
+        
+        # Original threshold (before inversion)
+        with profile_stage('encode_png'):
+            data = self.codec.encode(bin_bw, 'png', binary=True)
+        del bin_bw
+        yield 'threshold', data
+        
+        return {'deskew': {'angle': angle, 'rotated': rotated, 'tolerance': deskew_tolerance}, **summary}
+    
+    def _crop_region(self, img: np.ndarray, coordinates: Dict[str, int] = None, auto_detect: bool = False,
+                     source: str = None, info: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """Box score region of a decoded frame (detected, given or reference), noting its origin and size in info"""
+        info = {} if info is None else info
+        roi = self.crop_array(img, self._region_coordinates(img, coordinates, auto_detect, source, info))
+        if roi.size == 0:
+            raise ValueError("Crop region is outside the image")
+        info['crop'] = {'width': roi.shape[1], 'height': roi.shape[0]}
+        return roi
+    
+    def _region_coordinates(self, img: np.ndarray, coordinates: Dict[str, int] = None, auto_detect: bool = False,
+                            source: str = None, info: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """Box score rectangle in decoded-frame pixels; a detected layout's origin is noted in info"""
+        if coordinates is None and auto_detect:
+            coordinates, origin = self.resolve_box_score_region(img, source)
+            if info is not None:
+                info['layout_source'] = origin
+            return coordinates
+        return self.decoder.to_decoded(coordinates or self.nba_2k25_coordinates)
+    
+    def segment_table_grid(self, image_buffer: bytes, coordinates: Dict[str, int] = None, auto_detect: bool = False,
+                           source: str = None, column_names: List[str] = None, rows: List[int] = None,
+                           columns: List[str] = None, crops: bool = False,
+                           cell_image: str = 'binary') -> Tuple[Any, Dict[str, Any]]:
+        """
+        Row and stat-column grid of the box score region, with each cell's bounding
+        box in source pixels keyed by row index and column name. rows / columns
+        limit the cells returned. With crops=True the data is the selected cells
+        as PNGs named <row>_<column> and the grid moves to info['grid'].
+        """
+        if cell_image not in CELL_IMAGES:
+            raise ValueError(f"Unknown cell image: {cell_image}")
+        
+        try:
+            info = {}
+            region, grid, gray, binary = self._table_grid(image_buffer, coordinates, auto_detect, source,
+                                                          column_names, info)
+            cells = {}
+            outputs = {}
+            for index, name, box in self._grid_cells(grid, rows, columns):
+                cells.setdefault(str(index), {})[name] = self._grid_to_source(region, grid, binary, box)
+                if crops:
+                    with profile_stage('encode_png'):
+                        outputs[f"{index}_{name}"] = self.codec.encode(
+                            self.crop_array(binary if cell_image == 'binary' else gray, box), 'png',
+                            binary=cell_image == 'binary', pack_binary=True)
             
-            # Convert results to bytes
-            results = {}
+            result = {
+                'region': self.decoder.to_source(region),
+                'rows': [self._grid_to_source(region, grid, binary, {'left': 0, 'width': binary.shape[1], **row})
+                         for row in grid['rows']],
+                'columns': [{'name': column['name'], **self._grid_to_source(
+                    region, grid, binary,
+                    {'left': column['left'], 'top': 0, 'width': column['width'], 'height': binary.shape[0]})}
+                            for column in grid['columns']],
+                'cells': cells,
+                'method': grid['method'],
+                'deskew': grid['deskew'],
+            }
+            if crops:
+                info['grid'] = result
+                return outputs, info
+            return result, info
             
-            # Binary for OCR (main output)
-            _, binary_buffer = cv2.imencode('.png', binary_inv)
-            results['binary_ocr'] = binary_buffer.tobytes()
+        except Exception as e:
+            raise Exception(f"Error segmenting table grid: {str(e)}")
+    
+    def recognize_digits(self, image_buffer: bytes, coordinates: Dict[str, int] = None, auto_detect: bool = False,
+                         source: str = None, column_names: List[str] = None, rows: List[int] = None,
+                         columns: List[str] = None,
+                         min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Offline reading of the numeric stat cells: {row: {column: text, value,
+        confidence}}. Cells below min_confidence are listed with their source
+        boxes in info['fallback'] for cloud OCR. Without a columns filter the
+        player and grade columns are skipped (listed in info['skipped']) when they
+        were named in column_names or the full reference layout was recognized.
+        """
+        try:
+            info = {}
+            region, grid, _, binary = self._table_grid(image_buffer, coordinates, auto_detect, source,
+                                                       column_names, info)
+            skipped = []
+            if columns is None and grid['method']['labels'] in ('given', 'reference'):
+                names = [column['name'] for column in grid['columns']]
+                skipped = [name for name in names if name in TEXT_COLUMNS]
+                columns = [name for name in names if name not in TEXT_COLUMNS]
+            info['skipped'] = skipped
             
-            # Deskewed original
-            _, deskewed_buffer = cv2.imencode('.jpg', img_deskewed, [cv2.IMWRITE_JPEG_QUALITY, 95])
-            results['deskewed'] = deskewed_buffer.tobytes()
+            index = default_glyph_index()
+            values = {}
+            fallback = []
+            with profile_stage('recognize_digits'):
+                for row, name, box in self._grid_cells(grid, rows, columns):
+                    reading = index.recognize(self.crop_array(binary, box))
+                    values.setdefault(str(row), {})[name] = reading
+                    if reading['confidence'] < min_confidence:
+                        fallback.append({'row': row, 'column': name, **self._grid_to_source(region, grid, binary, box)})
             
-            # Contrast enhanced grayscale
-            _, norm_buffer = cv2.imencode('.png', norm)
-            results['enhanced_grayscale'] = norm_buffer.tobytes()
+            info['fallback'] = fallback
+            info['min_confidence'] = min_confidence
+            return values, info
             
-            # Original threshold (before inversion)
-            _, thresh_buffer = cv2.imencode('.png', bin_bw)
-            results['threshold'] = thresh_buffer.tobytes()
+        except Exception as e:
+            raise Exception(f"Error recognizing digits: {str(e)}")
+    
+    def build_ocr_montage(self, image_buffer: bytes, coordinates: Dict[str, int] = None, auto_detect: bool = False,
+                          source: str = None, column_names: List[str] = None, rows: List[int] = None,
+                          columns: List[str] = None, cell_image: str = 'binary', unit: str = 'cell',
+                          regions: Dict[str, Dict[str, int]] = None, max_width: int = None,
+                          gutter: int = None) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        One PNG packing the selected table cells (or whole columns, or the given
+        named regions in source pixels) for a single OCR call. Table crops are
+        trimmed to their ink and empty ones left out (listed in info['empty']).
+        info['montage'] maps each crop name to its box in the montage and its
+        'source' box, the offsets ocrMontage.demultiplex_words needs to move
+        word boxes back.
+        """
+        if cell_image not in CELL_IMAGES:
+            raise ValueError(f"Unknown cell image: {cell_image}")
+        if unit not in MONTAGE_UNITS:
+            raise ValueError(f"Unknown montage unit: {unit}")
+        
+        try:
+            info = {}
+            crops = []
+            sources = {}
+            if regions:
+                img = self.decode_luminance(image_buffer)
+                for name, box in regions.items():
+                    box = self.decoder.to_decoded(box)
+                    crop = self.crop_array(img, box)
+                    if crop.size == 0:
+                        raise ValueError(f"Region {name} is outside the image")
+                    if crop.ndim == 3:
+                        with profile_stage('grayscale'):
+                            crop = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+                    crops.append((name, crop))
+                    sources[name] = self.decoder.to_source(box)
+            else:
+                region, grid, gray, binary = self._table_grid(image_buffer, coordinates, auto_detect, source,
+                                                              column_names, info)
+                image = binary if cell_image == 'binary' else gray
+                # Ink boxes of the selected cells, merged per column when packing whole columns
+                boxes = {}
+                for index, name, box in self._grid_cells(grid, rows, columns):
+                    key = name if unit == 'column' else f"{index}_{name}"
+                    ink = self._ink_box(binary, box)
+                    merged = boxes.get(key)
+                    if ink is not None and merged is not None:
+                        left, top = min(merged['left'], ink['left']), min(merged['top'], ink['top'])
+                        ink = {'left': left, 'top': top,
+                               'width': max(merged['left'] + merged['width'], ink['left'] + ink['width']) - left,
+                               'height': max(merged['top'] + merged['height'], ink['top'] + ink['height']) - top}
+                    boxes[key] = ink if ink is not None else merged
+                
+                info['empty'] = [name for name, box in boxes.items() if box is None]
+                for name, box in boxes.items():
+                    if box is not None:
+                        crops.append((name, self.crop_array(image, box)))
+                        sources[name] = self._grid_to_source(region, grid, binary, box)
+            if not crops:
+                raise ValueError("No text to pack")
             
-            return results
+            with profile_stage('compose_montage'):
+                montage, offsets = compose_montage(crops, max_width, gutter)
+            with profile_stage('encode_png'):
+                data = self.codec.encode(montage, 'png', binary=not regions and cell_image == 'binary',
+                                         pack_binary=True)
+            info['montage'] = {'width': montage.shape[1], 'height': montage.shape[0],
+                               'offsets': {name: {**box, 'source': sources[name]} for name, box in offsets.items()}}
+            return data, info
             
         except Exception as e:
-            raise Exception(f"Error in binary OCR preprocessing: {str(e)}")
+            raise Exception(f"Error building OCR montage: {str(e)}")
+    
+    def _table_grid(self, image_buffer: bytes, coordinates: Dict[str, int], auto_detect: bool, source: str,
+                    column_names: List[str], info: Dict[str, Any]) -> Tuple[Dict[str, int], Dict[str, Any], np.ndarray, np.ndarray]:
+        """
+        Decode, crop the box score region and segment it: (region, grid, grayscale,
+        binary), the images levelled as the grid is (_grid_to_source maps boxes back)
+        """
+        img = self.decode_luminance(image_buffer)
+        region = self._region_coordinates(img, coordinates, auto_detect, source, info)
+        roi = self.crop_array(img, region)
+        if roi.size == 0:
+            raise ValueError("Crop region is outside the image")
+        if roi.ndim == 2:
+            gray = roi
+        else:
+            with profile_stage('grayscale'):
+                gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+        with profile_stage('table_grid'):
+            grid, gray, binary = segment_table(gray, column_names)
+        return region, grid, gray, binary
+    
+    def _grid_cells(self, grid: Dict[str, Any], rows: List[int] = None,
+                    columns: List[str] = None) -> Iterator[Tuple[int, str, Dict[str, int]]]:
+        """(row index, column name, box within the region) of the selected cells"""
+        for index, row in enumerate(grid['rows']):
+            if rows is not None and index not in rows:
+                continue
+            for column in grid['columns']:
+                if columns is not None and column['name'] not in columns:
+                    continue
+                yield index, column['name'], {'left': column['left'], 'top': row['top'],
+                                              'width': column['width'], 'height': row['height']}
+    
+    def _ink_box(self, binary: np.ndarray, box: Dict[str, int], padding: int = 2) -> Optional[Dict[str, int]]:
+        """The part of box holding ink in the segmentation binary, padded and kept within box; None if blank"""
+        cell = self.crop_array(binary, box)
+        ink_rows = np.flatnonzero(cell.any(axis=1))
+        if ink_rows.size == 0:
+            return None
+        ink_columns = np.flatnonzero(cell.any(axis=0))
+        left = max(0, int(ink_columns[0]) - padding)
+        top = max(0, int(ink_rows[0]) - padding)
+        right = min(box['width'], int(ink_columns[-1]) + 1 + padding)
+        bottom = min(box['height'], int(ink_rows[-1]) + 1 + padding)
+        return {'left': box['left'] + left, 'top': box['top'] + top, 'width': right - left, 'height': bottom - top}
+    
+    def _region_to_source(self, region: Dict[str, int], box: Dict[str, int]) -> Dict[str, int]:
+        """A box within the region in source-image pixels"""
+        return self.decoder.to_source({**box, 'left': region['left'] + box['left'], 'top': region['top'] + box['top']})
+    
+    def _grid_to_source(self, region: Dict[str, int], grid: Dict[str, Any], crop: np.ndarray,
+                        box: Dict[str, int]) -> Dict[str, int]:
+        """A box in the levelled table crop in source-image pixels"""
+        return self._region_to_source(region, level_to_crop(box, grid['deskew'], crop.shape[1], crop.shape[0]))
+    
+    def fingerprint_image(self, image_buffer: bytes, coordinates: Dict[str, int] = None,
+                          auto_detect: bool = False, source: str = None) -> int:
+        """Perceptual hash of the box score region, so edits outside the table don't count"""
+        img = self.decode_luminance(image_buffer)
+        if coordinates is None and not auto_detect:
+            # The reference rectangle scaled to the frame, so other capture sizes still match
+            h, w = img.shape[:2]
+            roi = self.crop_array(img, scale_reference_coordinates(self.nba_2k25_coordinates, w, h))
+        else:
+            roi = self._crop_region(img, coordinates, auto_detect, source)
+        with profile_stage('fingerprint'):
+            gray = roi if roi.ndim == 2 else cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+            return perceptual_hash(gray)
+    
+    def find_near_duplicate(self, image_buffer: bytes, digest: str = None, register: bool = True,
+                            max_distance: int = DEFAULT_MAX_DISTANCE,
+                            region: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Fingerprint an image and look up the closest recently seen one; it is a
+        near-duplicate within max_distance bits. The image is then added to the index.
+        region holds the coordinates / auto_detect / source used to find the box score.
+        """
+        digest = digest or hashlib.sha256(image_buffer).hexdigest()
+        region = region or {}
+        fingerprint = self.fingerprint_image(image_buffer, region.get('coordinates'),
+                                             region.get('auto_detect', False), region.get('source'))
+        match = self.fingerprints.find_duplicate(fingerprint, max_distance, exclude=digest)
+        if register:
+            self.fingerprints.add(digest, fingerprint)
+        return {
+            'data': {'digest': digest, 'fingerprint': format(fingerprint, 'x')},
+            'duplicate_of': match[0] if match else None,
+            'distance': match[1] if match else None,
+        }
+    
+    def crop_and_preprocess(self, image_buffer: bytes, chain: str = 'preprocess_binary_ocr',
+                            coordinates: Dict[str, int] = None, denoise: bool = False,
+                            deskew_tolerance: float = None, auto_detect: bool = False,
+                            source: str = None, backend: str = None) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Fused crop + preprocessing: decode once, run the chain directly on the
+        crop region (a view of the decoded frame) and encode only the final outputs
+        """
+        if chain not in FUSED_CHAINS:
+            raise ValueError(f"Unknown preprocessing chain: {chain}")
+        
+        try:
+            info = {'chain': chain}
+            roi = self._crop_region(self.decode_luminance(image_buffer), coordinates, auto_detect, source, info)
+            return self._preprocess_region(roi, chain, denoise, deskew_tolerance, backend, info)
+            
+        except Exception as e:
+            raise Exception(f"Error in fused crop preprocessing: {str(e)}")
+    
+    def _preprocess_region(self, roi: np.ndarray, chain: str, denoise: bool = False, deskew_tolerance: float = None,
+                           backend: str = None, info: Optional[Dict[str, Any]] = None) -> Tuple[Any, Dict[str, Any]]:
+        """Run a FUSED_CHAINS chain on an already decoded region (BGR or grayscale)"""
+        info = {} if info is None else info
+        if chain == 'preprocess_binary_ocr':
+            result, summary = self._binary_ocr(roi, denoise, deskew_tolerance)
+            info.update(summary)
+            return result, info
+        
+        if roi.ndim == 2:
+            gray = roi
+        else:
+            with profile_stage('grayscale'):
+                gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+        if (backend or self.preprocess_backend) == 'pil':
+            gray = Image.fromarray(gray)
+        if chain == 'preprocess_ocr':
+            return self._encode_jpeg(self._ocr_standard(gray)), info
+        elif chain == 'preprocess_ocr_alternative':
+            return self._encode_png(self._ocr_alternative(gray)), info
+        return self._multiple_versions(gray), info
+    
+    def extract_video_frames(self, video_buffer: bytes, max_frames: int = 1, sample_fps: float = DEFAULT_SAMPLE_FPS,
+                             chain: str = None, denoise: bool = False, deskew_tolerance: float = None,
+                             backend: str = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return collect_sections(self._stream_video_frames(video_buffer, max_frames, sample_fps, chain,
+                                                          denoise, deskew_tolerance, backend))
+    
+    def _stream_video_frames(self, video_buffer: bytes, max_frames: int = 1, sample_fps: float = DEFAULT_SAMPLE_FPS,
+                             chain: str = None, denoise: bool = False, deskew_tolerance: float = None,
+                             backend: str = None) -> SectionStream:
+        """
+        Yield the sharpest still box score frame(s) of a screen recording as
+        they are found: each whole frame as JPEG ('frame_<index>'), or with a
+        chain, that chain's outputs for the detected box score region
+        ('frame_<index>' or 'frame_<index>_<version>'). Frames are decoded
+        one at a time and reading stops after max_frames selections.
+        """
+        if chain is not None and chain not in FUSED_CHAINS:
+            raise ValueError(f"Unknown preprocessing chain: {chain}")
+        
+        # OpenCV's demuxers read from a path, so the clip goes to a RAM-backed file first
+        path = shared_path('scorecheck-video')
+        capture = None
+        try:
+            with profile_stage('write_video'):
+                with open(path, 'wb') as f:
+                    f.write(video_buffer)
+            capture = cv2.VideoCapture(path)
+            if not capture.isOpened():
+                raise ValueError("Could not open video")
+            
+            frames = []
+            selections = select_still_frames(sample_frames(capture, sample_fps), max_frames)
+            while True:
+                with profile_stage('select_frames'):
+                    pick = next(selections, None)
+                if pick is None:
+                    break
+                name = f"frame_{pick['index']}"
+                entry = {key: pick[key] for key in ('index', 'time', 'sharpness', 'region')}
+                if chain is None:
+                    yield name, self._encode_jpeg(pick['frame'])
+                else:
+                    result, info = self._preprocess_region(
+                        self.crop_array(pick['frame'], pick['region']), chain, denoise, deskew_tolerance, backend)
+                    entry.update(info)
+                    if isinstance(result, dict):
+                        for version, output in result.items():
+                            yield f"{name}_{version}", output
+                    else:
+                        yield name, result
+                frames.append(entry)
+            
+            # Containers without an index report a meaningless frame count
+            total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+            position = int(capture.get(cv2.CAP_PROP_POS_FRAMES))
+            return {'frames': frames, 'video': {
+                'fps': round(capture.get(cv2.CAP_PROP_FPS), 3), 'frame_count': total if total > 0 else None,
+                'read_frames': position, 'stopped_early': 0 < position < total}}
+            
+        except Exception as e:
+            raise Exception(f"Error extracting video frames: {str(e)}")
+        finally:
+            if capture is not None:
+                capture.release()
+            # Missing if writing the clip failed; that error is the one to report
+            if os.path.exists(path):
+                os.remove(path)
     
     def process_image(self, operation: str, image_buffer: bytes, **kwargs) -> Dict[str, Any]:
-        """Main processing function that handles all operations"""
+        """Main processing function that handles all operations (image outputs base64-encoded)"""
+        return encode_base64_result(self.process_image_raw(operation, image_buffer, **kwargs))
+    
+    def process_image_raw(self, operation: str, image_buffer: bytes, **kwargs) -> Dict[str, Any]:
+        """
+        Run an operation with image outputs left as raw bytes, consulting the result cache first.
+        With profile=True the result carries a 'profile' entry with per-stage timings.
+        """
+        if kwargs.pop('profile', False):
+            profiler = StageProfiler()
+            with profiler.activate():
+                result = self.process_image_raw(operation, image_buffer, **kwargs)
+            return {**result, 'profile': {'operation': operation, **profiler.report()}}
+        
+        if operation == 'cache_stats':
+            return {'success': True, 'data': self.cache.stats() if self.cache else None}
+        
+        # A processing profile only supplies defaults; the expanded options are what the cache keys on
+        try:
+            kwargs = apply_processing_profile(kwargs)
+        except ValueError as e:
+            return {'success': False, 'error': str(e)}
+        
+        # Near-duplicate short-circuit: serve the cached result of a recent look-alike image
+        skip_duplicates = kwargs.pop('skip_duplicates', False)
+        max_distance = kwargs.pop('duplicate_distance', DEFAULT_MAX_DISTANCE)
+        
+        if self.cache is None or operation in UNCACHED_OPERATIONS:
+            return self._run_operation(operation, image_buffer, **kwargs)
+        
+        digest = hashlib.sha256(image_buffer).hexdigest()
+        try:
+            key = self._cache_key(operation, digest, kwargs)
+        except (TypeError, ValueError) as e:
+            return {'success': False, 'error': str(e)}
+        with profile_stage('cache_lookup'):
+            cached = self.cache.get(key)
+            if cached is not None:
+                return unpack_result(cached)
+        
+        if skip_duplicates:
+            try:
+                duplicate = self._near_duplicate_result(operation, image_buffer, digest, max_distance, kwargs)
+            except Exception as e:
+                return {'success': False, 'error': str(e)}
+            if duplicate is not None:
+                return duplicate
+        
+        result = self._run_operation(operation, image_buffer, **kwargs)
+        if result.get('success'):
+            with profile_stage('cache_store'):
+                self.cache.put(key, pack_result(result))
+        return result
+    
+    def _near_duplicate_result(self, operation: str, image_buffer: bytes, digest: str, max_distance: int,
+                               kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        The cached result of a recently seen near-duplicate of the image, with its
+        'duplicate_of' digest and 'distance'; None if there is none (the image is
+        registered in the fingerprint index either way)
+        """
+        with self._operation_settings(kwargs):
+            duplicate = self.find_near_duplicate(image_buffer, digest, True, max_distance, kwargs)
+        if not duplicate['duplicate_of']:
+            return None
+        with profile_stage('cache_lookup'):
+            cached = self.cache.get(self._cache_key(operation, duplicate['duplicate_of'], kwargs))
+        if cached is None:
+            return None
+        return {**unpack_result(cached), 'duplicate_of': duplicate['duplicate_of'], 'distance': duplicate['distance']}
+    
+    def process_image_stream(self, operation: str, image_buffer: bytes, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Like process_image_raw, but yields a {'name', 'data', ...} record per output
+        as soon as it is encoded, then a final {'done': True, 'success', ...} record
+        with the remaining fields. test_hardcoded, multiple_versions,
+        preprocess_binary_ocr and video_frames stream output by output; other operations run
+        normally and are then split into records.
+        """
+        profiler = StageProfiler() if kwargs.pop('profile', False) else None
+        try:
+            kwargs = apply_processing_profile(kwargs)
+            if profiler:
+                with profiler.activate():
+                    summary = yield from self._stream_records(operation, image_buffer, **kwargs)
+            else:
+                summary = yield from self._stream_records(operation, image_buffer, **kwargs)
+        except Exception as e:
+            summary = {'success': False, 'error': str(e)}
+        if profiler:
+            summary['profile'] = {'operation': operation, **profiler.report()}
+        yield {'done': True, **summary}
+    
+    def _stream_records(self, operation: str, image_buffer: bytes, **kwargs) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+        if operation not in STREAMED_OPERATIONS:
+            return (yield from stream_result(self.process_image_raw(operation, image_buffer, **kwargs)))
+        
+        # As in process_image_raw: a recent near-duplicate's cached outputs are streamed instead
+        skip_duplicates = kwargs.pop('skip_duplicates', False)
+        max_distance = kwargs.pop('duplicate_distance', DEFAULT_MAX_DISTANCE)
+        
+        key = None
+        if self.cache is not None and operation not in UNCACHED_OPERATIONS:
+            digest = hashlib.sha256(image_buffer).hexdigest()
+            key = self._cache_key(operation, digest, kwargs)
+            with profile_stage('cache_lookup'):
+                cached = self.cache.get(key)
+            if cached is not None:
+                return (yield from stream_result(unpack_result(cached)))
+            if skip_duplicates:
+                duplicate = self._near_duplicate_result(operation, image_buffer, digest, max_distance, kwargs)
+                if duplicate is not None:
+                    return (yield from stream_result(duplicate))
+        
+        # Only the encoded outputs are kept, for the cache entry
+        outputs = {}
+        with self._operation_settings(kwargs):
+            if operation == 'test_hardcoded':
+                stream = self._stream_hardcoded_tests()
+            elif operation == 'multiple_versions':
+                stream = self._stream_multiple_versions(self._decode_gray(image_buffer, kwargs.get('backend')),
+                                                        kwargs.get('triage', False), image_buffer)
+            elif operation == 'video_frames':
+                stream = self._stream_video_frames(
+                    image_buffer, kwargs.get('max_frames', 1), kwargs.get('sample_fps', DEFAULT_SAMPLE_FPS),
+                    kwargs.get('chain'), kwargs.get('denoise', False), kwargs.get('deskew_tolerance'), kwargs.get('backend'))
+            else:
+                stream = self._stream_binary_ocr(self.decode_luminance(image_buffer), kwargs.get('denoise', False),
+                                                 kwargs.get('deskew_tolerance'), kwargs.get('triage', False),
+                                                 image_buffer)
+            
+            while True:
+                try:
+                    name, output = next(stream)
+                except StopIteration as stop:
+                    summary = stop.value
+                    break
+                if isinstance(output, dict):
+                    yield {'name': name, **output}
+                else:
+                    yield {'name': name, 'data': output}
+                    if key:
+                        outputs[name] = output
+        
+        summary = {'success': True, **summary}
+        if key:
+            with profile_stage('cache_store'):
+                self.cache.put(key, pack_result({'success': True, 'data': outputs, **summary}))
+        return summary
+    
+    def _cache_key(self, operation: str, digest: str, kwargs: Dict[str, Any]) -> str:
+        """Result cache key; the effective codec profile and decoder settings count, defaults are left out"""
+        codec = kwargs.get('codec', self.codec.profile)
+        decoder = self._requested_decoder(kwargs)
+        key_params = {name: value for name, value in kwargs.items()
+                      if name not in ('codec', 'luminance_decode', 'decode_scale',
+                                      'skip_duplicates', 'duplicate_distance')}
+        if codec != DEFAULT_CODEC_PROFILE:
+            key_params['codec'] = codec
+        if not decoder.is_default:
+            key_params['decode'] = decoder.describe()
+        return self.cache.make_digest_key(digest, operation, key_params)
+    
+    def _requested_decoder(self, kwargs: Dict[str, Any]) -> ImageDecoder:
+        """The decoder for a call: luminance_decode / decode_scale kwargs override the processor's"""
+        luminance = bool(kwargs.get('luminance_decode', self.decoder.luminance))
+        scale = int(kwargs.get('decode_scale', self.decoder.scale))
+        if luminance == self.decoder.luminance and scale == self.decoder.scale:
+            return self.decoder
+        return ImageDecoder(luminance, scale)
+    
+    @contextmanager
+    def _operation_settings(self, kwargs: Dict[str, Any]):
+        """Use the call's codec profile, decoder and deskew settings for the duration of one operation"""
+        default_codec = self.codec
+        default_decoder = self.decoder
+        default_deskew = (self.deskew, self.deskew_max_dimension)
+        try:
+            if kwargs.get('codec', default_codec.profile) != default_codec.profile:
+                self.codec = OutputCodec(kwargs['codec'])
+            self.decoder = self._requested_decoder(kwargs)
+            self.deskew = bool(kwargs.get('deskew', self.deskew))
+            self.deskew_max_dimension = int(kwargs.get('deskew_max_dimension', self.deskew_max_dimension))
+            yield
+        finally:
+            self.codec = default_codec
+            self.decoder = default_decoder
+            self.deskew, self.deskew_max_dimension = default_deskew
+    
+    def _run_operation(self, operation: str, image_buffer: bytes, **kwargs) -> Dict[str, Any]:
+        """Dispatch a single operation without caching, with the requested codec profile and decoder"""
+        try:
+            with self._operation_settings(kwargs):
+                return self._dispatch_operation(operation, image_buffer, **kwargs)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def _dispatch_operation(self, operation: str, image_buffer: bytes, **kwargs) -> Dict[str, Any]:
         try:
             if operation == 'test_hardcoded':
                 return self.test_with_hardcoded_image()
             elif operation == 'crop':
                 coordinates = kwargs.get('coordinates', self.nba_2k25_coordinates)
-                result = self.crop_image(image_buffer, coordinates)
-                return {'success': True, 'data': base64.b64encode(result).decode('utf-8')}
+                return {'success': True, 'data': self.crop_image(image_buffer, coordinates)}
             
             elif operation == 'crop_box_score':
-                result = self.crop_box_score(image_buffer)
-                return {'success': True, 'data': base64.b64encode(result).decode('utf-8')}
+                result = self.crop_box_score(image_buffer, kwargs.get('auto_detect', False), kwargs.get('source'))
+                return {'success': True, 'data': result}
+            
+            elif operation == 'fingerprint':
+                return {'success': True, **self.find_near_duplicate(
+                    image_buffer, None, kwargs.get('register', True),
+                    kwargs.get('duplicate_distance', DEFAULT_MAX_DISTANCE), kwargs)}
+            
+            elif operation == 'detect_layout':
+                coordinates, origin = self.resolve_box_score_region(self.decode_luminance(image_buffer), kwargs.get('source'))
+                return {'success': True, 'data': self.decoder.to_source(coordinates), 'layout_source': origin}
             
             elif operation == 'preprocess_ocr':
-                result = self.preprocess_for_ocr(image_buffer)
-                return {'success': True, 'data': base64.b64encode(result).decode('utf-8')}
+                return {'success': True, 'data': self.preprocess_for_ocr(image_buffer, kwargs.get('backend'))}
             
             elif operation == 'preprocess_ocr_alternative':
-                result = self.preprocess_for_ocr_alternative(image_buffer)
-                return {'success': True, 'data': base64.b64encode(result).decode('utf-8')}
+                return {'success': True, 'data': self.preprocess_for_ocr_alternative(image_buffer, kwargs.get('backend'))}
             
             elif operation == 'multiple_versions':
-                results = self.create_multiple_versions(image_buffer)
-                encoded_results = {}
-                for key, value in results.items():
-                    encoded_results[key] = base64.b64encode(value).decode('utf-8')
-                return {'success': True, 'data': encoded_results}
+                result, info = self.create_multiple_versions_with_info(
+                    image_buffer, kwargs.get('backend'), kwargs.get('triage', False))
+                return {'success': True, 'data': result, **info}
+            
+            elif operation == 'triage':
+                return {'success': True, 'data': self.triage_image(image_buffer)}
             
             elif operation == 'dimensions':
                 result = self.get_image_dimensions(image_buffer)
                 return {'success': True, 'data': result}
             
+            elif operation == 'metadata':
+                return {'success': True, 'data': self.read_image_metadata(image_buffer)}
+            
             elif operation == 'preprocess_binary_ocr':
                 denoise = kwargs.get('denoise', False)
-                result = self.preprocess_binary_ocr(image_buffer, denoise)
-                encoded_results = {}
-                for key, value in result.items():
-                    encoded_results[key] = base64.b64encode(value).decode('utf-8')
-                return {'success': True, 'data': encoded_results}
+                result, info = self.preprocess_binary_ocr_with_info(
+                    image_buffer, denoise, kwargs.get('deskew_tolerance'), kwargs.get('triage', False))
+                return {'success': True, 'data': result, **info}
+            
+            elif operation == 'table_grid':
+                result, info = self.segment_table_grid(
+                    image_buffer, kwargs.get('coordinates'), kwargs.get('auto_detect', False), kwargs.get('source'),
+                    kwargs.get('column_names'), kwargs.get('rows'), kwargs.get('columns'),
+                    kwargs.get('crops', False), kwargs.get('cell_image', 'binary'))
+                return {'success': True, 'data': result, **info}
+            
+            elif operation == 'recognize_digits':
+                result, info = self.recognize_digits(
+                    image_buffer, kwargs.get('coordinates'), kwargs.get('auto_detect', False), kwargs.get('source'),
+                    kwargs.get('column_names'), kwargs.get('rows'), kwargs.get('columns'),
+                    kwargs.get('min_confidence', DEFAULT_MIN_CONFIDENCE))
+                return {'success': True, 'data': result, **info}
+            
+            elif operation == 'ocr_montage':
+                result, info = self.build_ocr_montage(
+                    image_buffer, kwargs.get('coordinates'), kwargs.get('auto_detect', False), kwargs.get('source'),
+                    kwargs.get('column_names'), kwargs.get('rows'), kwargs.get('columns'),
+                    kwargs.get('cell_image', 'binary'), kwargs.get('unit', 'cell'), kwargs.get('regions'),
+                    kwargs.get('max_width'), kwargs.get('gutter'))
+                return {'success': True, 'data': result, **info}
+            
+            elif operation == 'crop_preprocess':
+                result, info = self.crop_and_preprocess(
+                    image_buffer, kwargs.get('chain', 'preprocess_binary_ocr'), kwargs.get('coordinates'),
+                    kwargs.get('denoise', False), kwargs.get('deskew_tolerance'),
+                    kwargs.get('auto_detect', False), kwargs.get('source'), kwargs.get('backend'))
+                return {'success': True, 'data': result, **info}
+            
+            elif operation == 'video_frames':
+                result, info = self.extract_video_frames(
+                    image_buffer, kwargs.get('max_frames', 1), kwargs.get('sample_fps', DEFAULT_SAMPLE_FPS),
+                    kwargs.get('chain'), kwargs.get('denoise', False), kwargs.get('deskew_tolerance'), kwargs.get('backend'))
+                return {'success': True, 'data': result, **info}
             
             else:
                 return {'success': False, 'error': f'Unknown operation: {operation}'}
@@ -370,22 +1276,295 @@ class PythonImageProcessor:
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
+def is_image_map(data: Any) -> bool:
+    return isinstance(data, dict) and len(data) > 0 and all(isinstance(v, bytes) for v in data.values())
+
+def collect_sections(stream: SectionStream) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Run a section stream to the end: ({name: output}, its return value)"""
+    sections = {}
+    while True:
+        try:
+            name, output = next(stream)
+        except StopIteration as stop:
+            return sections, stop.value
+        sections[name] = output
+
+def stream_result(result: Dict[str, Any]) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+    """Yield a finished result's images as stream records and return its remaining fields"""
+    summary = {key: value for key, value in result.items() if key != 'data'}
+    data = result.get('data')
+    if isinstance(data, bytes):
+        yield {'name': 'data', 'data': data}
+    elif is_image_map(data):
+        for name, output in data.items():
+            yield {'name': name, 'data': output}
+    elif 'data' in result:
+        summary['data'] = data
+    return summary
+
+def encode_base64_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert raw image bytes in a result to the base64 strings of the JSON output"""
+    data = result.get('data')
+    if isinstance(data, bytes):
+        return {**result, 'data': base64.b64encode(data).decode('utf-8')}
+    if is_image_map(data):
+        return {**result, 'data': {key: base64.b64encode(value).decode('utf-8') for key, value in data.items()}}
+    return result
+
+def split_sections(result: Dict[str, Any]) -> Tuple[Dict[str, Any], list]:
+    """
+    Split a raw result into a small JSON header and its binary image sections.
+    The header lists each section's name and length in the order they follow.
+    """
+    header = {key: value for key, value in result.items() if key != 'data'}
+    data = result.get('data')
+    
+    if isinstance(data, bytes):
+        header['layout'] = 'single'
+        header['sections'] = [{'name': 'data', 'length': len(data)}]
+        return header, [data]
+    
+    if is_image_map(data):
+        header['layout'] = 'map'
+        header['sections'] = [{'name': key, 'length': len(value)} for key, value in data.items()]
+        return header, list(data.values())
+    
+    if 'data' in result:
+        header['data'] = data
+    header['sections'] = []
+    return header, []
+
+def join_sections(header: Dict[str, Any], sections: list) -> Dict[str, Any]:
+    """Inverse of split_sections"""
+    result = {key: value for key, value in header.items() if key not in ('layout', 'sections')}
+    layout = header.get('layout')
+    if layout == 'single':
+        result['data'] = sections[0]
+    elif layout == 'map':
+        result['data'] = {entry['name']: section for entry, section in zip(header['sections'], sections)}
+    return result
+
+def write_sections(stream: BinaryIO, result: Dict[str, Any], extra: Optional[Dict[str, Any]] = None) -> None:
+    """Write a result as a JSON header frame followed by one raw frame per image"""
+    header, sections = split_sections(result)
+    if extra:
+        header.update(extra)
+    write_frame(stream, json.dumps(header).encode('utf-8'), flush=False)
+    for section in sections:
+        write_frame(stream, section, flush=False)
+    stream.flush()
+
+def read_sections(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Read a result written by write_sections"""
+    header_frame = read_frame(stream)
+    if header_frame is None:
+        return None
+    header = json.loads(header_frame.decode('utf-8'))
+    sections = []
+    for _ in header.get('sections', []):
+        section = read_frame(stream)
+        if section is None:
+            raise EOFError("Missing binary section")
+        sections.append(section)
+    return join_sections(header, sections)
+
+def pack_result(result: Dict[str, Any]) -> bytes:
+    output = io.BytesIO()
+    write_sections(output, result)
+    return output.getvalue()
+
+def unpack_result(data: bytes) -> Dict[str, Any]:
+    return read_sections(io.BytesIO(data))
+
+def write_mapped_result(result: Dict[str, Any], path: Optional[str] = None, fd: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Write a result's images back to back into a shared-memory file or inherited
+    descriptor; returns the JSON header with each section's offset and length
+    """
+    header, sections = split_sections(result)
+    names = [entry['name'] for entry in header['sections']]
+    header['sections'] = write_mapped_sections(list(zip(names, sections)), path, fd)
+    header['output'] = path if fd is None else f"fd:{fd}"
+    return header
+
+def write_ndjson(stream: TextIO, records: Iterator[Dict[str, Any]]) -> Dict[str, Any]:
+    """Write each stream record as one JSON line as soon as it is ready; returns the final record"""
+    record = {'done': True, 'success': False, 'error': 'No output'}
+    for record in records:
+        stream.write(json.dumps(encode_base64_result(record)) + '\n')
+        stream.flush()
+    return record
+
+def write_stream_record(stream: BinaryIO, record: Dict[str, Any], output_format: str, request_id: Any) -> None:
+    """One serve stream record: header frame plus raw image frames, or a base64 JSON frame for ndjson"""
+    if output_format == 'stream':
+        write_sections(stream, record, {'id': request_id})
+    else:
+        write_frame(stream, json.dumps({**encode_base64_result(record), 'id': request_id}).encode('utf-8'))
+
+def read_frame(stream: BinaryIO) -> Optional[bytes]:
+    """Read one length-prefixed frame, returning None on a clean end of stream"""
+    header = stream.read(FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < FRAME_HEADER.size:
+        raise EOFError("Truncated frame header")
+    
+    (length,) = FRAME_HEADER.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise EOFError(f"Truncated frame: expected {length} bytes, got {len(payload)}")
+    return payload
+
+def write_frame(stream: BinaryIO, payload: bytes, flush: bool = True) -> None:
+    """Write one length-prefixed frame, by default flushing it to the reader"""
+    stream.write(FRAME_HEADER.pack(len(payload)))
+    stream.write(payload)
+    if flush:
+        stream.flush()
+
+def serve(processor: PythonImageProcessor, stdin: BinaryIO, stdout: BinaryIO) -> None:
+    """
+    Long-lived worker loop. Each request is a JSON header frame
+    ({"id", "operation", "params", "output_format"}) followed by an image frame.
+    Responses echo the request id and are a single JSON frame, or with
+    output_format "binary" a JSON header frame plus one raw frame per image.
+    With "input_path" the image is mapped from that file (the image frame is
+    empty); with "output_path" images are written there and the JSON frame
+    lists their offsets. output_format "stream" (binary) or "ndjson" (JSON)
+    sends one record per output as soon as it is encoded, ending with a
+    {"done": true} record.
+    """
+    while True:
+        header = read_frame(stdin)
+        if header is None:
+            return
+        image_buffer = read_frame(stdin)
+        if image_buffer is None:
+            raise EOFError("Missing image frame after request header")
+        
+        request_id = None
+        output_format = 'json'
+        output_path = None
+        try:
+            request = json.loads(header.decode('utf-8'))
+            request_id = request.get('id')
+            output_format = request.get('output_format', 'json')
+            output_path = request.get('output_path')
+            if request.get('input_path'):
+                image_buffer = map_input(request['input_path'])
+            params = request.get('params') or {}
+            if output_format in STREAM_FORMATS and not output_path:
+                for record in processor.process_image_stream(request.get('operation', ''), image_buffer, **params):
+                    write_stream_record(stdout, record, output_format, request_id)
+                continue
+            response = processor.process_image_raw(request.get('operation', ''), image_buffer, **params)
+        except Exception as e:
+            response = {'success': False, 'error': f'Invalid request: {str(e)}'}
+        
+        if output_path:
+            try:
+                response = write_mapped_result(response, output_path)
+            except OSError as e:
+                response = {'success': False, 'error': f'Could not write output: {str(e)}'}
+            response['id'] = request_id
+            write_frame(stdout, json.dumps(response).encode('utf-8'))
+        elif output_format == 'binary':
+            write_sections(stdout, response, {'id': request_id})
+        elif output_format in STREAM_FORMATS:
+            write_stream_record(stdout, {'done': True, **response}, output_format, request_id)
+        else:
+            response = encode_base64_result(response)
+            response['id'] = request_id
+            write_frame(stdout, json.dumps(response).encode('utf-8'))
+
 def main():
     """Main function for command line usage"""
     parser = argparse.ArgumentParser(description='Python Image Processor for ScoreCheck')
-    parser.add_argument('--operation', required=True, 
-                       choices=['crop', 'crop_box_score', 'preprocess_ocr', 'preprocess_ocr_alternative', 'multiple_versions', 'dimensions', 'test_hardcoded', 'preprocess_binary_ocr'],
+    parser.add_argument('--operation', 
+                       choices=['crop', 'crop_box_score', 'preprocess_ocr', 'preprocess_ocr_alternative', 'multiple_versions', 'dimensions', 'metadata', 'test_hardcoded', 'preprocess_binary_ocr', 'crop_preprocess', 'detect_layout', 'fingerprint', 'triage', 'table_grid', 'recognize_digits', 'ocr_montage', 'video_frames'],
                        help='Image processing operation to perform')
-    parser.add_argument('--input', help='Input image file path (not needed for test_hardcoded)')
+    parser.add_argument('--input', help='Input image (or video_frames: MP4/MOV clip) file path (not needed for test_hardcoded)')
+    parser.add_argument('--input-fd', type=int, help='Read the input image from this inherited file descriptor')
     parser.add_argument('--output', help='Output image file path (optional)')
+    parser.add_argument('--output-fd', type=int, help='With --output-format mmap, write images into this inherited file descriptor')
     parser.add_argument('--coordinates', help='Crop coordinates as JSON string')
     parser.add_argument('--denoise', action='store_true', help='Apply median blur for binary OCR preprocessing')
+    parser.add_argument('--chain', choices=FUSED_CHAINS,
+                       help='Preprocessing chain for crop_preprocess (default: preprocess_binary_ocr) and video_frames (default: none, whole frames as JPEG)')
+    parser.add_argument('--backend', choices=PREPROCESS_BACKENDS, help='Implementation of the preprocess_ocr chains (default: numpy)')
+    parser.add_argument('--auto-detect', action='store_true', help='Locate the box score table instead of using the fixed 4K coordinates')
+    parser.add_argument('--source', help='Source fingerprint (e.g. user or device) for the per-resolution layout cache')
+    parser.add_argument('--deskew-tolerance', type=float, help='Skip deskew rotation below this angle in degrees (default 0.1)')
+    parser.add_argument('--serve', action='store_true', help='Run as a persistent worker reading framed requests on stdin')
+    parser.add_argument('--cache-dir', help='Result cache directory (default: SCORECHECK_CACHE_DIR or the system temp dir)')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the content-addressed result cache')
+    parser.add_argument('--output-format', choices=['json', 'binary', 'mmap', 'ndjson'], default='json',
+                       help='json: base64 images inside JSON; binary: JSON header frame plus raw length-prefixed image frames; '
+                            'mmap: images written back to back into --output/--output-fd (e.g. under /dev/shm), JSON offsets on stdout; '
+                            'ndjson: one JSON line per output as soon as it is encoded, then a {"done": true} line')
+    parser.add_argument('--codec', choices=list(CODEC_PROFILES),
+                       help='Output encoding profile (default: the processing profile\'s, else SCORECHECK_CODEC_PROFILE or standard)')
+    parser.add_argument('--tile-workers', type=int,
+                       help='Filter large frames in overlapping bands on this many threads (default: SCORECHECK_TILE_WORKERS, 0 = off)')
+    parser.add_argument('--profile', action='store_true', help='Include per-stage wall time, CPU time and peak memory in the result')
+    parser.add_argument('--processing-profile', choices=list(PROCESSING_PROFILES),
+                       help='Speed/accuracy trade-off: resolution, versions, deskew/denoise and codec (default: balanced); '
+                            'explicit flags still win')
+    parser.add_argument('--skip-duplicates', action='store_true',
+                       help='Serve the cached result of a recent near-duplicate (perceptual hash of the box score) instead of reprocessing')
+    parser.add_argument('--duplicate-distance', type=int,
+                       help=f'Max Hamming distance (of 256 bits) for a near-duplicate (default: {DEFAULT_MAX_DISTANCE})')
+    parser.add_argument('--rows', help='table_grid, recognize_digits, ocr_montage: comma-separated row indices to return (default: all)')
+    parser.add_argument('--columns', help='table_grid, recognize_digits, ocr_montage: comma-separated column names to return (default: all)')
+    parser.add_argument('--column-names', help='table_grid, recognize_digits, ocr_montage: comma-separated names for the detected columns, left to right')
+    parser.add_argument('--crops', action='store_true', help='table_grid: return the selected cells as PNG images')
+    parser.add_argument('--cell-image', choices=CELL_IMAGES, help='table_grid, ocr_montage: image the cell crops come from (default: binary)')
+    parser.add_argument('--unit', choices=MONTAGE_UNITS, help='ocr_montage: pack single cells or whole columns (default: cell)')
+    parser.add_argument('--regions', help='ocr_montage: JSON object of named source-pixel regions to pack instead of table cells')
+    parser.add_argument('--max-width', type=int, help='ocr_montage: montage width limit in pixels (default: roughly square)')
+    parser.add_argument('--gutter', type=int, help='ocr_montage: blank pixels between crops (default: half the median crop height, at least 16)')
+    parser.add_argument('--max-frames', type=int, help='video_frames: stop after this many distinct box score frames (default: 1)')
+    parser.add_argument('--sample-fps', type=float,
+                       help=f'video_frames: frames per second examined for motion and sharpness (default: {DEFAULT_SAMPLE_FPS:g})')
+    parser.add_argument('--min-confidence', type=float,
+                       help=f'recognize_digits: cells below this confidence are listed for cloud OCR (default: {DEFAULT_MIN_CONFIDENCE})')
+    parser.add_argument('--triage', action='store_true',
+                       help='Score image quality first and build only the versions it calls for (multiple_versions, preprocess_binary_ocr)')
+    parser.add_argument('--luminance-decode', action='store_true',
+                       help='Decode straight to grayscale for luminance-only operations (may differ from BGR2GRAY by a level or two)')
+    parser.add_argument('--decode-scale', type=int, choices=list(DECODE_FLAGS),
+                       help='Decode at 1/N resolution; coordinates stay in source pixels (default: 1)')
     
     args = parser.parse_args()
     
+    if not args.serve and not args.operation:
+        parser.error('--operation is required unless --serve is given')
+    
     try:
         # Initialize processor
-        processor = PythonImageProcessor()
+        cache = cache_from_environment(args.cache_dir, args.no_cache)
+        layout_cache = LayoutCache(os.path.join(cache.cache_dir, 'layouts.json') if cache else None)
+        fingerprints = FingerprintIndex(os.path.join(cache.cache_dir, 'fingerprints.json') if cache else None)
+        codec = args.codec or os.environ.get('SCORECHECK_CODEC_PROFILE', DEFAULT_CODEC_PROFILE)
+        processor = PythonImageProcessor(cache, layout_cache, OutputCodec(codec),
+                                         tile_executor_from_environment(args.tile_workers),
+                                         ImageDecoder(args.luminance_decode, args.decode_scale or 1), fingerprints)
+        
+        if args.serve:
+            # A worker lives for many requests: load the imaging libraries now, not on the first one
+            load_now(cv2, np, Image, ImageEnhance, ImageFilter)
+            # Keep stray prints off the framed stdout channel
+            frame_out = sys.stdout.buffer
+            sys.stdout = sys.stderr
+            serve(processor, sys.stdin.buffer, frame_out)
+            return
+        
+        if args.operation == 'test_hardcoded' and args.output_format == 'ndjson':
+            final = write_ndjson(sys.stdout, processor.process_image_stream('test_hardcoded', b''))
+            if not final['success']:
+                sys.exit(1)
+            return
         
         if args.operation == 'test_hardcoded':
             # Test with hardcoded image
@@ -394,13 +1573,12 @@ def main():
             return
         
         # For other operations, require input file
-        if not args.input:
+        if not args.input and args.input_fd is None:
             print("Error: Input file is required for this operation")
             sys.exit(1)
         
-        # Read input image
-        with open(args.input, 'rb') as f:
-            image_buffer = f.read()
+        # Map the input image (no copy for the OpenCV paths)
+        image_buffer = map_input(args.input, args.input_fd)
         
         # Process image
         kwargs = {}
@@ -408,22 +1586,94 @@ def main():
             kwargs['coordinates'] = json.loads(args.coordinates)
         if args.denoise:
             kwargs['denoise'] = args.denoise
+        if args.chain:
+            kwargs['chain'] = args.chain
+        if args.backend:
+            kwargs['backend'] = args.backend
+        if args.auto_detect:
+            kwargs['auto_detect'] = True
+        if args.source:
+            kwargs['source'] = args.source
+        if args.deskew_tolerance is not None:
+            kwargs['deskew_tolerance'] = args.deskew_tolerance
+        if args.profile:
+            kwargs['profile'] = True
+        if args.processing_profile:
+            kwargs['processing_profile'] = args.processing_profile
+        # Explicit flags apply with or without a profile (and key the cache); a profile only fills in the rest
+        if args.codec:
+            kwargs['codec'] = args.codec
+        if args.luminance_decode:
+            kwargs['luminance_decode'] = True
+        if args.decode_scale:
+            kwargs['decode_scale'] = args.decode_scale
+        if args.skip_duplicates:
+            kwargs['skip_duplicates'] = True
+        if args.duplicate_distance is not None:
+            kwargs['duplicate_distance'] = args.duplicate_distance
+        if args.triage:
+            kwargs['triage'] = True
+        if args.rows:
+            kwargs['rows'] = [int(row) for row in args.rows.split(',')]
+        if args.columns:
+            kwargs['columns'] = args.columns.split(',')
+        if args.column_names:
+            kwargs['column_names'] = args.column_names.split(',')
+        if args.crops:
+            kwargs['crops'] = True
+        if args.cell_image:
+            kwargs['cell_image'] = args.cell_image
+        if args.min_confidence is not None:
+            kwargs['min_confidence'] = args.min_confidence
+        if args.unit:
+            kwargs['unit'] = args.unit
+        if args.regions:
+            kwargs['regions'] = json.loads(args.regions)
+        if args.max_width is not None:
+            kwargs['max_width'] = args.max_width
+        if args.gutter is not None:
+            kwargs['gutter'] = args.gutter
+        if args.max_frames is not None:
+            kwargs['max_frames'] = args.max_frames
+        if args.sample_fps is not None:
+            kwargs['sample_fps'] = args.sample_fps
+        
+        if args.output_format == 'ndjson':
+            final = write_ndjson(sys.stdout, processor.process_image_stream(args.operation, image_buffer, **kwargs))
+            if not final['success']:
+                sys.exit(1)
+            return
         
-        result = processor.process_image(args.operation, image_buffer, **kwargs)
+        result = processor.process_image_raw(args.operation, image_buffer, **kwargs)
+        
+        if args.output_format == 'binary':
+            write_sections(sys.stdout.buffer, result)
+            if not result['success']:
+                sys.exit(1)
+            return
+        
+        if args.output_format == 'mmap':
+            if not args.output and args.output_fd is None:
+                print("Error: --output-format mmap needs --output or --output-fd")
+                sys.exit(1)
+            print(json.dumps(write_mapped_result(result, args.output, args.output_fd)))
+            if not result['success']:
+                sys.exit(1)
+            return
         
         if result['success']:
             if args.output and 'data' in result:
                 # Save output if specified
-                if isinstance(result['data'], str):
-                    # Decode base64 data
-                    output_data = base64.b64decode(result['data'])
+                if isinstance(result['data'], bytes):
                     with open(args.output, 'wb') as f:
-                        f.write(output_data)
+                        f.write(result['data'])
                     print(f"Successfully processed image. Output saved to: {args.output}")
                 else:
                     print("Operation completed successfully")
+                if 'profile' in result:
+                    print(f"Profile: {json.dumps(result['profile'])}")
             else:
-                print(json.dumps(result, indent=2))
+                print(json.dumps(encode_base64_result(result), indent=2))
         else:
             print(f"Error: {result['error']}")
             sys.exit(1)
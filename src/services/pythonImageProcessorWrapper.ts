@@ -1,5 +1,9 @@
 import { spawn } from 'child_process';
+import os from 'os';
 import path from 'path';
+import { DEFAULT_REQUEST_TIMEOUT_MS, PythonWorkerPool } from './pythonWorkerPool';
+import { readMappedSections, removeSharedFiles, sharedTempPath } from './sharedMemory';
+import { TextBlock } from '../types';
 
 export interface CropCoordinates {
   left: number;
@@ -8,14 +12,137 @@ export interface CropCoordinates {
   height: number;
 }
 
+export interface ProcessingOptions {
+  coordinates?: CropCoordinates;
+  // Locate the box score table from its ruled lines instead of the fixed 4K coordinates (when none are given);
+  // the detected rectangle is cached per source and resolution
+  auto_detect?: boolean;
+  // Source fingerprint (user or device) keying that layout cache
+  source?: string;
+  denoise?: boolean;
+  chain?: string;
+  // Output codec profile: standard | fast | small | lossless
+  codec?: string;
+  // Speed/accuracy trade-off (resolution, versions, deskew/denoise, codec); explicit options still win
+  processing_profile?: 'fast' | 'balanced' | 'max_accuracy';
+  // Decode straight to grayscale / at 1/N resolution (1, 2, 4, 8); named like the Python kwargs
+  luminance_decode?: boolean;
+  decode_scale?: number;
+  // Serve the cached result of a recent near-duplicate screenshot instead of reprocessing
+  skip_duplicates?: boolean;
+  // Score image quality first and build only the versions it calls for (multiple_versions, preprocess_binary_ocr)
+  triage?: boolean;
+  // table_grid: cells to return, names for the detected columns, and PNG cell crops from the binary or gray image
+  rows?: number[];
+  columns?: string[];
+  column_names?: string[];
+  crops?: boolean;
+  cell_image?: 'binary' | 'gray';
+  // recognize_digits: cells below this confidence are returned for cloud OCR
+  min_confidence?: number;
+  // ocr_montage: pack table cells or whole columns, or these named source-pixel regions instead
+  unit?: 'cell' | 'column';
+  regions?: Record<string, CropCoordinates>;
+  max_width?: number;
+  gutter?: number;
+  // video_frames: distinct box score frames to stop after, and frames per second examined
+  max_frames?: number;
+  sample_fps?: number;
+}
+
+export interface CellBox {
+  left: number;
+  top: number;
+  width: number;
+  height: number;
+}
+
+export interface TableGrid {
+  region: CellBox;
+  rows: CellBox[];
+  columns: Array<CellBox & { name: string }>;
+  // Row index -> column name -> box, in source image pixels
+  cells: Record<string, Record<string, CellBox>>;
+  method: { rows: 'rules' | 'projection'; columns: 'rules' | 'projection'; labels: 'given' | 'reference' | 'index' };
+}
+
+export interface CellReading {
+  text: string;
+  // An integer, [made, attempted] for shooting splits, or null when unreadable
+  value: number | [number, number] | null;
+  confidence: number;
+}
+
+export interface VideoFrame {
+  index: number;
+  // Seconds from the start of the clip
+  time: number;
+  sharpness: number;
+  // Detected box score region, in frame pixels
+  region: CellBox;
+}
+
+export interface MontageLayout {
+  width: number;
+  height: number;
+  // Crop name -> its box in the montage, and the same crop in source image pixels
+  offsets: Record<string, CellBox & { source: CellBox }>;
+}
+
+/**
+ * Split text blocks recognized on an OCR montage by the crop holding each
+ * block's centre, with vertices moved back to source image pixels; blocks
+ * centred in a gutter are returned as unassigned
+ */
+export function demultiplexTextBlocks(
+  blocks: TextBlock[],
+  layout: MontageLayout
+): { crops: Record<string, TextBlock[]>; unassigned: TextBlock[] } {
+  const crops: Record<string, TextBlock[]> = {};
+  for (const name of Object.keys(layout.offsets)) {
+    crops[name] = [];
+  }
+  const unassigned: TextBlock[] = [];
+  for (const block of blocks) {
+    const vertices = block.boundingPoly.vertices;
+    const xs = vertices.map(vertex => vertex.x || 0);
+    const ys = vertices.map(vertex => vertex.y || 0);
+    const cx = (Math.min(...xs) + Math.max(...xs)) / 2;
+    const cy = (Math.min(...ys) + Math.max(...ys)) / 2;
+    const match = Object.entries(layout.offsets).find(([, box]) =>
+      box !== undefined && cx >= box.left && cx < box.left + box.width && cy >= box.top && cy < box.top + box.height
+    );
+    if (match === undefined) {
+      unassigned.push(block);
+      continue;
+    }
+
+    const [name, box] = match;
+    const sx = box.source.width / box.width;
+    const sy = box.source.height / box.height;
+    (crops[name] ??= []).push({
+      ...block,
+      boundingPoly: {
+        vertices: vertices.map(vertex => ({
+          x: box.source.left + Math.round(Math.min(Math.max((vertex.x || 0) - box.left, 0), box.width) * sx),
+          y: box.source.top + Math.round(Math.min(Math.max((vertex.y || 0) - box.top, 0), box.height) * sy),
+        })),
+      },
+    });
+  }
+  return { crops, unassigned };
+}
+
 export interface ImageProcessingResult {
   success: boolean;
-  data?: string | Record<string, string>;
+  // Images arrive as raw Buffers from the worker pool and as base64 strings from one-off processes
+  data?: string | Buffer | Record<string, string | Buffer>;
   error?: string;
 }
 
 export class PythonImageProcessorWrapper {
   private pythonScriptPath: string;
+  private workerPool: PythonWorkerPool | null = null;
 
   constructor() {
     // Path to the Python script relative to the project root
@@ -28,29 +155,141 @@ export class PythonImageProcessorWrapper {
   private pythonCommand: string;
 
   /**
-   * Execute Python script with given parameters
+   * Warm `--serve` workers, created on first use so the environment (.env) is loaded by then.
+   * Opt-in: PYTHON_WORKER_POOL_SIZE=N keeps N of them (up to the core count); unset or 0 runs
+   * one process per operation. PYTHON_WORKER_TIMEOUT_MS bounds each pooled request.
+   */
+  private get pool(): PythonWorkerPool {
+    if (this.workerPool === null) {
+      const poolSize = Math.min(parseInt(process.env.PYTHON_WORKER_POOL_SIZE || '0', 10) || 0, os.cpus().length);
+      const timeoutMs = parseInt(process.env.PYTHON_WORKER_TIMEOUT_MS || '', 10) || DEFAULT_REQUEST_TIMEOUT_MS;
+      this.workerPool = new PythonWorkerPool(this.pythonCommand, this.pythonScriptPath, poolSize, timeoutMs);
+    }
+    return this.workerPool;
+  }
+
+  /**
+   * Stop the warm workers (server shutdown)
+   */
+  close(): void {
+    this.workerPool?.close();
+  }
+
+  /**
+   * Normalize an image payload from either output format to a Buffer
+   */
+  private toBuffer(data: unknown): Buffer {
+    return Buffer.isBuffer(data) ? data : Buffer.from(data as string, 'base64');
+  }
+
+  /**
+   * Execute an operation on a warm worker, or a fresh Python process if the pool is disabled
    */
   private async executePythonScript(
     operation: string,
     imageBuffer: Buffer,
-    additionalArgs: string[] = []
+    options: ProcessingOptions = {}
   ): Promise<ImageProcessingResult> {
+    if (this.pool.enabled) {
+      return this.pool.run({ operation, params: { ...options }, imageBuffer });
+    }
+    return this.spawnPythonScript(operation, imageBuffer, options);
+  }
+
+  /**
+   * Execute Python script with given parameters in a one-off process
+   */
+  private async spawnPythonScript(
+    operation: string,
+    imageBuffer: Buffer,
+    options: ProcessingOptions
+  ): Promise<ImageProcessingResult> {
+    const additionalArgs: string[] = [];
+    if (options.coordinates) {
+      additionalArgs.push('--coordinates', JSON.stringify(options.coordinates));
+    }
+    if (options.auto_detect) {
+      additionalArgs.push('--auto-detect');
+    }
+    if (options.source) {
+      additionalArgs.push('--source', options.source);
+    }
+    if (options.denoise) {
+      additionalArgs.push('--denoise');
+    }
+    if (options.chain) {
+      additionalArgs.push('--chain', options.chain);
+    }
+    if (options.codec) {
+      additionalArgs.push('--codec', options.codec);
+    }
+    if (options.processing_profile) {
+      additionalArgs.push('--processing-profile', options.processing_profile);
+    }
+    if (options.luminance_decode) {
+      additionalArgs.push('--luminance-decode');
+    }
+    if (options.decode_scale) {
+      additionalArgs.push('--decode-scale', String(options.decode_scale));
+    }
+    if (options.skip_duplicates) {
+      additionalArgs.push('--skip-duplicates');
+    }
+    if (options.triage) {
+      additionalArgs.push('--triage');
+    }
+    if (options.rows) {
+      additionalArgs.push('--rows', options.rows.join(','));
+    }
+    if (options.columns) {
+      additionalArgs.push('--columns', options.columns.join(','));
+    }
+    if (options.column_names) {
+      additionalArgs.push('--column-names', options.column_names.join(','));
+    }
+    if (options.crops) {
+      additionalArgs.push('--crops');
+    }
+    if (options.cell_image) {
+      additionalArgs.push('--cell-image', options.cell_image);
+    }
+    if (options.min_confidence !== undefined) {
+      additionalArgs.push('--min-confidence', String(options.min_confidence));
+    }
+    if (options.unit) {
+      additionalArgs.push('--unit', options.unit);
+    }
+    if (options.regions) {
+      additionalArgs.push('--regions', JSON.stringify(options.regions));
+    }
+    if (options.max_width) {
+      additionalArgs.push('--max-width', String(options.max_width));
+    }
+    if (options.gutter !== undefined) {
+      additionalArgs.push('--gutter', String(options.gutter));
+    }
+    if (options.max_frames) {
+      additionalArgs.push('--max-frames', String(options.max_frames));
+    }
+    if (options.sample_fps) {
+      additionalArgs.push('--sample-fps', String(options.sample_fps));
+    }
+
     return new Promise((resolve, reject) => {
       try {
-        // Create a temporary file for the input image
+        // Hand the image over through shared memory (/dev/shm) under a unique name
         const fs = require('fs');
-        const os = require('os');
-        const tempInputPath = path.join(os.tmpdir(), `input_${Date.now()}.jpg`);
-        const tempOutputPath = path.join(os.tmpdir(), `output_${Date.now()}.jpg`);
+        const tempInputPath = sharedTempPath('scorecheck-input', '.jpg');
+        const tempOutputPath = sharedTempPath('scorecheck-output', '.bin');
 
-        // Write input image to temp file
         fs.writeFileSync(tempInputPath, imageBuffer);
 
-        // Prepare command arguments
+        // Python writes result images back to back into the output file and prints their offsets
         const args = [
           this.pythonScriptPath,
           '--operation', operation,
           '--input', tempInputPath,
+          '--output-format', 'mmap',
           '--output', tempOutputPath,
           ...additionalArgs
         ];
@@ -70,33 +309,22 @@ export class PythonImageProcessorWrapper {
         });
 
         pythonProcess.on('close', (code) => {
-          // Clean up temp files
           try {
-            if (fs.existsSync(tempInputPath)) {
-              fs.unlinkSync(tempInputPath);
-            }
-            if (fs.existsSync(tempOutputPath)) {
-              fs.unlinkSync(tempOutputPath);
-            }
-          } catch (cleanupError) {
-            console.warn('Warning: Could not clean up temp files:', cleanupError);
-          }
-
-          if (code === 0) {
-            try {
-              // Try to parse the output as JSON
-              const result = JSON.parse(stdout.trim());
-              resolve(result);
-            } catch (parseError) {
-              // If not JSON, assume it's a success message
-              resolve({ success: true, data: stdout.trim() });
+            if (code === 0) {
+              resolve(this.readMappedResult(JSON.parse(stdout.trim()), tempOutputPath));
+            } else {
+              reject(new Error(`Python script failed with code ${code}: ${stderr || stdout}`));
             }
-          } else {
-            reject(new Error(`Python script failed with code ${code}: ${stderr}`));
+          } catch (parseError) {
+            reject(new Error(`Invalid output from Python script: ${stdout.trim()}`));
+          } finally {
+            removeSharedFiles(tempInputPath, tempOutputPath);
           }
         });
 
         pythonProcess.on('error', (error) => {
+          // close may never fire when the interpreter fails to start
+          removeSharedFiles(tempInputPath, tempOutputPath);
           reject(new Error(`Failed to start Python process: ${error.message}`));
         });
 
@@ -106,20 +334,31 @@ export class PythonImageProcessorWrapper {
     });
   }
 
+  /**
+   * Rebuild a result from the mmap output header and the sections it points at
+   */
+  private readMappedResult(header: any, outputPath: string): ImageProcessingResult {
+    const { layout, sections = [], output, ...result } = header;
+    if (layout === 'single') {
+      result.data = readMappedSections(outputPath, sections).data;
+    } else if (layout === 'map') {
+      result.data = readMappedSections(outputPath, sections);
+    }
+    return result;
+  }
+
   /**
    * Crop an image to the specified coordinates
    */
   async cropImage(imageBuffer: Buffer, coordinates: CropCoordinates): Promise<Buffer> {
     try {
-      const coordinatesJson = JSON.stringify(coordinates);
-      const result = await this.executePythonScript('crop', imageBuffer, ['--coordinates', coordinatesJson]);
+      const result = await this.executePythonScript('crop', imageBuffer, { coordinates });
       
       if (!result.success || !result.data) {
         throw new Error(result.error || 'Failed to crop image');
       }
 
-      // Decode base64 data back to buffer
-      return Buffer.from(result.data as string, 'base64');
+      return this.toBuffer(result.data);
     } catch (error) {
       console.error('Error cropping image with Python:', error);
       throw new Error('Failed to crop image with Python processor');
@@ -127,23 +366,49 @@ export class PythonImageProcessorWrapper {
   }
 
   /**
-   * Crop image to the specific NBA 2K25 box score coordinates
+   * Crop image to the specific NBA 2K25 box score coordinates, or with auto_detect
+   * to the table found in the image (cached per source and resolution)
    */
-  async cropBoxScore(imageBuffer: Buffer): Promise<Buffer> {
+  async cropBoxScore(
+    imageBuffer: Buffer,
+    options: Pick<ProcessingOptions, 'auto_detect' | 'source'> = {}
+  ): Promise<Buffer> {
     try {
-      const result = await this.executePythonScript('crop_box_score', imageBuffer);
+      const result = await this.executePythonScript('crop_box_score', imageBuffer, options);
       
       if (!result.success || !result.data) {
         throw new Error(result.error || 'Failed to crop box score');
       }
 
-      return Buffer.from(result.data as string, 'base64');
+      return this.toBuffer(result.data);
     } catch (error) {
       console.error('Error cropping box score with Python:', error);
       throw new Error('Failed to crop box score with Python processor');
     }
   }
 
+  /**
+   * Box score rectangle found in the image, in source pixels, and where it came from:
+   * 'detected', 'cache' (same source and resolution seen before) or 'scaled_default'
+   */
+  async detectBoxScoreRegion(
+    imageBuffer: Buffer,
+    options: Pick<ProcessingOptions, 'source'> = {}
+  ): Promise<{ region: CropCoordinates; layoutSource: 'detected' | 'cache' | 'scaled_default' }> {
+    try {
+      const result: any = await this.executePythonScript('detect_layout', imageBuffer, options);
+
+      if (!result.success || !result.data) {
+        throw new Error(result.error || 'Failed to detect box score region');
+      }
+
+      return { region: result.data, layoutSource: result.layout_source };
+    } catch (error) {
+      console.error('Error detecting box score region with Python:', error);
+      throw new Error('Failed to detect box score region with Python processor');
+    }
+  }
+
   /**
    * Enhanced preprocessing for OCR optimization
    */
@@ -155,7 +420,7 @@ export class PythonImageProcessorWrapper {
         throw new Error(result.error || 'Failed to preprocess image for OCR');
       }
 
-      return Buffer.from(result.data as string, 'base64');
+      return this.toBuffer(result.data);
     } catch (error) {
       console.error('Error preprocessing image for OCR with Python:', error);
       throw new Error('Failed to preprocess image for OCR with Python processor');
@@ -173,7 +438,7 @@ export class PythonImageProcessorWrapper {
         throw new Error(result.error || 'Failed to preprocess image with alternative method');
       }
 
-      return Buffer.from(result.data as string, 'base64');
+      return this.toBuffer(result.data);
     } catch (error) {
       console.error('Error with alternative preprocessing using Python:', error);
       throw new Error('Failed to preprocess image with alternative method using Python processor');
@@ -195,16 +460,16 @@ export class PythonImageProcessorWrapper {
         throw new Error(result.error || 'Failed to create multiple versions');
       }
 
-      const data = result.data as Record<string, string>;
+      const data = result.data as Record<string, string | Buffer>;
       
       if (!data.standard || !data.enhanced || !data.binary) {
         throw new Error('Missing required image data from Python processor');
       }
       
       return {
-        standard: Buffer.from(data.standard, 'base64'),
-        enhanced: Buffer.from(data.enhanced, 'base64'),
-        binary: Buffer.from(data.binary, 'base64'),
+        standard: this.toBuffer(data.standard),
+        enhanced: this.toBuffer(data.enhanced),
+        binary: this.toBuffer(data.binary),
       };
     } catch (error) {
       console.error('Error creating multiple versions with Python:', error);
@@ -212,6 +477,96 @@ export class PythonImageProcessorWrapper {
     }
   }
 
+  /**
+   * Stream an operation's outputs to onOutput as each one is encoded, so OCR can start on
+   * the first while Python prepares the rest. Resolves with the remaining result fields.
+   * Without the worker pool the outputs are delivered once the process finishes.
+   */
+  async streamOutputs(
+    operation: string,
+    imageBuffer: Buffer,
+    onOutput: (name: string, data: Buffer) => void,
+    options: ProcessingOptions = {}
+  ): Promise<ImageProcessingResult> {
+    if (this.pool.enabled) {
+      return this.pool.run({
+        operation,
+        params: { ...options },
+        imageBuffer,
+        onRecord: (record) => {
+          if (Buffer.isBuffer(record.data)) {
+            onOutput(record.name, record.data);
+          }
+        },
+      });
+    }
+
+    const { data, ...result } = await this.spawnPythonScript(operation, imageBuffer, options);
+    if (Buffer.isBuffer(data) || typeof data === 'string') {
+      onOutput('data', this.toBuffer(data));
+    } else if (data) {
+      for (const [name, output] of Object.entries(data)) {
+        onOutput(name, this.toBuffer(output));
+      }
+    }
+    return result;
+  }
+
+  /**
+   * Perceptual fingerprint of the box score region and the closest recently seen
+   * screenshot, if it is a near-duplicate (recompressed, rescaled, cursor moved)
+   */
+  async findNearDuplicate(imageBuffer: Buffer): Promise<{
+    digest: string;
+    fingerprint: string;
+    duplicateOf: string | null;
+    distance: number | null;
+  }> {
+    try {
+      const result: any = await this.executePythonScript('fingerprint', imageBuffer);
+
+      if (!result.success || !result.data) {
+        throw new Error(result.error || 'Failed to fingerprint image');
+      }
+
+      return {
+        digest: result.data.digest,
+        fingerprint: result.data.fingerprint,
+        duplicateOf: result.duplicate_of ?? null,
+        distance: result.distance ?? null,
+      };
+    } catch (error) {
+      console.error('Error fingerprinting image with Python:', error);
+      throw new Error('Failed to fingerprint image with Python processor');
+    }
+  }
+
+  /**
+   * Quality scores (contrast, sharpness, noise, lighting, skew) and the minimal
+   * set of preprocessing variants worth running for the image
+   */
+  async assessImageQuality(imageBuffer: Buffer): Promise<{
+    scores: Record<string, number>;
+    issues: string[];
+    variants: string[];
+    versions: string[];
+    denoise: boolean;
+    deskew: boolean;
+  }> {
+    try {
+      const result: any = await this.executePythonScript('triage', imageBuffer);
+
+      if (!result.success || !result.data) {
+        throw new Error(result.error || 'Failed to triage image');
+      }
+
+      return result.data;
+    } catch (error) {
+      console.error('Error triaging image with Python:', error);
+      throw new Error('Failed to triage image with Python processor');
+    }
+  }
+
   /**
    * Get image dimensions
    */
@@ -234,6 +589,27 @@ export class PythonImageProcessorWrapper {
     }
   }
 
+  /**
+   * Format, stored size and EXIF orientation (1-8; 5-8 display transposed),
+   * read from the JPEG/PNG header without decoding: cheap enough to validate every upload
+   */
+  async readImageMetadata(
+    imageBuffer: Buffer
+  ): Promise<{ format: string; width: number; height: number; orientation: number }> {
+    try {
+      const result: any = await this.executePythonScript('metadata', imageBuffer);
+
+      if (!result.success || !result.data) {
+        throw new Error(result.error || 'Failed to read image metadata');
+      }
+
+      return result.data;
+    } catch (error) {
+      console.error('Error reading image metadata with Python:', error);
+      throw new Error('Failed to read image metadata with Python processor');
+    }
+  }
+
   /**
    * Test all operations with the hardcoded image
    */
@@ -262,24 +638,23 @@ export class PythonImageProcessorWrapper {
     threshold: Buffer;
   }> {
     try {
-      const additionalArgs = denoise ? ['--denoise'] : [];
-      const result = await this.executePythonScript('preprocess_binary_ocr', imageBuffer, additionalArgs);
+      const result = await this.executePythonScript('preprocess_binary_ocr', imageBuffer, { denoise });
       
       if (!result.success || !result.data) {
         throw new Error(result.error || 'Failed to preprocess with binary OCR method');
       }
 
-      const data = result.data as Record<string, string>;
+      const data = result.data as Record<string, string | Buffer>;
       
       if (!data.binary_ocr || !data.deskewed || !data.enhanced_grayscale || !data.threshold) {
         throw new Error('Missing required preprocessing data from Python processor');
       }
       
       return {
-        binary_ocr: Buffer.from(data.binary_ocr, 'base64'),
-        deskewed: Buffer.from(data.deskewed, 'base64'),
-        enhanced_grayscale: Buffer.from(data.enhanced_grayscale, 'base64'),
-        threshold: Buffer.from(data.threshold, 'base64'),
+        binary_ocr: this.toBuffer(data.binary_ocr),
+        deskewed: this.toBuffer(data.deskewed),
+        enhanced_grayscale: this.toBuffer(data.enhanced_grayscale),
+        threshold: this.toBuffer(data.threshold),
       };
     } catch (error) {
       console.error('Error with binary OCR preprocessing:', error);
@@ -287,6 +662,178 @@ export class PythonImageProcessorWrapper {
     }
   }
 
+  /**
+   * Crop to the box score and run binary OCR preparation on the region in one pass,
+   * without re-encoding the crop in between
+   */
+  async cropAndPreprocessBinaryOCR(
+    imageBuffer: Buffer,
+    denoise: boolean = false,
+    coordinates?: CropCoordinates,
+    layout: Pick<ProcessingOptions, 'auto_detect' | 'source'> = {}
+  ): Promise<{
+    binary_ocr: Buffer;
+    deskewed: Buffer;
+    enhanced_grayscale: Buffer;
+    threshold: Buffer;
+  }> {
+    try {
+      const options: ProcessingOptions = { ...layout, chain: 'preprocess_binary_ocr', denoise };
+      if (coordinates) {
+        options.coordinates = coordinates;
+      }
+      const result = await this.executePythonScript('crop_preprocess', imageBuffer, options);
+
+      if (!result.success || !result.data) {
+        throw new Error(result.error || 'Failed to crop and preprocess image');
+      }
+
+      const data = result.data as Record<string, string | Buffer>;
+
+      if (!data.binary_ocr || !data.deskewed || !data.enhanced_grayscale || !data.threshold) {
+        throw new Error('Missing required preprocessing data from Python processor');
+      }
+
+      return {
+        binary_ocr: this.toBuffer(data.binary_ocr),
+        deskewed: this.toBuffer(data.deskewed),
+        enhanced_grayscale: this.toBuffer(data.enhanced_grayscale),
+        threshold: this.toBuffer(data.threshold),
+      };
+    } catch (error) {
+      console.error('Error with fused crop preprocessing:', error);
+      throw new Error('Failed to crop and preprocess image with Python processor');
+    }
+  }
+
+  /**
+   * Row and stat-column grid of the box score with each cell's bounding box,
+   * keyed by row index and column name (points, rebounds, ... or c<index>)
+   */
+  async segmentTableGrid(
+    imageBuffer: Buffer,
+    options: Pick<ProcessingOptions, 'coordinates' | 'auto_detect' | 'source' | 'rows' | 'columns' | 'column_names'> = {}
+  ): Promise<TableGrid> {
+    try {
+      const result = await this.executePythonScript('table_grid', imageBuffer, options);
+
+      if (!result.success || !result.data) {
+        throw new Error(result.error || 'Failed to segment table grid');
+      }
+
+      return result.data as unknown as TableGrid;
+    } catch (error) {
+      console.error('Error segmenting table grid with Python:', error);
+      throw new Error('Failed to segment table grid with Python processor');
+    }
+  }
+
+  /**
+   * Cropped cell images named <row>_<column>, e.g. only the turnovers column
+   * ({ columns: ['turnovers'] }) instead of a whole threshold frame
+   */
+  async cropTableCells(
+    imageBuffer: Buffer,
+    options: Pick<ProcessingOptions, 'coordinates' | 'auto_detect' | 'source' | 'rows' | 'columns' | 'column_names' |
+      'cell_image'> = {}
+  ): Promise<{ grid: TableGrid; cells: Record<string, Buffer> }> {
+    try {
+      const result: any = await this.executePythonScript('table_grid', imageBuffer, { ...options, crops: true });
+
+      if (!result.success || !result.data) {
+        throw new Error(result.error || 'Failed to crop table cells');
+      }
+
+      const data = result.data as Record<string, string | Buffer>;
+      return {
+        grid: result.grid,
+        cells: Object.fromEntries(Object.entries(data).map(([name, image]) => [name, this.toBuffer(image)])),
+      };
+    } catch (error) {
+      console.error('Error cropping table cells with Python:', error);
+      throw new Error('Failed to crop table cells with Python processor');
+    }
+  }
+
+  /**
+   * Read the numeric stat cells locally; only the cells listed in `fallback`
+   * (below min_confidence) need a cloud OCR pass
+   */
+  async recognizeDigits(
+    imageBuffer: Buffer,
+    options: Pick<ProcessingOptions, 'coordinates' | 'auto_detect' | 'source' | 'rows' | 'columns' | 'column_names' |
+      'min_confidence'> = {}
+  ): Promise<{
+    values: Record<string, Record<string, CellReading>>;
+    fallback: Array<CellBox & { row: number; column: string }>;
+  }> {
+    try {
+      const result: any = await this.executePythonScript('recognize_digits', imageBuffer, options);
+
+      if (!result.success || !result.data) {
+        throw new Error(result.error || 'Failed to recognize digits');
+      }
+
+      return { values: result.data, fallback: result.fallback || [] };
+    } catch (error) {
+      console.error('Error recognizing digits with Python:', error);
+      throw new Error('Failed to recognize digits with Python processor');
+    }
+  }
+
+  /**
+   * One PNG packing the selected table cells (or columns, or regions) so a
+   * single OCR call reads them all; pass its text blocks and the layout to
+   * demultiplexTextBlocks to get them back per crop in source pixels
+   */
+  async buildOcrMontage(
+    imageBuffer: Buffer,
+    options: Pick<ProcessingOptions, 'coordinates' | 'auto_detect' | 'source' | 'rows' | 'columns' | 'column_names' |
+      'cell_image' | 'unit' | 'regions' | 'max_width' | 'gutter'> = {}
+  ): Promise<{ image: Buffer; layout: MontageLayout; empty: string[] }> {
+    try {
+      const result: any = await this.executePythonScript('ocr_montage', imageBuffer, options);
+
+      if (!result.success || !result.data) {
+        throw new Error(result.error || 'Failed to build OCR montage');
+      }
+
+      return { image: this.toBuffer(result.data), layout: result.montage, empty: result.empty || [] };
+    } catch (error) {
+      console.error('Error building OCR montage with Python:', error);
+      throw new Error('Failed to build OCR montage with Python processor');
+    }
+  }
+
+  /**
+   * The sharpest still box score frame(s) of an MP4/MOV screen recording, as JPEG
+   * named frame_<index>; with a chain, that chain's outputs for each frame's box
+   * score region instead (frame_<index>_<version>). Use streamOutputs('video_frames')
+   * to start OCR on the first frame while the rest of the clip is scanned.
+   */
+  async extractVideoFrames(
+    videoBuffer: Buffer,
+    options: Pick<ProcessingOptions, 'max_frames' | 'sample_fps' | 'chain' | 'denoise'> = {}
+  ): Promise<{ images: Record<string, Buffer>; frames: VideoFrame[]; stoppedEarly: boolean }> {
+    try {
+      const result: any = await this.executePythonScript('video_frames', videoBuffer, options);
+
+      if (!result.success || !result.data) {
+        throw new Error(result.error || 'Failed to extract video frames');
+      }
+
+      const data = result.data as Record<string, string | Buffer>;
+      return {
+        images: Object.fromEntries(Object.entries(data).map(([name, image]) => [name, this.toBuffer(image)])),
+        frames: result.frames || [],
+        stoppedEarly: Boolean(result.video && result.video.stopped_early),
+      };
+    } catch (error) {
+      console.error('Error extracting video frames with Python:', error);
+      throw new Error('Failed to extract video frames with Python processor');
+    }
+  }
+
   /**
    * Check if Python is available and the script can be executed
    */
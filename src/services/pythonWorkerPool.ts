@@ -0,0 +1,254 @@
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+
+const FRAME_HEADER_BYTES = 4;
+
+// A request a worker has not answered in this long is taken to be hung; the worker is replaced
+export const DEFAULT_REQUEST_TIMEOUT_MS = 60000;
+
+/**
+ * Length-prefixed frames: a 4-byte big-endian length before each payload
+ */
+export function encodeFrames(...payloads: Buffer[]): Buffer {
+  return Buffer.concat(payloads.flatMap((payload) => {
+    const length = Buffer.alloc(FRAME_HEADER_BYTES);
+    length.writeUInt32BE(payload.length, 0);
+    return [length, payload];
+  }));
+}
+
+/**
+ * The first complete frame in buffer and the bytes after it, or null until all of it has arrived
+ */
+export function takeFrame(buffer: Buffer): { frame: Buffer; rest: Buffer } | null {
+  if (buffer.length < FRAME_HEADER_BYTES) {
+    return null;
+  }
+  const end = FRAME_HEADER_BYTES + buffer.readUInt32BE(0);
+  if (buffer.length < end) {
+    return null;
+  }
+  return { frame: buffer.subarray(FRAME_HEADER_BYTES, end), rest: buffer.subarray(end) };
+}
+
+export interface WorkerRequest {
+  operation: string;
+  params: Record<string, unknown>;
+  imageBuffer: Buffer;
+  // Receive each output as soon as it is encoded ('stream' format); run() then resolves with the final record
+  onRecord?: (record: any) => void;
+}
+
+interface PendingRequest extends WorkerRequest {
+  id: number;
+  resolve: (result: any) => void;
+  reject: (error: Error) => void;
+}
+
+interface Worker {
+  process: ChildProcessWithoutNullStreams;
+  buffer: Buffer;
+  current: PendingRequest | null;
+  header: any | null;
+  sections: Buffer[];
+  timer: NodeJS.Timeout | null;
+}
+
+interface SectionHeader {
+  name: string;
+  length: number;
+}
+
+/**
+ * Pool of long-lived `pythonImageProcessor.py --serve` processes.
+ * Requests and responses are length-prefixed frames, so the interpreter,
+ * cv2/numpy/PIL imports and processor setup are paid once per worker
+ * instead of once per operation. Responses use the binary output format:
+ * a JSON header frame followed by one raw frame per result image.
+ * Streaming requests get one such record per output, then a `done` record.
+ * A worker that has not finished a request within timeoutMs is killed and
+ * replaced; close() (also run on process exit) stops every worker.
+ */
+export class PythonWorkerPool {
+  private workers: Worker[] = [];
+  private queue: PendingRequest[] = [];
+  private nextId = 1;
+  private readonly closeOnExit = () => this.close();
+
+  constructor(
+    private pythonCommand: string,
+    private scriptPath: string,
+    private size: number,
+    private timeoutMs: number = DEFAULT_REQUEST_TIMEOUT_MS
+  ) {}
+
+  get enabled(): boolean {
+    return this.size > 0;
+  }
+
+  run(request: WorkerRequest): Promise<any> {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ ...request, id: this.nextId++, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  /**
+   * Kill every worker and reject queued and running requests
+   */
+  close(): void {
+    process.removeListener('exit', this.closeOnExit);
+    const queued = this.queue;
+    this.queue = [];
+    for (const request of queued) {
+      request.reject(new Error('Python worker pool closed'));
+    }
+    for (const worker of [...this.workers]) {
+      this.discardWorker(worker, 'Python worker pool closed');
+    }
+  }
+
+  private dispatch(): void {
+    while (this.queue.length > 0) {
+      let worker = this.workers.find((w) => w.current === null);
+      if (!worker && this.workers.length < this.size) {
+        worker = this.startWorker();
+      }
+      if (!worker) {
+        return;
+      }
+
+      const request = this.queue.shift()!;
+      worker.current = request;
+      const busy = worker;
+      worker.timer = setTimeout(
+        () => this.discardWorker(busy, `Python worker timed out after ${this.timeoutMs} ms`),
+        this.timeoutMs
+      );
+
+      const header = Buffer.from(JSON.stringify({
+        id: request.id,
+        operation: request.operation,
+        params: request.params,
+        output_format: request.onRecord ? 'stream' : 'binary',
+      }));
+      worker.process.stdin.write(encodeFrames(header, request.imageBuffer));
+    }
+  }
+
+  private startWorker(): Worker {
+    const child = spawn(this.pythonCommand, [this.scriptPath, '--serve']);
+    const worker: Worker = {
+      process: child, buffer: Buffer.alloc(0), current: null, header: null, sections: [], timer: null,
+    };
+    if (this.workers.length === 0) {
+      // Children would otherwise outlive a server stopped by SIGTERM/SIGINT
+      process.removeListener('exit', this.closeOnExit);
+      process.once('exit', this.closeOnExit);
+    }
+
+    child.stdout.on('data', (data: Buffer) => {
+      worker.buffer = Buffer.concat([worker.buffer, data]);
+      this.drainResponses(worker);
+    });
+
+    child.stderr.on('data', (data: Buffer) => {
+      console.warn(`Python worker ${child.pid}: ${data.toString().trim()}`);
+    });
+
+    const fail = (reason: string) => {
+      this.workers = this.workers.filter((w) => w !== worker);
+      this.clearTimer(worker);
+      if (worker.current) {
+        worker.current.reject(new Error(reason));
+        worker.current = null;
+      }
+      this.dispatch();
+    };
+
+    child.on('exit', (code) => fail(`Python worker exited with code ${code}`));
+    child.on('error', (error) => fail(`Failed to start Python worker: ${error.message}`));
+
+    this.workers.push(worker);
+    return worker;
+  }
+
+  private drainResponses(worker: Worker): void {
+    for (let next = takeFrame(worker.buffer); next !== null; next = takeFrame(worker.buffer)) {
+      const payload = next.frame;
+      worker.buffer = next.rest;
+
+      if (worker.header === null) {
+        let header: any;
+        try {
+          header = JSON.parse(payload.toString('utf-8'));
+        } catch (error) {
+          header = null;
+        }
+        // Past a bad or unexpected header the frame boundaries can't be trusted, so the worker is replaced
+        if (!header || typeof header !== 'object' || !worker.current || header.id !== worker.current.id
+            || (header.sections !== undefined && !Array.isArray(header.sections))) {
+          this.discardWorker(worker, 'Invalid response header from Python worker');
+          return;
+        }
+        worker.header = header;
+      } else {
+        worker.sections.push(payload);
+      }
+
+      if (worker.sections.length >= (worker.header.sections || []).length) {
+        const record = this.assembleResult(worker.header, worker.sections);
+        if (worker.current?.onRecord && !worker.header.done) {
+          worker.header = null;
+          worker.sections = [];
+          worker.current.onRecord(record);
+        } else {
+          this.complete(worker, record);
+        }
+      }
+    }
+  }
+
+  private assembleResult(header: any, sections: Buffer[]): any {
+    const { layout, sections: entries = [], id, done, ...result } = header;
+    if (layout === 'single') {
+      result.data = sections[0];
+    } else if (layout === 'map') {
+      result.data = Object.fromEntries(
+        (entries as SectionHeader[]).map((entry, index) => [entry.name, sections[index]])
+      );
+    }
+    return result;
+  }
+
+  private discardWorker(worker: Worker, reason: string): void {
+    this.workers = this.workers.filter((w) => w !== worker);
+    worker.buffer = Buffer.alloc(0);
+    worker.process.stdout.removeAllListeners('data');
+    worker.process.kill('SIGKILL');
+    // Rejects the request and dispatches the queue to a fresh worker
+    this.complete(worker, new Error(reason));
+  }
+
+  private complete(worker: Worker, outcome: any): void {
+    const request = worker.current;
+    this.clearTimer(worker);
+    worker.current = null;
+    worker.header = null;
+    worker.sections = [];
+    if (request) {
+      if (outcome instanceof Error) {
+        request.reject(outcome);
+      } else {
+        request.resolve(outcome);
+      }
+    }
+    this.dispatch();
+  }
+
+  private clearTimer(worker: Worker): void {
+    if (worker.timer) {
+      clearTimeout(worker.timer);
+      worker.timer = null;
+    }
+  }
+}
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Image-quality triage for ScoreCheck image processing
+Scores a capture with a few cheap statistics and picks the preprocessing
+variants worth running, so clean captures take a single fast path
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+# Thresholds calibrated on synthetic box score frames (scripts/benchmark_suite.py)
+# degraded by blur, noise, exposure, lighting gradients and rotation; clean 4K
+# and 1080p captures score sharpness ~0.8-1.5, noise 0, contrast ~120.
+MIN_CONTRAST = 80        # p98 - p2 grey levels; dark, washed-out and low-contrast frames fall to ~45-60
+MIN_SHARPNESS = 0.3      # Laplacian variance / intensity variance; a 5x5 Gaussian blur drops it to ~0.08
+MAX_NOISE = 2.0          # robust sigma of the residual noise; sigma 4 Gaussian noise measures ~2.7
+MAX_ILLUMINATION = 0.3   # spread of 4x4 block medians relative to contrast; gradients and glare reach 0.3-0.55
+MAX_SKEW = 0.5           # degrees; below this deskewing changes little
+
+# Second-difference kernel whose response on flat areas is pure noise (Immerkaer)
+NOISE_KERNEL = ((1, -2, 1), (-2, 4, -2), (1, -2, 1))
+
+# Variants of python_ocr_wrapper.py and of the multiple_versions operation, in their output order
+WRAPPER_VARIANTS = ('preprocessed', 'threshold', 'enhanced', 'multilevel')
+VERSIONS = ('standard', 'enhanced', 'binary')
+
+def estimate_skew_angle(gray: np.ndarray, max_dimension: int = 1280) -> float:
+    """
+    Median angle of near-horizontal Hough lines, estimated on a copy
+    downscaled to at most max_dimension pixels on its long side
+    """
+    h, w = gray.shape[:2]
+    scale = min(1.0, max_dimension / float(max(h, w)))
+    if scale < 1.0:
+        gray = cv2.resize(gray, (max(1, int(w * scale)), max(1, int(h * scale))),
+                          interpolation=cv2.INTER_AREA)
+    sw = gray.shape[1]
+
+    # Hough parameters scale with the working resolution; angles do not
+    edges = cv2.Canny(gray, 50, 150, apertureSize=3)
+    lines = cv2.HoughLinesP(edges, 1, np.pi / 180, threshold=max(50, int(200 * scale)),
+                            minLineLength=max(int(300 * scale), sw // 5),
+                            maxLineGap=max(3, int(15 * scale)))
+
+    angle = 0.0
+    if lines is not None and len(lines) > 0:
+        angles = []
+        for l in lines[:800]:
+            x1, y1, x2, y2 = l[0]
+            theta = np.degrees(np.arctan2((y2 - y1), (x2 - x1)))
+            if abs(theta) <= 15.0:  # keep near-horizontal
+                angles.append(theta)
+        if angles:
+            angle = float(np.median(angles))
+    return angle
+
+def measure_quality(gray: np.ndarray, working_width: int = 960, patch_size: int = 720,
+                    skew_max_dimension: int = 1280, skew: Optional[float] = None) -> Dict[str, float]:
+    """
+    Exposure and lighting from a downscaled copy; sharpness and noise from a
+    full-resolution centre patch, where downscaling would hide both.
+    An angle the caller already estimated on the same frame can be passed as skew.
+    """
+    h, w = gray.shape[:2]
+    scale = min(1.0, working_width / float(w))
+    small = cv2.resize(gray, (max(1, int(w * scale)), max(1, int(h * scale))),
+                       interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+    low, high = np.percentile(small, [2, 98])
+    contrast = float(high - low)
+
+    # Background level per block: medians ignore the text, so only lighting moves them
+    sh, sw = small.shape[:2]
+    medians = [np.median(small[row * sh // 4:(row + 1) * sh // 4, column * sw // 4:(column + 1) * sw // 4])
+               for row in range(4) for column in range(4)]
+
+    ph, pw = min(h, patch_size), min(w, patch_size * 16 // 9)
+    top, left = (h - ph) // 2, (w - pw) // 2
+    patch = gray[top:top + ph, left:left + pw]
+    laplacian_variance = float(cv2.Laplacian(patch, cv2.CV_32F).var())
+    residual = cv2.filter2D(patch.astype(np.float32), -1, np.array(NOISE_KERNEL, dtype=np.float32))[1:-1, 1:-1]
+    if skew is None:
+        skew = estimate_skew_angle(gray, skew_max_dimension)
+
+    return {
+        'brightness': round(float(small.mean()), 2),
+        'contrast': round(contrast, 2),
+        'sharpness': round(laplacian_variance / max(float(patch.var()), 1.0), 4),
+        'laplacian_variance': round(laplacian_variance, 2),
+        # MAD of the residual; the kernel's response to unit noise has sigma 6
+        'noise': round(float(np.median(np.abs(residual))) * 1.4826 / 6, 3),
+        'illumination': round((max(medians) - min(medians)) / max(contrast, 1.0), 3),
+        'skew': round(skew, 3),
+    }
+
+def choose_variants(scores: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Minimal preprocessing for the measured quality: the main variant always,
+    plus only the variants aimed at each problem that was found
+    """
+    issues: List[str] = []
+    if scores['contrast'] < MIN_CONTRAST:
+        issues.append('low_contrast')
+    if scores['sharpness'] < MIN_SHARPNESS:
+        issues.append('blurry')
+    if scores['noise'] > MAX_NOISE:
+        issues.append('noisy')
+    if scores['illumination'] > MAX_ILLUMINATION:
+        issues.append('uneven_lighting')
+    if abs(scores['skew']) >= MAX_SKEW:
+        issues.append('skewed')
+
+    wrapper = {'preprocessed'}
+    versions = {'standard'}
+    if 'low_contrast' in issues or 'noisy' in issues:
+        # Stronger CLAHE, blur and morphological cleanup
+        wrapper.add('enhanced')
+        versions.add('enhanced')
+    if 'uneven_lighting' in issues:
+        # Local thresholds follow the lighting; global ones cannot
+        wrapper.add('threshold')
+        versions.add('binary')
+    if 'blurry' in issues:
+        # Several global levels keep soft strokes that one Otsu level drops
+        wrapper.add('multilevel')
+        versions.add('binary')
+
+    return {
+        'scores': scores,
+        'issues': issues,
+        'variants': [name for name in WRAPPER_VARIANTS if name in wrapper],
+        'versions': [name for name in VERSIONS if name in versions],
+        'denoise': 'noisy' in issues,
+        'deskew': 'skewed' in issues,
+    }
+
+def triage(gray: np.ndarray, skew_max_dimension: int = 1280, skew: Optional[float] = None) -> Dict[str, Any]:
+    """Scores plus the chosen variants for a grayscale capture"""
+    return choose_variants(measure_quality(gray, skew_max_dimension=skew_max_dimension, skew=skew))
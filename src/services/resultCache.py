@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Content-addressed result cache for ScoreCheck image processing
+Stores processing outputs on disk keyed by input bytes, operation and parameters
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+# Bump when processing output changes so stale entries stop matching
+CACHE_VERSION = 7
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'scorecheck-cache')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+class ResultCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(image_buffer: bytes, operation: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Hash of the input bytes plus operation name plus canonical parameters"""
+        return ResultCache.make_digest_key(hashlib.sha256(image_buffer).hexdigest(), operation, params)
+
+    @staticmethod
+    def make_digest_key(digest: str, operation: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """make_key for an input known by its sha256 hex digest"""
+        canonical = json.dumps(params or {}, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(f"{CACHE_VERSION}:{digest}:{operation}:{canonical}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached bytes for key, refreshing its LRU position"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store bytes under key, then evict least recently used entries over the size bound"""
+        if len(data) > self.max_bytes:
+            return
+
+        # Write-then-rename so concurrent workers never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+
+        self._evict()
+
+    def get_json(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self.get(key)
+        return json.loads(data.decode('utf-8')) if data is not None else None
+
+    def put_json(self, key: str, value: Dict[str, Any]) -> None:
+        self.put(key, json.dumps(value).encode('utf-8'))
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.bin'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
+
+def cache_from_environment(cache_dir: Optional[str] = None, disabled: bool = False) -> Optional[ResultCache]:
+    """Build the cache from SCORECHECK_CACHE_* settings, or None when disabled"""
+    if disabled or os.environ.get('SCORECHECK_CACHE_DISABLED', '').lower() in ('1', 'true', 'yes'):
+        return None
+
+    try:
+        return ResultCache(
+            cache_dir or os.environ.get('SCORECHECK_CACHE_DIR', DEFAULT_CACHE_DIR),
+            int(os.environ.get('SCORECHECK_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)),
+        )
+    except (OSError, ValueError):
+        # An unusable cache should never fail the actual processing
+        return None
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped input/output handoff for ScoreCheck image processing
+Reads images from and writes results into RAM-backed files (/dev/shm) or
+inherited file descriptors, reporting where each output section lives
+"""
+
+import mmap
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+# RAM-backed on Linux; elsewhere the temp dir is the closest equivalent
+SHARED_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+def shared_path(prefix: str = 'scorecheck', suffix: str = '') -> str:
+    """A unique file path in SHARED_DIR (the file is created empty)"""
+    fd, path = tempfile.mkstemp(prefix=f"{prefix}-", suffix=suffix, dir=SHARED_DIR)
+    os.close(fd)
+    return path
+
+def map_input(path: Optional[str] = None, fd: Optional[int] = None) -> mmap.mmap:
+    """
+    Map an input image read-only. The mapping supports the buffer protocol,
+    so numpy/OpenCV decode and hashing read it without copying.
+    """
+    if fd is None:
+        with open(path, 'rb') as f:
+            return map_input(fd=f.fileno())
+
+    size = os.fstat(fd).st_size
+    if size == 0:
+        raise ValueError("Input is empty")
+    return mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+
+def write_mapped_sections(sections: List[Tuple[str, bytes]], path: Optional[str] = None,
+                          fd: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Write sections back to back into a file or descriptor through a shared
+    mapping and return each section's name, offset and length
+    """
+    if fd is None:
+        with open(path, 'a+b') as f:
+            return write_mapped_sections(sections, fd=f.fileno())
+
+    layout = []
+    offset = 0
+    for name, data in sections:
+        layout.append({'name': name, 'offset': offset, 'length': len(data)})
+        offset += len(data)
+
+    os.ftruncate(fd, offset)
+    if offset == 0:
+        return layout
+
+    with mmap.mmap(fd, offset, access=mmap.ACCESS_WRITE) as mapped:
+        for entry, (_, data) in zip(layout, sections):
+            mapped[entry['offset']:entry['offset'] + entry['length']] = data
+        mapped.flush()
+    return layout
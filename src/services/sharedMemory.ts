@@ -0,0 +1,42 @@
+import * as crypto from 'crypto';
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+
+// RAM-backed on Linux; elsewhere the temp dir is the closest equivalent
+export const SHARED_DIR = fs.existsSync('/dev/shm') ? '/dev/shm' : os.tmpdir();
+
+export interface MappedSection {
+  name: string;
+  offset: number;
+  length: number;
+}
+
+/**
+ * Unique path for handing an image to or from Python without touching disk.
+ * Replaces fixed names like temp_input.jpg that concurrent requests overwrote.
+ */
+export function sharedTempPath(prefix: string, extension = ''): string {
+  const unique = `${process.pid}-${Date.now()}-${crypto.randomBytes(6).toString('hex')}`;
+  return path.join(SHARED_DIR, `${prefix}-${unique}${extension}`);
+}
+
+/**
+ * Slice the sections Python wrote back to back into a shared-memory file
+ */
+export function readMappedSections(filePath: string, sections: MappedSection[]): Record<string, Buffer> {
+  const data = fs.readFileSync(filePath);
+  return Object.fromEntries(
+    sections.map((section) => [section.name, data.subarray(section.offset, section.offset + section.length)])
+  );
+}
+
+export function removeSharedFiles(...filePaths: string[]): void {
+  for (const filePath of filePaths) {
+    try {
+      fs.rmSync(filePath, { force: true });
+    } catch (error) {
+      console.warn(`Warning: Could not remove ${filePath}:`, error);
+    }
+  }
+}
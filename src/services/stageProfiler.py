@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Per-stage profiling for ScoreCheck image processing
+Records wall time, CPU time and peak traced memory for named stages
+"""
+
+import contextvars
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_active_profiler: contextvars.ContextVar = contextvars.ContextVar('scorecheck_profiler', default=None)
+
+def max_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process in KiB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KiB
+    return int(peak / 1024) if sys.platform == 'darwin' else int(peak)
+
+class StageProfiler:
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory and hasattr(tracemalloc, 'reset_peak')
+        self.stages: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._started_tracing = False
+        self.summary: Dict[str, Any] = {}
+
+    @contextmanager
+    def activate(self):
+        """Make this the profiler that profile_stage() records into, timing the whole span"""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        token = _active_profiler.set(self)
+        try:
+            with self.stage('total'):
+                yield self
+        finally:
+            _active_profiler.reset(token)
+            total = self.stages.pop()
+            self.summary = {key: value for key, value in total.items() if key != 'name'}
+            self.summary['max_rss_kb'] = max_rss_kb()
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str):
+        path = '/'.join([frame['name'] for frame in self._stack[1:]] + [name])
+        frame = {'name': path, 'wall': time.perf_counter(), 'cpu': time.process_time()}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self._fold_peak(peak)
+            tracemalloc.reset_peak()
+            frame['base'] = current
+            frame['peak'] = current
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            record = {
+                'name': path,
+                'wall_ms': round((time.perf_counter() - frame['wall']) * 1000, 3),
+                'cpu_ms': round((time.process_time() - frame['cpu']) * 1000, 3),
+            }
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                frame['peak'] = max(frame['peak'], peak)
+                self._fold_peak(frame['peak'])
+                tracemalloc.reset_peak()
+                record['peak_traced_bytes'] = frame['peak'] - frame['base']
+            self.stages.append(record)
+
+    def _fold_peak(self, peak: int) -> None:
+        # reset_peak() is global, so carry the peak seen so far into every open stage
+        for open_frame in self._stack:
+            open_frame['peak'] = max(open_frame['peak'], peak)
+
+    def report(self) -> Dict[str, Any]:
+        return {**self.summary, 'stages': self.stages}
+
+@contextmanager
+def profile_stage(name: str):
+    """Record a stage on the active profiler; a no-op when profiling is off"""
+    profiler = _active_profiler.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Table grid segmentation for ScoreCheck
+Splits the box score region into rows and stat columns so OCR can be sent
+single cells (or single columns) instead of whole preprocessed frames
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from qualityTriage import estimate_skew_angle
+
+# Stat column x ranges on 4K captures (EnhancedOCRService OPTIMIZED_COORDINATES); they
+# label detected columns relative to the reference box score region (x=1214, 2267 wide)
+REFERENCE_REGION_X = (1214, 2267)
+REFERENCE_COLUMNS = (
+    ('player', 1220, 1705), ('grade', 1700, 1810), ('points', 1865, 1975),
+    ('rebounds', 2030, 2140), ('assists', 2170, 2280), ('steals', 2330, 2440),
+    ('blocks', 2480, 2590), ('fouls', 2620, 2730), ('turnovers', 2770, 2880),
+    ('fg', 2900, 3080), ('3p', 3130, 3310), ('ft', 3340, 3520),
+)
+
+# Reference columns that hold names and letter grades rather than numbers
+TEXT_COLUMNS = ('player', 'grade')
+
+# A ruled line covers at least this fraction of the table width (or height)
+MIN_RULE_FRACTION = 0.3
+
+# Crops skewed by at least this many degrees are rotated level before segmenting;
+# beyond MAX_SKEW the rows cannot be trusted and the crop is rejected
+DESKEW_TOLERANCE = 0.1
+MAX_SKEW = 10.0
+
+# Column breaks are looked for between these fractions of the row height: narrower
+# gaps are letter and word spacing, wider ones are always column breaks
+COLUMN_GAP_RANGE = (0.125, 0.5)
+
+Band = Tuple[int, int]
+
+def binarize_table(gray: np.ndarray) -> np.ndarray:
+    """Otsu threshold with ink (text and rules) as 255, whichever polarity the theme uses"""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if cv2.countNonZero(binary) > binary.size // 2:
+        # Ink is the minority of the table area
+        binary = cv2.bitwise_not(binary)
+    return binary
+
+def _runs(mask: np.ndarray) -> List[Band]:
+    """[start, end) of each run of True values"""
+    steps = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return list(zip(np.flatnonzero(steps == 1).tolist(), np.flatnonzero(steps == -1).tolist()))
+
+def _rule_bands(binary: np.ndarray, horizontal: bool) -> List[Band]:
+    """
+    Rows (or columns) crossed by a ruled line. Measured on a copy squeezed 4x
+    along the lines, where the long opening is 4x cheaper; a short cross
+    dilation bridges the stair-steps of slightly skewed rules.
+    """
+    lines = binary if horizontal else np.ascontiguousarray(binary.T)
+    h, w = lines.shape
+    squeezed = cv2.resize(lines, (max(1, w // 4), h), interpolation=cv2.INTER_AREA)
+    _, squeezed = cv2.threshold(squeezed, 127, 255, cv2.THRESH_BINARY)
+    squeezed = cv2.dilate(squeezed, cv2.getStructuringElement(cv2.MORPH_RECT, (1, 3)))
+    sw = squeezed.shape[1]
+    opened = cv2.morphologyEx(squeezed, cv2.MORPH_OPEN,
+                              cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, sw // 3), 1)))
+    return _runs(np.count_nonzero(opened, axis=1) >= sw * MIN_RULE_FRACTION)
+
+def _bands_between_rules(rules: List[Band], length: int, ink: np.ndarray) -> List[Band]:
+    """
+    The spaces between consecutive rules, plus one median-sized band outside the
+    first and last rule (tables often leave the outer edge unruled), keeping
+    only bands that hold ink
+    """
+    inner = [(rules[i][1], rules[i + 1][0]) for i in range(len(rules) - 1)]
+    size = int(np.median([end - start for start, end in inner]))
+    bands = [(max(0, rules[0][0] - size), rules[0][0])] + inner + [(rules[-1][1], min(length, rules[-1][1] + size))]
+    return [(start, end) for start, end in bands if end > start and ink[start:end].any()]
+
+def _bands_from_projection(ink: np.ndarray, length: int, min_gap: int) -> List[Band]:
+    """
+    Runs of ink closer than min_gap merged into one band each; bands meet
+    halfway across the gaps and the outer ones get half the median gap
+    """
+    runs = []
+    for start, end in _runs(ink > 0):
+        if runs and start - runs[-1][1] < min_gap:
+            runs[-1] = (runs[-1][0], end)
+        else:
+            runs.append((start, end))
+    if not runs:
+        return []
+
+    gaps = [runs[i + 1][0] - runs[i][1] for i in range(len(runs) - 1)]
+    margin = int(np.median(gaps)) // 2 if gaps else min_gap // 2
+    bands = []
+    for index, (start, end) in enumerate(runs):
+        start = runs[index - 1][1] + (start - runs[index - 1][1]) // 2 if index else max(0, start - margin)
+        end = end + (runs[index + 1][0] - end) // 2 if index + 1 < len(runs) else min(length, end + margin)
+        bands.append((start, end))
+    return bands
+
+def column_gap(gaps: Sequence[int], row_height: int) -> int:
+    """
+    Narrowest gap that separates two columns, from the gaps between ink runs:
+    the widest ratio jump in the sorted gaps (word spacing below it, column
+    breaks above) whose midpoint falls within COLUMN_GAP_RANGE of the row
+    height; a quarter of the row height when no jump lands there
+    """
+    low, high = row_height * COLUMN_GAP_RANGE[0], row_height * COLUMN_GAP_RANGE[1]
+    best, threshold = 0.0, row_height / 4.0
+    ordered = sorted(max(1, gap) for gap in gaps)
+    for below, above in zip(ordered, ordered[1:]):
+        midpoint = float(np.sqrt(below * above))
+        if low <= midpoint <= high and above / float(below) > best:
+            best, threshold = above / float(below), midpoint
+    return max(2, int(np.ceil(threshold)))
+
+def label_columns(columns: List[Band], width: int,
+                  column_names: Optional[Sequence[str]] = None) -> Tuple[List[str], str]:
+    """
+    Names for the detected columns and where they came from: column_names when
+    their count matches ('given'); the reference stat columns when exactly as
+    many columns were found and each lies within half the closest reference
+    spacing of its counterpart ('reference'); otherwise c<index> ('index')
+    """
+    if column_names is not None and len(column_names) == len(columns):
+        return list(column_names), 'given'
+
+    region_left, region_width = REFERENCE_REGION_X
+    centres = [((x1 + x2) / 2.0 - region_left) / region_width for _, x1, x2 in REFERENCE_COLUMNS]
+    tolerance = min(b - a for a, b in zip(centres, centres[1:])) / 2
+
+    # A partial match is more likely a different layout than a shifted one
+    if len(columns) == len(REFERENCE_COLUMNS) and all(
+            abs((start + end) / 2.0 / width - centre) <= tolerance for (start, end), centre in zip(columns, centres)):
+        return [name for name, _, _ in REFERENCE_COLUMNS], 'reference'
+    return [f"c{index}" for index in range(len(columns))], 'index'
+
+def level_to_crop(box: Dict[str, int], deskew: Dict[str, Any], width: int, height: int) -> Dict[str, int]:
+    """
+    A box in the levelled crop segment_table worked on, in the original crop:
+    the bounding box of its corners rotated back, within the crop
+    """
+    if not deskew['rotated']:
+        return box
+    M = cv2.invertAffineTransform(cv2.getRotationMatrix2D((width / 2, height / 2), deskew['angle'], 1.0))
+    x1, y1 = box['left'], box['top']
+    x2, y2 = x1 + box['width'], y1 + box['height']
+    corners = np.array([[x1, y1, 1], [x2, y1, 1], [x1, y2, 1], [x2, y2, 1]], dtype=np.float64) @ M.T
+    left, top = np.clip(np.floor(corners.min(axis=0)), 0, [width, height]).astype(int)
+    right, bottom = np.clip(np.ceil(corners.max(axis=0)), 0, [width, height]).astype(int)
+    return {'left': int(left), 'top': int(top), 'width': int(right - left), 'height': int(bottom - top)}
+
+def segment_table(gray: np.ndarray, column_names: Optional[Sequence[str]] = None,
+                  min_column_gap: Optional[int] = None) -> Tuple[Dict[str, Any], np.ndarray, np.ndarray]:
+    """
+    Row and column bands of a table crop: from ruled lines where there are at
+    least two, otherwise from projection profiles of the ink. A skewed crop is
+    first rotated level (grid['deskew']; level_to_crop maps boxes back) and one
+    skewed beyond MAX_SKEW degrees is rejected. Columns come from the ink that
+    several rows share, so a header wider than its column does not bridge two
+    columns, and gaps narrower than min_column_gap (default column_gap of the
+    ink gaps) are word spaces, not column breaks. Returns the grid in levelled
+    crop coordinates with the levelled grayscale and binary images.
+    """
+    angle = estimate_skew_angle(gray)
+    if abs(angle) > MAX_SKEW:
+        raise ValueError(f"Table is skewed by {angle:.1f} degrees (at most {MAX_SKEW:g} can be levelled)")
+    rotated = abs(angle) >= DESKEW_TOLERANCE
+    if rotated:
+        h, w = gray.shape
+        M = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+        gray = cv2.warpAffine(gray, M, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+    binary = binarize_table(gray)
+    h, w = binary.shape
+    row_rules = _rule_bands(binary, True)
+    column_rules = _rule_bands(binary, False)
+
+    # Text only: rule bands blanked, specks opened away
+    ink = cv2.morphologyEx(binary, cv2.MORPH_OPEN, np.ones((2, 2), np.uint8))
+    for start, end in row_rules:
+        ink[start:end] = 0
+    for start, end in column_rules:
+        ink[:, start:end] = 0
+
+    row_ink = np.count_nonzero(ink, axis=1)
+    if len(row_rules) >= 2:
+        rows, row_method = _bands_between_rules(row_rules, h, row_ink), 'rules'
+    else:
+        rows, row_method = _bands_from_projection(row_ink, h, 2), 'projection'
+
+    # Rows with ink at each x; a single row (typically the header) is not enough to hold a column together
+    rows_with_ink = np.zeros(w, dtype=np.int32)
+    for start, end in rows:
+        rows_with_ink += ink[start:end].any(axis=0)
+    column_ink = np.where(rows_with_ink > len(rows) // 8, rows_with_ink, 0)
+    if len(column_rules) >= 2:
+        columns, column_method = _bands_between_rules(column_rules, w, column_ink), 'rules'
+    else:
+        if min_column_gap is None:
+            runs = _runs(column_ink > 0)
+            row_height = int(np.median([end - start for start, end in rows])) if rows else 8
+            min_column_gap = column_gap([b[0] - a[1] for a, b in zip(runs, runs[1:])], row_height)
+        columns, column_method = _bands_from_projection(column_ink, w, min_column_gap), 'projection'
+
+    names, labels = label_columns(columns, w, column_names)
+    grid = {
+        'rows': [{'top': start, 'height': end - start} for start, end in rows],
+        'columns': [{'name': name, 'left': start, 'width': end - start} for name, (start, end) in zip(names, columns)],
+        'method': {'rows': row_method, 'columns': column_method, 'labels': labels},
+        'deskew': {'angle': round(angle, 3), 'rotated': rotated},
+    }
+    return grid, gray, binary
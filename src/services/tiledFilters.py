@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tiled execution of neighbourhood filters for ScoreCheck image processing
+Splits large frames into overlapping bands and filters them on a thread pool
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+class TileExecutor:
+    """
+    Runs a filter over horizontal bands of a frame in parallel. Each band is
+    extended by `halo` rows on both sides, so as long as every output pixel
+    depends only on inputs within `halo` rows the stitched result is
+    pixel-identical to filtering the whole frame. OpenCV releases the GIL,
+    so bands run concurrently on plain threads.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_band_rows: int = 128):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.min_band_rows = min_band_rows
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='tile')
+        return self._pool
+
+    def apply(self, fn: Callable[[np.ndarray], np.ndarray], image: np.ndarray, halo: int) -> np.ndarray:
+        """fn must return an array with the same shape and dtype as its input band"""
+        height = image.shape[0]
+        bands = min(self.workers, height // self.min_band_rows)
+        if bands < 2:
+            return fn(image)
+
+        output = np.empty_like(image)
+        bounds = [height * i // bands for i in range(bands + 1)]
+
+        def run_band(index: int) -> None:
+            top, bottom = bounds[index], bounds[index + 1]
+            start, stop = max(0, top - halo), min(height, bottom + halo)
+            output[top:bottom] = fn(image[start:stop])[top - start:bottom - start]
+
+        # list() re-raises the first band error here
+        list(self._executor().map(run_band, range(bands)))
+        return output
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+def run_tiled(tiler: Optional[TileExecutor], fn: Callable[[np.ndarray], np.ndarray],
+              image: np.ndarray, halo: int) -> np.ndarray:
+    """fn(image), split into bands when a tile executor is configured"""
+    return tiler.apply(fn, image, halo) if tiler else fn(image)
+
+def tile_executor_from_environment(workers: Optional[int] = None) -> Optional[TileExecutor]:
+    """TileExecutor from an explicit worker count or SCORECHECK_TILE_WORKERS; 0 or unset disables tiling"""
+    if workers is None:
+        try:
+            workers = int(os.environ.get('SCORECHECK_TILE_WORKERS', '0'))
+        except ValueError:
+            workers = 0
+    return TileExecutor(workers) if workers > 0 else None
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Screen-recording ingestion for ScoreCheck
+Streams frames from a console capture clip, skips transitions and motion by
+differencing small copies of sampled frames, and picks the sharpest frame of
+each still stretch that shows a box score
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from layoutDetector import detect_box_score_region
+from perceptualHash import DEFAULT_MAX_DISTANCE, hamming_distance, perceptual_hash
+
+# Frames are sampled at this rate; menus stay up for seconds, so 5 fps misses nothing
+DEFAULT_SAMPLE_FPS = 5.0
+# Samples at least this far apart are reached by seeking instead of grabbing every frame in
+# between: a seek decodes from the previous keyframe (typically 1-2 s back), grab() decodes them all
+SEEK_MIN_SECONDS = 1.0
+# Frame differencing runs on copies this wide
+MOTION_WIDTH = 160
+# Mean absolute grey-level change between consecutive samples above which the screen is moving;
+# video compression noise on a static menu stays well below 1
+MOTION_THRESHOLD = 2.0
+# A still stretch must last this long to count (not a frame caught mid-transition)
+MIN_STILL_SECONDS = 0.5
+# Sharpness is measured on a centre patch of at most this size (as qualityTriage does)
+SHARPNESS_PATCH = (720, 1280)
+
+Frame = Tuple[int, float, np.ndarray]
+
+def sample_frames(capture: Any, sample_fps: float = DEFAULT_SAMPLE_FPS) -> Iterator[Frame]:
+    """
+    (frame index, time in seconds, BGR frame) at about sample_fps. Skipped
+    frames are grab()bed, which with most codecs still decodes them but skips
+    the colour conversion and copy out; when samples are SEEK_MIN_SECONDS or
+    more apart the capture seeks to each one instead. Only the current frame
+    is held, so memory does not grow with clip length.
+    """
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    step = max(1, int(round(fps / sample_fps)))
+    if step / fps >= SEEK_MIN_SECONDS:
+        yield from _seek_frames(capture, fps, step)
+        return
+    index = 0
+    while capture.grab():
+        if index % step == 0:
+            ok, frame = capture.retrieve()
+            if not ok:
+                return
+            yield index, index / fps, frame
+        index += 1
+
+def _seek_frames(capture: Any, fps: float, step: int) -> Iterator[Frame]:
+    """sample_frames by seeking to every step-th frame's timestamp"""
+    index = 0
+    while capture.set(cv2.CAP_PROP_POS_MSEC, index * 1000.0 / fps):
+        ok, frame = capture.read()
+        if not ok:
+            return
+        yield index, index / fps, frame
+        index += step
+
+def frame_sharpness(gray: np.ndarray) -> float:
+    """Laplacian variance over intensity variance of the centre patch; comparable across brightness"""
+    h, w = gray.shape[:2]
+    ph, pw = min(h, SHARPNESS_PATCH[0]), min(w, SHARPNESS_PATCH[1])
+    top, left = (h - ph) // 2, (w - pw) // 2
+    patch = gray[top:top + ph, left:left + pw]
+    return float(cv2.Laplacian(patch, cv2.CV_32F).var()) / max(float(patch.var()), 1.0)
+
+def select_still_frames(frames: Iterator[Frame], max_frames: int = 1,
+                        motion_threshold: float = MOTION_THRESHOLD,
+                        min_still_seconds: float = MIN_STILL_SECONDS) -> Iterator[Dict[str, Any]]:
+    """
+    Yield {'index', 'time', 'sharpness', 'region', 'frame'} for the sharpest
+    frame of each still stretch in which a box score table is found, as soon
+    as the stretch ends. Stretches that look like an already selected frame
+    (perceptual hash) are skipped; after max_frames selections no more frames
+    are read.
+    """
+    selected: List[int] = []
+    previous: Optional[np.ndarray] = None
+    previous_time = 0.0
+    run: Optional[Dict[str, Any]] = None
+
+    def close(run: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if run['end'] - run['start'] < min_still_seconds:
+            return None
+        gray = cv2.cvtColor(run['frame'], cv2.COLOR_BGR2GRAY)
+        region = detect_box_score_region(gray)
+        if region is None:
+            return None
+        box = gray[region['top']:region['top'] + region['height'], region['left']:region['left'] + region['width']]
+        fingerprint = perceptual_hash(box)
+        if any(hamming_distance(fingerprint, other) <= DEFAULT_MAX_DISTANCE for other in selected):
+            return None
+        selected.append(fingerprint)
+        return {'index': run['index'], 'time': round(run['time'], 3), 'sharpness': round(run['sharpness'], 4),
+                'region': region, 'frame': run['frame']}
+
+    for index, time, frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        h, w = gray.shape[:2]
+        small = cv2.resize(gray, (MOTION_WIDTH, max(1, h * MOTION_WIDTH // w)), interpolation=cv2.INTER_AREA)
+        still = previous is not None and float(cv2.absdiff(small, previous).mean()) <= motion_threshold
+        previous = small
+
+        if not still:
+            pick = close(run) if run else None
+            run = None
+            previous_time = time
+            if pick:
+                yield pick
+                if len(selected) >= max_frames:
+                    return
+            continue
+
+        # The still stretch began at the previous sample, which matches this one
+        sharpness = frame_sharpness(gray)
+        if run is None:
+            run = {'start': previous_time, 'index': index, 'time': time, 'sharpness': sharpness, 'frame': frame}
+        elif sharpness > run['sharpness']:
+            run.update(index=index, time=time, sharpness=sharpness, frame=frame)
+        run['end'] = time
+        previous_time = time
+
+    pick = close(run) if run else None
+    if pick:
+        yield pick
@@ -0,0 +1,64 @@
+"""
+Batch output naming: images sharing a file name in different subdirectories
+(or sharing a stem in one directory) must each keep their own variant files
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+from benchmark_suite import make_box_score_frame
+from python_ocr_wrapper import batch_output_names, render_variants, run_batch
+
+VARIANTS = ['preprocessed', 'threshold']
+
+@pytest.fixture
+def source(tmp_path):
+    """home/scan.png, away/scan.png and away/scan.jpg, each a different frame"""
+    images = {}
+    for seed, relative in enumerate(['home/scan.png', 'away/scan.png', 'away/scan.jpg']):
+        path = tmp_path / 'source' / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cv2.imwrite(str(path), make_box_score_frame(640, 360, seed=seed))
+        images[relative] = str(path)
+    return tmp_path / 'source', images
+
+def test_names_follow_the_source_tree(source):
+    _, images = source
+    names = batch_output_names(list(images.values()), 'out')
+    assert names == {
+        images['home/scan.png']: os.path.join('home', 'scan'),
+        images['away/scan.png']: os.path.join('away', 'scan_png'),
+        images['away/scan.jpg']: os.path.join('away', 'scan_jpg'),
+    }
+
+def test_names_next_to_inputs(source):
+    _, images = source
+    names = batch_output_names(list(images.values()))
+    assert names == {
+        images['home/scan.png']: 'scan',
+        images['away/scan.png']: 'scan_png',
+        images['away/scan.jpg']: 'scan_jpg',
+    }
+
+def test_batch_keeps_every_output(source, tmp_path):
+    root, images = source
+    output_dir = tmp_path / 'out'
+    manifest = run_batch(str(root / '**' / 'scan.*'), VARIANTS, str(output_dir), workers=1,
+                         manifest_path=str(tmp_path / 'manifest.json'), no_cache=True)
+    assert manifest['succeeded'] == len(images)
+
+    outputs = [path for entry in manifest['results'] for path in entry['outputs'].values()]
+    assert len(set(outputs)) == len(images) * len(VARIANTS)
+    for entry in manifest['results']:
+        expected = render_variants(entry['input'], VARIANTS)
+        for variant, path in entry['outputs'].items():
+            assert path.startswith(str(output_dir))
+            written = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            assert np.array_equal(written, cv2.imdecode(np.frombuffer(expected[variant], np.uint8), cv2.IMREAD_UNCHANGED))
@@ -0,0 +1,59 @@
+"""
+Near-duplicate short-circuit (skip_duplicates) on the whole-result path and the
+streamed path that --serve and --output-format ndjson use
+"""
+
+import os
+import sys
+
+import cv2
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+from benchmark_suite import make_box_score_frame
+from perceptualHash import FingerprintIndex
+from pythonImageProcessor import PythonImageProcessor
+from resultCache import ResultCache
+
+@pytest.fixture
+def processor(tmp_path):
+    return PythonImageProcessor(ResultCache(str(tmp_path / 'cache')), fingerprints=FingerprintIndex())
+
+@pytest.fixture(scope='module')
+def screenshots():
+    """A box score screenshot and a recompressed copy of it (different bytes, same picture)"""
+    frame = make_box_score_frame(1920, 1080, seed=3)
+    return (cv2.imencode('.png', frame)[1].tobytes(),
+            cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes())
+
+def stream(processor, operation, image_buffer, **kwargs):
+    records = list(processor.process_image_stream(operation, image_buffer, **kwargs))
+    return {record['name']: record['data'] for record in records[:-1]}, records[-1]
+
+@pytest.mark.parametrize('operation', ['multiple_versions', 'preprocess_binary_ocr'])
+def test_stream_serves_near_duplicate(processor, screenshots, operation):
+    original, recompressed = screenshots
+    first, first_summary = stream(processor, operation, original, skip_duplicates=True)
+    assert first_summary['success'] and 'duplicate_of' not in first_summary
+
+    outputs, summary = stream(processor, operation, recompressed, skip_duplicates=True)
+    assert summary['success']
+    assert summary['duplicate_of'] == processor.find_near_duplicate(original, register=False)['data']['digest']
+    assert summary['distance'] <= 40
+    assert outputs == first
+
+def test_stream_without_skip_reprocesses(processor, screenshots):
+    original, recompressed = screenshots
+    stream(processor, 'multiple_versions', original, skip_duplicates=True)
+    _, summary = stream(processor, 'multiple_versions', recompressed)
+    assert summary['success'] and 'duplicate_of' not in summary
+
+def test_raw_and_stream_agree(processor, screenshots):
+    original, recompressed = screenshots
+    processor.process_image_raw('multiple_versions', original, skip_duplicates=True)
+    raw = processor.process_image_raw('multiple_versions', recompressed, skip_duplicates=True)
+    outputs, summary = stream(processor, 'multiple_versions', recompressed, skip_duplicates=True)
+    assert raw['duplicate_of'] == summary['duplicate_of']
+    assert raw['data'] == outputs
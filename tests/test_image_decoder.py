@@ -0,0 +1,26 @@
+"""
+Reduced-resolution decoding: the PIL path (JPEG draft mode, or reduce() for
+other formats) must give the frame size OpenCV's reduced decode gives
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+from imageDecoder import ImageDecoder
+
+@pytest.mark.parametrize('shape', [(96, 130), (97, 131), (1079, 1919)])
+@pytest.mark.parametrize('extension', ['.png', '.jpg'])
+@pytest.mark.parametrize('scale', [2, 4, 8])
+@pytest.mark.parametrize('luminance', [False, True], ids=['colour', 'luminance'])
+def test_reduced_size_matches_opencv(shape, extension, scale, luminance):
+    rng = np.random.default_rng(scale)
+    image_buffer = cv2.imencode(extension, rng.integers(0, 256, shape + (3,), dtype=np.uint8))[1].tobytes()
+    decoder = ImageDecoder(luminance, scale)
+    gray = np.asarray(decoder.decode_gray_pil(image_buffer))
+    assert gray.shape == decoder.decode_gray(image_buffer).shape
@@ -0,0 +1,72 @@
+"""
+Header-only metadata (imageHeader.read_image_header) against what Pillow
+reports after opening the same bytes: size, format and EXIF orientation
+"""
+
+import io
+import os
+import struct
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+from imageHeader import read_image_header
+
+def exif_block(orientation, order='<'):
+    """'Exif\\0\\0' + a TIFF header whose first IFD holds only the orientation tag"""
+    mark = b'II' if order == '<' else b'MM'
+    ifd = struct.pack(order + 'H', 1) + struct.pack(order + 'HHIHH', 0x0112, 3, 1, orientation, 0) + bytes(4)
+    return b'Exif\x00\x00' + mark + struct.pack(order + 'HI', 42, 8) + ifd
+
+def encode(width, height, fmt, mode='RGB', **params):
+    rng = np.random.default_rng(width * height)
+    channels = {'RGB': 3, 'RGBA': 4}.get(mode)
+    pixels = rng.integers(0, 256, (height, width) + ((channels,) if channels else ()), dtype=np.uint8)
+    image = Image.fromarray(pixels, 'L' if mode in ('L', 'P') else mode)
+    if mode == 'P':
+        image = image.convert('P')
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+CASES = {
+    'jpeg': encode(131, 97, 'JPEG'),
+    'jpeg_grayscale': encode(64, 1000, 'JPEG', 'L'),
+    'jpeg_progressive': encode(1919, 1079, 'JPEG', progressive=True),
+    'jpeg_optimized': encode(320, 240, 'JPEG', optimize=True),
+    # An APP2 segment of ~60 KB before the frame header
+    'jpeg_large_icc': encode(200, 150, 'JPEG', icc_profile=bytes(60000)),
+    'jpeg_big_endian_exif': encode(200, 150, 'JPEG', exif=exif_block(6, '>')),
+    'png': encode(131, 97, 'PNG'),
+    'png_rgba': encode(50, 70, 'PNG', 'RGBA'),
+    'png_palette': encode(33, 17, 'PNG', 'P'),
+    'png_grayscale': encode(3840, 2, 'PNG', 'L'),
+    **{f"jpeg_orientation_{o}": encode(160, 90, 'JPEG', exif=exif_block(o)) for o in range(1, 9)},
+    **{f"png_orientation_{o}": encode(160, 90, 'PNG', exif=exif_block(o)) for o in range(1, 9)},
+}
+
+@pytest.mark.parametrize('case', list(CASES))
+def test_header_matches_pillow(case):
+    data = CASES[case]
+    with Image.open(io.BytesIO(data)) as image:
+        expected = {'format': image.format.lower(), 'width': image.width, 'height': image.height,
+                    'orientation': image.getexif().get(0x0112, 1)}
+    assert read_image_header(data) == expected
+
+def test_orientation_is_read():
+    assert read_image_header(CASES['jpeg_orientation_8'])['orientation'] == 8
+    assert read_image_header(CASES['png_orientation_3'])['orientation'] == 3
+    assert read_image_header(CASES['jpeg_big_endian_exif'])['orientation'] == 6
+
+def test_memory_view_input():
+    assert read_image_header(memoryview(CASES['png'])) == read_image_header(CASES['png'])
+
+@pytest.mark.parametrize('data', [encode(20, 20, 'GIF', 'P'), CASES['jpeg'][:20], CASES['png'][:16], b''],
+                         ids=['gif', 'truncated_jpeg', 'truncated_png', 'empty'])
+def test_unreadable_headers_raise_value_error(data):
+    with pytest.raises(ValueError):
+        read_image_header(data)
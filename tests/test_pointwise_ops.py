@@ -0,0 +1,87 @@
+"""
+Fused lookup tables (pointwiseOps) against the sequential steps they
+replace: cv2.threshold + bitwise_or, ImageEnhance contrast and brightness,
+and ImageFilter kernels followed by a point() step
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image, ImageEnhance, ImageFilter
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+from pointwiseOps import brightness_lut, compose_luts, contrast_lut, threshold_lut
+from python_ocr_wrapper import MULTILEVEL_LUT, build_multilevel
+from pythonImageProcessor import EDGE_ENHANCE_KERNEL, SHARPEN_KERNEL, binary_128_lut, filter_3x3
+
+def frames():
+    rng = np.random.default_rng(17)
+    checkerboard = (np.indices((64, 64)).sum(axis=0) % 2 * 255).astype(np.uint8)
+    return {
+        # Every level, so a table entry that differs cannot hide
+        'ramp': np.tile(np.arange(256, dtype=np.uint8), (8, 1)),
+        'random': rng.integers(0, 256, (97, 131), dtype=np.uint8),
+        # Isolated extremes drive the 3x3 kernel sums to both ends of their range
+        'checkerboard': checkerboard,
+        'speckle': np.where(rng.random((61, 83)) < 0.05, 255, 0).astype(np.uint8),
+    }
+
+FRAMES = frames()
+
+@pytest.mark.parametrize('thresh', [0, 50, 127, 128, 200, 254, 255])
+@pytest.mark.parametrize('inverse', [False, True], ids=['binary', 'binary_inv'])
+def test_threshold_lut(thresh, inverse):
+    ramp = FRAMES['ramp']
+    mode = cv2.THRESH_BINARY_INV if inverse else cv2.THRESH_BINARY
+    assert np.array_equal(cv2.LUT(ramp, threshold_lut(thresh, inverse=inverse)), cv2.threshold(ramp, thresh, 255, mode)[1])
+
+@pytest.mark.parametrize('frame', list(FRAMES))
+def test_multilevel_union(frame):
+    gray = FRAMES[frame]
+    sequential = cv2.bitwise_or(cv2.bitwise_or(cv2.threshold(gray, 50, 255, cv2.THRESH_BINARY)[1],
+                                               cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)[1]),
+                                cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)[1])
+    assert np.array_equal(cv2.LUT(gray, MULTILEVEL_LUT), sequential)
+    assert np.array_equal(build_multilevel(gray), sequential)
+
+@pytest.mark.parametrize('factor', [0.8, 1.5])
+@pytest.mark.parametrize('frame', list(FRAMES))
+def test_contrast_lut(frame, factor):
+    gray = FRAMES[frame]
+    mean = int(float(gray.mean()) + 0.5)
+    expected = np.asarray(ImageEnhance.Contrast(Image.fromarray(gray)).enhance(factor))
+    assert np.array_equal(cv2.LUT(gray, contrast_lut(mean, factor)), expected)
+
+@pytest.mark.parametrize('factor', [0.5, 1.1, 2.0])
+def test_brightness_lut(factor):
+    ramp = FRAMES['ramp']
+    expected = np.asarray(ImageEnhance.Brightness(Image.fromarray(ramp)).enhance(factor))
+    assert np.array_equal(cv2.LUT(ramp, brightness_lut(factor)), expected)
+
+def test_compose_luts():
+    luts = [contrast_lut(100, 1.5), brightness_lut(1.1), threshold_lut(127)]
+    ramp = FRAMES['ramp']
+    sequential = ramp
+    for lut in luts:
+        sequential = cv2.LUT(sequential, lut)
+    assert np.array_equal(cv2.LUT(ramp, compose_luts(*luts)), sequential)
+
+@pytest.mark.parametrize('step', ['sharpen_threshold', 'edge_brightness'])
+@pytest.mark.parametrize('frame', list(FRAMES))
+def test_kernel_rounding_with_folded_step(frame, step):
+    gray = FRAMES[frame]
+    if step == 'sharpen_threshold':
+        kernel, divisor, lut, pil_filter = SHARPEN_KERNEL, 16, binary_128_lut(), ImageFilter.SHARPEN
+        pil_step = lambda image: image.point(lambda x: 0 if x < 128 else 255)
+    else:
+        kernel, divisor, lut, pil_filter = EDGE_ENHANCE_KERNEL, 2, brightness_lut(1.1), ImageFilter.EDGE_ENHANCE
+        pil_step = lambda image: ImageEnhance.Brightness(image).enhance(1.1)
+
+    fused = filter_3x3(gray, kernel, divisor, lut)
+    assert np.array_equal(fused, cv2.LUT(filter_3x3(gray, kernel, divisor), lut))
+    assert np.array_equal(fused, np.asarray(pil_step(Image.fromarray(gray).filter(pil_filter))))
@@ -0,0 +1,61 @@
+"""
+The NumPy/OpenCV preprocessing backend against the PIL reference: decoded
+output pixels of the preprocess_ocr chains must be identical, including at
+the frame borders and at the ends of the grey range
+"""
+
+import io
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+from benchmark_suite import make_box_score_frame
+from pythonImageProcessor import PythonImageProcessor
+from resultCache import ResultCache
+
+OPERATIONS = ('preprocess_ocr', 'preprocess_ocr_alternative', 'multiple_versions')
+
+def frames():
+    rng = np.random.default_rng(11)
+    box_score = make_box_score_frame(1280, 720, noise=6.0, seed=11)
+    return {
+        'box_score_png': cv2.imencode('.png', box_score)[1].tobytes(),
+        'box_score_jpeg': cv2.imencode('.jpg', box_score, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes(),
+        # Saturated colours, where a grayscale conversion's rounding shows
+        'colour_jpeg': cv2.imencode('.jpg', cv2.resize(rng.integers(0, 256, (18, 32, 3), dtype=np.uint8), (640, 360),
+                                                       interpolation=cv2.INTER_NEAREST))[1].tobytes(),
+        # Odd size, so every filter's border handling is exercised on both axes
+        'random_png': cv2.imencode('.png', rng.integers(0, 256, (97, 131, 3), dtype=np.uint8))[1].tobytes(),
+        'black_png': cv2.imencode('.png', np.zeros((64, 80, 3), np.uint8))[1].tobytes(),
+        'white_png': cv2.imencode('.png', np.full((64, 80, 3), 255, np.uint8))[1].tobytes(),
+    }
+
+FRAMES = frames()
+
+def decode_pixels(data):
+    return np.asarray(Image.open(io.BytesIO(data)).convert('L'))
+
+@pytest.fixture
+def processor(tmp_path):
+    return PythonImageProcessor(ResultCache(str(tmp_path / 'cache')))
+
+@pytest.mark.parametrize('decode', [{}, {'luminance_decode': True}], ids=['default', 'luminance'])
+@pytest.mark.parametrize('operation', OPERATIONS)
+@pytest.mark.parametrize('frame', list(FRAMES))
+def test_numpy_backend_matches_pil(processor, operation, frame, decode):
+    pil = processor.process_image_raw(operation, FRAMES[frame], backend='pil', **decode)
+    numpy = processor.process_image_raw(operation, FRAMES[frame], backend='numpy', **decode)
+    assert pil['success'] and numpy['success']
+
+    if isinstance(pil['data'], bytes):
+        pil['data'], numpy['data'] = {'data': pil['data']}, {'data': numpy['data']}
+    assert pil['data'].keys() == numpy['data'].keys()
+    for name in pil['data']:
+        assert np.array_equal(decode_pixels(numpy['data'][name]), decode_pixels(pil['data'][name])), name
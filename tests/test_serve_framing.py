@@ -0,0 +1,66 @@
+"""
+Length-prefixed framing of the --serve worker loop (the Python half of
+pythonWorkerPool.ts): requests in, binary, JSON and stream responses out
+"""
+
+import io
+import json
+import os
+import sys
+
+import cv2
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+from pythonImageProcessor import PythonImageProcessor, read_frame, read_sections, serve, write_frame
+
+def request(stdin, request_id, operation, image, output_format, **params):
+    write_frame(stdin, json.dumps({'id': request_id, 'operation': operation, 'params': params,
+                                   'output_format': output_format}).encode('utf-8'))
+    write_frame(stdin, image)
+
+def test_serve_round_trip():
+    image = np.zeros((120, 200, 3), dtype=np.uint8)
+    cv2.rectangle(image, (20, 20), (180, 100), (255, 255, 255), -1)
+    png = cv2.imencode('.png', image)[1].tobytes()
+
+    stdin = io.BytesIO()
+    request(stdin, 1, 'dimensions', png, 'json')
+    request(stdin, 2, 'crop', png, 'binary', coordinates={'left': 10, 'top': 10, 'width': 50, 'height': 40})
+    request(stdin, 3, 'no_such_operation', png, 'binary')
+    stdin.seek(0)
+    stdout = io.BytesIO()
+    serve(PythonImageProcessor(), stdin, stdout)
+    stdout.seek(0)
+
+    dimensions = json.loads(read_frame(stdout).decode('utf-8'))
+    assert dimensions['id'] == 1 and dimensions['success']
+    assert (dimensions['data']['width'], dimensions['data']['height']) == (200, 120)
+
+    crop = read_sections(stdout)
+    assert crop['id'] == 2 and crop['success']
+    assert cv2.imdecode(np.frombuffer(crop['data'], np.uint8), cv2.IMREAD_UNCHANGED).shape[:2] == (40, 50)
+
+    failure = read_sections(stdout)
+    assert failure['id'] == 3 and not failure['success']
+    assert read_frame(stdout) is None
+
+def test_serve_stream_ends_with_done_record():
+    image = np.full((64, 64, 3), 128, dtype=np.uint8)
+    stdin = io.BytesIO()
+    request(stdin, 7, 'multiple_versions', cv2.imencode('.png', image)[1].tobytes(), 'stream')
+    stdin.seek(0)
+    stdout = io.BytesIO()
+    serve(PythonImageProcessor(), stdin, stdout)
+    stdout.seek(0)
+
+    records = []
+    while True:
+        record = read_sections(stdout)
+        if record is None:
+            break
+        records.append(record)
+    assert all(record['id'] == 7 for record in records)
+    assert records[-1].get('done') and records[-1]['success']
+    assert sorted(record['name'] for record in records[:-1]) == ['binary', 'enhanced', 'standard']
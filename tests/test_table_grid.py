@@ -0,0 +1,88 @@
+"""
+Table grid segmentation and offline digit reading on synthetic box score frames
+(scripts/benchmark_suite.make_box_score_frame): a header row and eleven player
+rows, a name column and the nine stat columns, level or rotated by 2 degrees
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+from benchmark_suite import STAT_COLUMNS, make_box_score_frame
+from pythonImageProcessor import PythonImageProcessor
+from tableGrid import MAX_SKEW, label_columns, segment_table
+
+SEED = 7
+ROWS = 12
+STATS = [name.lower() for name in STAT_COLUMNS]
+
+def expected_stats(seed):
+    """The stat texts make_box_score_frame draws for each player row (same generator order)"""
+    rng = np.random.default_rng(seed)
+    stats = {}
+    for row in range(1, ROWS):
+        for column in STATS:
+            made = int(rng.integers(0, 15))
+            stats.setdefault(str(row), {})[column] = (f"{made}/{made + int(rng.integers(0, 10))}" if '/' in column
+                                                      else str(int(rng.integers(0, 40))))
+    return stats
+
+@pytest.fixture(scope='module')
+def processor():
+    return PythonImageProcessor()
+
+@pytest.fixture(scope='module', params=[0.0, 2.0], ids=['level', 'skew2'])
+def frame(request):
+    image = make_box_score_frame(3840, 2160, skew=request.param, seed=SEED)
+    return request.param, cv2.imencode('.png', image)[1].tobytes()
+
+def test_grid_rows_and_columns(processor, frame):
+    skew, image_buffer = frame
+    grid, _ = processor.segment_table_grid(image_buffer, auto_detect=True)
+    assert len(grid['rows']) == ROWS
+    assert len(grid['columns']) == 1 + len(STAT_COLUMNS)
+    # The synthetic layout is not the reference one, so its columns are only numbered
+    assert grid['method'] == {'rows': 'rules', 'columns': 'projection', 'labels': 'index'}
+    assert grid['deskew']['rotated'] == bool(skew)
+    assert grid['deskew']['angle'] == pytest.approx(-skew, abs=0.1)
+
+def test_given_column_names(processor, frame):
+    _, image_buffer = frame
+    grid, _ = processor.segment_table_grid(image_buffer, auto_detect=True, column_names=['player'] + STATS)
+    assert [column['name'] for column in grid['columns']] == ['player'] + STATS
+    assert grid['method']['labels'] == 'given'
+
+def test_digit_readings(processor, frame):
+    _, image_buffer = frame
+    values, info = processor.recognize_digits(image_buffer, auto_detect=True, column_names=['player'] + STATS)
+    assert info['skipped'] == ['player']
+    expected = expected_stats(SEED)
+    readings = [(values[row][column], text) for row, cells in expected.items() for column, text in cells.items()]
+    confident = [(reading['text'], text) for reading, text in readings if reading['confidence'] >= info['min_confidence']]
+    assert len(confident) >= 0.8 * len(readings)
+    assert all(read == text for read, text in confident)
+
+def test_text_columns_kept_without_trusted_labels(processor, frame):
+    _, image_buffer = frame
+    values, info = processor.recognize_digits(image_buffer, auto_detect=True)
+    assert info['skipped'] == []
+    assert len(values['1']) == 1 + len(STAT_COLUMNS)
+
+def test_partial_reference_match_is_numbered():
+    # Eight of the twelve reference columns, where the reference layout would put them
+    columns = [(6, 491), (486, 596), (816, 926), (956, 1066), (1116, 1226), (1266, 1376), (1556, 1666), (1916, 2096)]
+    names, labels = label_columns(columns, 2267)
+    assert labels == 'index'
+    assert names == [f"c{index}" for index in range(len(columns))]
+
+def test_steep_skew_is_rejected():
+    image = make_box_score_frame(1920, 1080, skew=MAX_SKEW + 3, seed=SEED)
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)[150:950, 400:1600]
+    with pytest.raises(ValueError):
+        segment_table(gray)
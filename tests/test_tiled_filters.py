@@ -0,0 +1,66 @@
+"""
+Tiled (banded) execution of the neighbourhood filters against whole-frame
+execution: every band count must stitch to a pixel-identical result
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+from benchmark_suite import make_box_score_frame
+from python_ocr_wrapper import build_enhanced, build_threshold
+from pythonImageProcessor import PythonImageProcessor
+from resultCache import ResultCache
+from tiledFilters import TileExecutor
+
+# Small bands, so even the test frames split into many of them
+MIN_BAND_ROWS = 16
+
+def grays():
+    rng = np.random.default_rng(13)
+    box_score = cv2.cvtColor(make_box_score_frame(960, 540, noise=8.0, seed=13), cv2.COLOR_BGR2GRAY)
+    return {
+        'box_score': box_score,
+        # Height not divisible by any band count; texture everywhere, so any missing halo row shows
+        'random': rng.integers(0, 256, (251, 173), dtype=np.uint8),
+        'stripes': np.tile((np.arange(199) % 7 * 36).astype(np.uint8)[:, None], (1, 120)),
+    }
+
+GRAYS = grays()
+
+@pytest.fixture(scope='module', params=[2, 3, 8], ids=lambda workers: f"{workers}_bands")
+def tiler(request):
+    executor = TileExecutor(request.param, MIN_BAND_ROWS)
+    yield executor
+    executor.shutdown()
+
+@pytest.mark.parametrize('gray', list(GRAYS))
+def test_threshold_variant(tiler, gray):
+    assert np.array_equal(build_threshold(GRAYS[gray], tiler=tiler), build_threshold(GRAYS[gray]))
+
+@pytest.mark.parametrize('morphology', [True, False], ids=['morphology', 'no_morphology'])
+@pytest.mark.parametrize('gray', list(GRAYS))
+def test_enhanced_variant(tiler, gray, morphology):
+    tiled = build_enhanced(GRAYS[gray], {}, tiler, morphology)
+    assert np.array_equal(tiled, build_enhanced(GRAYS[gray], {}, None, morphology))
+
+@pytest.mark.parametrize('denoise', [True, False], ids=['denoise', 'no_denoise'])
+@pytest.mark.parametrize('gray', list(GRAYS))
+def test_binary_ocr(tiler, tmp_path, gray, denoise):
+    image_buffer = cv2.imencode('.png', GRAYS[gray])[1].tobytes()
+    tiled = PythonImageProcessor(ResultCache(str(tmp_path / 'tiled')), tiler=tiler)
+    whole = PythonImageProcessor(ResultCache(str(tmp_path / 'whole')))
+    expected = whole.process_image_raw('preprocess_binary_ocr', image_buffer, denoise=denoise)['data']
+    assert tiled.process_image_raw('preprocess_binary_ocr', image_buffer, denoise=denoise)['data'] == expected
+
+def test_small_frames_are_not_split():
+    calls = []
+    TileExecutor(8, MIN_BAND_ROWS).apply(lambda band: calls.append(band.shape) or band, GRAYS['random'][:20], 5)
+    assert calls == [(20, 173)]
@@ -0,0 +1,68 @@
+"""
+Quality triage under reduced-resolution decoding (the fast processing profile):
+its thresholds are calibrated at full resolution, so a frame must get the same
+verdict whatever decode scale the rest of the operation runs at
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+from benchmark_suite import make_box_score_frame
+from imageDecoder import ImageDecoder
+from pythonImageProcessor import PythonImageProcessor
+from python_ocr_wrapper import render_selected_variants
+from resultCache import ResultCache
+
+def degrade(image, kind):
+    if kind == 'blur':
+        return cv2.GaussianBlur(image, (5, 5), 0)
+    if kind == 'dark':
+        return (image * 0.3).astype(np.uint8)
+    if kind == 'gradient':
+        return (image * np.linspace(0.1, 1.0, image.shape[0])[:, None, None]).astype(np.uint8)
+    return image
+
+@pytest.fixture
+def processor(tmp_path):
+    return PythonImageProcessor(ResultCache(str(tmp_path / 'cache')))
+
+@pytest.fixture(scope='module', params=['clean', 'blur', 'dark', 'gradient'])
+def frame(request):
+    image = degrade(make_box_score_frame(1920, 1080, seed=5), request.param)
+    return request.param, cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 92])[1].tobytes()
+
+def verdict(report):
+    return report['issues'], report['variants'], report['versions']
+
+def test_triage_operation(processor, frame):
+    kind, image_buffer = frame
+    full = processor.process_image_raw('triage', image_buffer, luminance_decode=True)['data']
+    half = processor.process_image_raw('triage', image_buffer, processing_profile='fast')['data']
+    assert verdict(half) == verdict(full)
+    assert ('blurry' in full['issues']) == (kind == 'blur')
+
+@pytest.mark.parametrize('operation', ['multiple_versions', 'preprocess_binary_ocr'])
+def test_triaged_operations(processor, frame, operation):
+    _, image_buffer = frame
+    full = processor.process_image_raw(operation, image_buffer, luminance_decode=True, triage=True, deskew=False)
+    half = processor.process_image_raw(operation, image_buffer, processing_profile='fast')
+    assert verdict(half['triage']) == verdict(full['triage'])
+    assert half['data'].keys() == full['data'].keys()
+
+def test_wrapper_variants(frame, tmp_path):
+    _, image_buffer = frame
+    path = tmp_path / 'frame.jpg'
+    path.write_bytes(image_buffer)
+    variants = ['preprocessed', 'threshold', 'enhanced', 'multilevel']
+    full, full_report = render_selected_variants(str(path), variants, decoder=ImageDecoder(True, 1), triaged=True)
+    half, half_report = render_selected_variants(str(path), variants, decoder=ImageDecoder(True, 2), triaged=True)
+    assert verdict(half_report) == verdict(full_report)
+    assert half.keys() == full.keys()
@@ -0,0 +1,27 @@
+"""
+Screen-recording frame extraction (video_frames): the clip is staged in a
+RAM-backed file, which must be cleaned up without masking the real error
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services'))
+import pythonImageProcessor
+from pythonImageProcessor import PythonImageProcessor
+
+def test_unwritable_staging_file_reports_the_write_error(tmp_path, monkeypatch):
+    missing = tmp_path / 'missing' / 'clip'
+    monkeypatch.setattr(pythonImageProcessor, 'shared_path', lambda prefix: str(missing))
+    with pytest.raises(Exception, match='Error extracting video frames: .*No such file or directory'):
+        PythonImageProcessor().extract_video_frames(b'not a video')
+
+def test_staging_file_is_removed(tmp_path, monkeypatch):
+    staged = tmp_path / 'clip'
+    monkeypatch.setattr(pythonImageProcessor, 'shared_path', lambda prefix: str(staged))
+    with pytest.raises(Exception, match='Could not open video'):
+        PythonImageProcessor().extract_video_frames(b'not a video')
+    assert not staged.exists()